@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .bulk import apply_bulk_action
 from .models import Booking
 
 @admin.register(Booking)
@@ -8,3 +9,17 @@ class BookingAdmin(admin.ModelAdmin):
     search_fields = ('rental_property__title', 'user__username')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
+
+    actions = ['confirm_selected', 'cancel_selected']
+
+    def _apply(self, request, queryset, action_name):
+        result = apply_bulk_action(action_name, queryset.values_list('pk', flat=True))
+        self.message_user(request, f"Обновлено: {len(result['updated'])}, пропущено: {len(result['skipped'])}")
+
+    @admin.action(description='Подтвердить выбранные брони')
+    def confirm_selected(self, request, queryset):
+        self._apply(request, queryset, 'confirm')
+
+    @admin.action(description='Отменить выбранные брони')
+    def cancel_selected(self, request, queryset):
+        self._apply(request, queryset, 'cancel')
@@ -0,0 +1,75 @@
+"""
+Массовое подтверждение и отмена броней (API и админка).
+
+Права проверяются одним запросом по всем id, переход — UPDATE пачками
+(apps.bookings.lifecycle.transition), письма — одной задачей. Число
+запросов не зависит от числа броней в пределах одной пачки.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.bookings.lifecycle import (
+    ACTIVE_STATUSES, CANCELLED_VALUES, LIFECYCLE_CHUNK_SIZE, release_properties, transition,
+)
+from apps.bookings.models import Booking
+
+MAX_BULK_BOOKINGS = 500
+CONFIRMED_VALUES = {"status": "confirmed", "is_confirmed": True, "is_cancelled": False, "is_active": True}
+
+# действие -> (из каких статусов, новые значения, итоговый статус)
+ACTIONS = {
+    "confirm": (("pending",), CONFIRMED_VALUES, "confirmed"),
+    "cancel": (ACTIVE_STATUSES, CANCELLED_VALUES, "cancelled"),
+}
+
+
+class BulkPermissionDenied(Exception):
+    def __init__(self, booking_ids):
+        super().__init__(f"Брони не найдены или недоступны: {booking_ids}")
+        self.booking_ids = booking_ids
+
+
+def allowed_filter(action, user):
+    """Кто может выполнить действие: подтверждает хозяин объекта, отменяет он же или гость."""
+    if user is None:
+        return Q()
+    if action == "confirm":
+        return Q(rental_property__owner=user)
+    return Q(rental_property__owner=user) | Q(user=user)
+
+
+def apply_bulk_action(action, booking_ids, user=None):
+    """
+    Выполняет действие над бронями. user=None — без проверки прав (админка).
+    Бронь не того статуса пропускается; чужая бронь — BulkPermissionDenied
+    без изменений. Возвращает {"updated": [...], "skipped": [...]}.
+    """
+    from_statuses, values, status = ACTIONS[action]
+    if action == "cancel":
+        values = {**values, "cancelled_at": timezone.now()}
+    requested = set(booking_ids)
+    rows = dict(
+        Booking.objects.filter(pk__in=requested)
+        .filter(allowed_filter(action, user))
+        .values_list("pk", "status")
+    )
+    denied = sorted(requested - set(rows))
+    if user is not None and denied:
+        raise BulkPermissionDenied(denied)
+
+    with transaction.atomic():
+        changed = transition(
+            Booking.objects.filter(pk__in=list(rows), status__in=from_statuses),
+            LIFECYCLE_CHUNK_SIZE,
+            **values,
+        )
+        if action == "cancel":
+            release_properties(property_id for _, property_id in changed)
+
+        updated = sorted(pk for pk, _ in changed)
+        if updated:
+            from apps.bookings.tasks import send_booking_transition_emails
+
+            transaction.on_commit(lambda: send_booking_transition_emails.delay({status: updated}))
+    return {"updated": updated, "skipped": sorted(requested - set(updated))}
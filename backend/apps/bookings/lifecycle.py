@@ -0,0 +1,97 @@
+"""
+Плановые переходы броней: истечение неподтверждённых и завершение прошедших.
+
+Переходы делаются UPDATE ... WHERE пачками по первичному ключу, без
+save() и сигналов по каждой строке. После переходов одним UPDATE
+освобождаются объекты без действующих броней, а письма по всем
+изменённым броням уходят одной задачей.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.listings.change_feed import publish_property_change
+from apps.listings.models import Property
+
+LIFECYCLE_CHUNK_SIZE = 1000
+# Брони, которые держат объект занятым
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+CANCELLED_VALUES = {"status": "cancelled", "is_confirmed": False, "is_cancelled": True, "is_active": False}
+COMPLETED_VALUES = {"status": "completed", "is_active": False}
+
+
+def get_pending_ttl():
+    return timedelta(hours=getattr(settings, "BOOKING_PENDING_TTL_HOURS", 48))
+
+
+def transition(queryset, chunk_size=LIFECYCLE_CHUNK_SIZE, **values):
+    """
+    UPDATE выборки пачками. Строки пачки блокируются и перечитываются
+    с тем же условием, поэтому параллельно изменённые не перезаписываются.
+    Возвращает [(id брони, id объекта)] изменённых строк.
+    """
+    changed = []
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.select_for_update().order_by("pk").values_list("pk", "rental_property_id")[:chunk_size]
+            )
+            if not rows:
+                return changed
+            Booking._base_manager.filter(pk__in=[pk for pk, _ in rows]).update(updated_at=now, **values)
+        changed.extend(rows)
+
+
+def release_properties(property_ids):
+    """Делает доступными объекты без действующих броней. Возвращает их id."""
+    today = timezone.localdate()
+    holding = Booking.objects.filter(
+        rental_property=OuterRef("pk"), status__in=ACTIVE_STATUSES, end_date__gt=today
+    )
+    queryset = Property._base_manager.filter(pk__in=set(property_ids), is_available=False).exclude(Exists(holding))
+    released = list(queryset.values_list("pk", flat=True))
+    if released:
+        Property._base_manager.filter(pk__in=released).update(is_available=True, updated_at=timezone.now())
+        # UPDATE не вызывает post_save — снимки каталога узнают об изменении из ленты
+        for pk in released:
+            publish_property_change(pk)
+    return released
+
+
+def expired_pending(now=None):
+    """Неподтверждённые брони старше TTL или с уже наступившей датой заезда."""
+    now = now or timezone.now()
+    return Booking.objects.filter(status="pending").filter(
+        Q(created_at__lt=now - get_pending_ttl()) | Q(start_date__lt=timezone.localdate(now))
+    )
+
+
+def finished_confirmed(now=None):
+    """Подтверждённые брони, у которых прошло время выезда."""
+    now = timezone.localtime(now)
+    return Booking.objects.filter(status="confirmed").filter(
+        Q(end_date__lt=now.date()) | Q(end_date=now.date(), check_out_time__lte=now.time())
+    )
+
+
+def advance_bookings(now=None, chunk_size=LIFECYCLE_CHUNK_SIZE):
+    """Истекает и завершает брони, освобождает объекты, ставит письма. Возвращает статистику."""
+    from apps.bookings.tasks import send_booking_transition_emails
+
+    expired = transition(expired_pending(now), chunk_size, cancelled_at=timezone.now(), **CANCELLED_VALUES)
+    completed = transition(finished_confirmed(now), chunk_size, **COMPLETED_VALUES)
+    released = release_properties(property_id for _, property_id in expired + completed)
+
+    transitions = {
+        "cancelled": [pk for pk, _ in expired],
+        "completed": [pk for pk, _ in completed],
+    }
+    if expired or completed:
+        transaction.on_commit(lambda: send_booking_transition_emails.delay(transitions))
+    return {"expired": len(expired), "completed": len(completed), "released": len(released)}
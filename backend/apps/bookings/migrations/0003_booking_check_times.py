@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_total_price'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='booking',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Бронирование', 'verbose_name_plural': 'Бронирования'},
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='check_in_time',
+            field=models.TimeField(default='12:00', verbose_name='Время заезда'),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='check_out_time',
+            field=models.TimeField(default='16:00', verbose_name='Время выезда'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:37
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 2000
+
+
+def nightly_rates(price, rules, start_date, end_date):
+    """
+    Цены ночей по тарифам — замороженная копия правил apps.listings.pricing
+    на момент миграции: действует последний подходящий тариф в порядке (priority, id).
+    """
+    rates = []
+    day = start_date
+    while day < end_date:
+        rate = price
+        for rule_start, rule_end, weekdays, nightly_price in rules:
+            if (rule_start is None or day >= rule_start) and (rule_end is None or day < rule_end) \
+                    and weekdays >> day.weekday() & 1:
+                rate = nightly_price
+        rates.append(rate)
+        day += timedelta(days=1)
+    return rates
+
+
+def backfill_prices(apps, schema_editor):
+    """Цены существующих броней — по ценовому календарю объекта на момент миграции."""
+    Booking = apps.get_model('bookings', 'Booking')
+    Property = apps.get_model('listings', 'Property')
+    PriceRule = apps.get_model('listings', 'PriceRule')
+
+    pending = Booking._base_manager.filter(total_price__isnull=True).order_by('pk')
+    while True:
+        chunk = list(pending[:BACKFILL_CHUNK_SIZE])
+        if not chunk:
+            break
+        property_ids = {booking.rental_property_id for booking in chunk}
+        prices = dict(Property._base_manager.filter(pk__in=property_ids).values_list('pk', 'price'))
+        rules = {}
+        for property_id, *rule in (
+            PriceRule.objects.filter(property_id__in=property_ids)
+            .order_by('priority', 'id')
+            .values_list('property_id', 'start_date', 'end_date', 'weekdays', 'nightly_price')
+        ):
+            rules.setdefault(property_id, []).append(rule)
+        for booking in chunk:
+            rates = nightly_rates(
+                prices[booking.rental_property_id], rules.get(booking.rental_property_id, ()),
+                booking.start_date, booking.end_date,
+            )
+            total = sum(rates, Decimal('0.00'))
+            booking.total_price = total
+            booking.nightly_price = (total / len(rates)).quantize(Decimal('0.01')) if rates else total
+        Booking._base_manager.bulk_update(chunk, ['total_price', 'nightly_price'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_booking_check_times'),
+        ('listings', '0008_pricerule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='nightly_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='total_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:49
+
+from django.db import migrations, models
+
+
+def mark_existing_notified(apps, schema_editor):
+    """Письма по существующим броням уже были отправлены прежним кодом."""
+    Booking = apps.get_model('bookings', 'Booking')
+    Booking._base_manager.update(notified_status=models.F('status'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_price_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='notified_status',
+            field=models.CharField(blank=True, default='', editable=False, max_length=20),
+        ),
+        migrations.RunPython(mark_existing_notified, migrations.RunPython.noop),
+    ]
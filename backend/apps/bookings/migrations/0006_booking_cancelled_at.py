@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:50
+
+from django.db import migrations, models
+
+
+def backfill_cancelled_at(apps, schema_editor):
+    """Для уже отменённых броней лучшая доступная оценка момента отмены — updated_at."""
+    Booking = apps.get_model('bookings', 'Booking')
+    Booking._base_manager.filter(status='cancelled').update(cancelled_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_booking_notified_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='cancelled_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_cancelled_at, migrations.RunPython.noop),
+    ]
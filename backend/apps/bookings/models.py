@@ -1,14 +1,44 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from apps.listings.models import Property
+from apps.listings.pricing import quote_stay
 from apps.core.models import SoftDeleteModel
+from apps.core.querysets import SoftDeleteManager, SoftDeleteQuerySet
 
 User = get_user_model()
 
 
+PAID_STATUSES = ("paid", "completed")
+# От этих полей зависит сохранённая цена брони
+STAY_FIELDS = ("rental_property_id", "start_date", "end_date")
+_MONEY = DecimalField(max_digits=12, decimal_places=2)
+_ZERO = Value(Decimal("0.00"), output_field=_MONEY)
+
+
+class BookingQuerySet(SoftDeleteQuerySet):
+
+    def with_totals(self):
+        """amount и paid_amount считаются в SQL из сохранённых сумм — без обращения к Property."""
+        return self.annotate(
+            amount=Coalesce("total_price", _ZERO, output_field=_MONEY),
+            paid_amount=Coalesce(
+                Sum("payments__amount", filter=Q(payments__status__in=PAID_STATUSES, payments__is_deleted=False)),
+                _ZERO,
+                output_field=_MONEY,
+            ),
+        )
+
+
+BookingManager = SoftDeleteManager.from_queryset(BookingQuerySet)
+
+
 class Booking(SoftDeleteModel):
     STATUS_CHOICES = [
         ("pending", "Pending"),
@@ -30,10 +60,19 @@ class Booking(SoftDeleteModel):
     is_confirmed = models.BooleanField(default=False)
     is_cancelled = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    # Статус, о котором гостю уже отправлено письмо (apps.bookings.notifications)
+    notified_status = models.CharField(max_length=20, blank=True, default="", editable=False)
+    cancelled_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+
+    # Цена фиксируется при создании и смене дат: изменения тарифов хоста её не трогают
+    nightly_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BookingManager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Бронирование"
@@ -45,6 +84,30 @@ class Booking(SoftDeleteModel):
             )
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Объект и даты на момент загрузки: цена пересчитывается только при их смене
+        self._original_stay = self._stay()
+
+    def _stay(self):
+        return tuple(self.__dict__.get(name, models.DEFERRED) for name in STAY_FIELDS)
+
+    @property
+    def stay_changed(self):
+        return self._stay() != self._original_stay
+
+    def save(self, *args, **kwargs):
+        if kwargs.get("update_fields") is None and (self.total_price is None or self.stay_changed):
+            self.apply_quote()
+        super().save(*args, **kwargs)
+        self._original_stay = self._stay()
+
+    def apply_quote(self, quote=None):
+        """Сохраняет в брони цену из ценового календаря: среднюю за ночь и итог."""
+        quote = quote or self.quote()
+        self.total_price = quote.total
+        self.nightly_price = (quote.total / quote.nights).quantize(Decimal("0.01")) if quote.nights else quote.total
+
     def __str__(self):
         return f"Бронь {self.user.username} — {self.rental_property.title} ({self.start_date} → {self.end_date})"
 
@@ -70,7 +133,12 @@ class Booking(SoftDeleteModel):
         self.is_confirmed = False
         self.is_cancelled = True
         self.is_active = False
-        self.save(update_fields=["status", "is_confirmed", "is_cancelled", "is_active", "updated_at"])
+        # Момент отмены фиксируется один раз: по нему считаются отмены в сводках
+        update_fields = ["status", "is_confirmed", "is_cancelled", "is_active", "updated_at"]
+        if self.cancelled_at is None:
+            self.cancelled_at = timezone.now()
+            update_fields.append("cancelled_at")
+        self.save(update_fields=update_fields)
 
     def complete(self):
         """Завершение бронирования."""
@@ -83,7 +151,6 @@ class Booking(SoftDeleteModel):
         """Количество ночей."""
         return max((self.end_date - self.start_date).days, 0)
 
-    @property
-    def total_price(self):
-        """Общая сумма бронирования."""
-        return self.duration * self.rental_property.price if self.duration > 0 else 0
+    def quote(self):
+        """Расчёт по ценовому календарю объекта (apps.listings.pricing)."""
+        return quote_stay(self.rental_property, self.start_date, self.end_date)
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+PENDING_KEY = "booking_notification_pending:{}"
+
+
+def get_debounce_window():
+    return getattr(settings, "BOOKING_NOTIFICATION_DEBOUNCE", 10)
+
+
+def schedule_booking_notification(booking_id):
+    """
+    Откладывает уведомление по брони на окно дебаунса.
+
+    Первое событие в окне ставит отложенную задачу, остальные только
+    попадают под уже существующий маркер. Задача отправит одно письмо
+    по итоговому статусу брони на момент выполнения.
+    """
+    window = get_debounce_window()
+    key = PENDING_KEY.format(booking_id)
+
+    def enqueue():
+        from .tasks import dispatch_booking_notification
+
+        # cache.add атомарен: задачу ставит только тот, кто создал маркер
+        if cache.add(key, True, timeout=window * 6):
+            dispatch_booking_notification.apply_async((booking_id,), countdown=window)
+
+    transaction.on_commit(enqueue)
+
+
+def release_booking_notification(booking_id):
+    """Снимает маркер — следующие изменения брони откроют новое окно."""
+    cache.delete(PENDING_KEY.format(booking_id))
+
+
+# Письма о переходах, сделанных пачкой (apps.bookings.lifecycle, массовые действия)
+TRANSITION_EMAILS = {
+    "confirmed": (
+        "Бронирование подтверждено: {title}",
+        "Ваше бронирование № {id} ({start} — {end}) подтверждено. Сумма: {total} руб.",
+    ),
+    "cancelled": (
+        "Бронирование отменено: {title}",
+        "Ваше бронирование № {id} ({start} — {end}) было отменено.",
+    ),
+    "completed": (
+        "Спасибо за поездку: {title}",
+        "Бронирование № {id} завершено. Будем рады вашему отзыву об объекте.",
+    ),
+}
+
+
+def build_transition_messages(transitions):
+    """
+    transitions: {статус: [id брони]} -> [EmailMessage]. Брони читаются
+    одним запросом; письмо уходит, только если статус брони не сменился.
+    """
+    from django.core.mail import EmailMessage
+
+    from .models import Booking
+
+    expected = {pk: status for status, ids in transitions.items() for pk in ids}
+    bookings = (
+        Booking.objects.filter(pk__in=expected)
+        .select_related("user", "rental_property")
+        .only("status", "notified_status", "start_date", "end_date", "total_price", "user__email",
+              "rental_property__title")
+    )
+    messages = []
+    for booking in bookings:
+        template = TRANSITION_EMAILS.get(booking.status)
+        if template is None or booking.status != expected[booking.pk] or not booking.user.email:
+            continue
+        if booking.notified_status == booking.status:
+            continue
+        context = {
+            "id": booking.pk,
+            "title": booking.rental_property.title,
+            "start": booking.start_date,
+            "end": booking.end_date,
+            "total": booking.total_price,
+        }
+        subject, body = template
+        messages.append(EmailMessage(
+            subject=subject.format(**context),
+            body=body.format(**context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[booking.user.email],
+        ))
+    return messages
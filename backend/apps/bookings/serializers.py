@@ -1,11 +1,15 @@
 from rest_framework import serializers
 from django.utils import timezone
+from apps.listings.pricing import quote_stay
+from .bulk import MAX_BULK_BOOKINGS
 from .models import Booking
 
 
 class BookingSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source="user.username")
     total_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    # Аннотация BookingQuerySet.with_totals(); в ответе на создание брони отсутствует
+    paid_amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
 
     class Meta:
         model = Booking
@@ -47,4 +51,15 @@ class BookingSerializer(serializers.ModelSerializer):
             if overlapping.exists():
                 raise serializers.ValidationError("Этот объект уже забронирован на выбранные даты.")
 
-        return data
\ No newline at end of file
+            quote = quote_stay(rental_property, start_date, end_date)
+            if not quote.meets_min_stay:
+                raise serializers.ValidationError(
+                    f"Минимальный срок проживания на эти даты — {quote.min_nights} ноч."
+                )
+
+        return data
+
+class BulkBookingActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_BULK_BOOKINGS
+    )
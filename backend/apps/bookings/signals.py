@@ -1,11 +1,7 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from apps.bookings.models import Booking
-from apps.bookings.tasks import (
-    send_booking_confirmation_email,
-    send_booking_cancelled_email,
-    send_payment_success_email,
-)
+from apps.bookings.notifications import schedule_booking_notification
 
 
 @receiver(post_save, sender=Booking)
@@ -35,13 +31,11 @@ def restore_property_availability_on_booking_delete(sender, instance, **kwargs):
 def send_booking_emails(sender, instance, created, **kwargs):
     """
     Отправка писем при изменениях бронирования.
+    Серия сохранений одной брони схлопывается в одно письмо
+    по итоговому статусу (см. apps.bookings.notifications).
     """
     try:
-        if created:
-            send_booking_confirmation_email.delay(instance.id)
-        elif instance.status == "confirmed":
-            send_payment_success_email.delay(instance.id)
-        elif instance.status == "cancelled":
-            send_booking_cancelled_email.delay(instance.id)
+        if created or instance.status in ("confirmed", "cancelled"):
+            schedule_booking_notification(instance.id)
     except Exception as e:
         print(f"[SIGNAL ERROR] Ошибка при отправке писем для брони {instance.id}: {e}")
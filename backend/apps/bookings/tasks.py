@@ -1,14 +1,39 @@
 from celery import shared_task
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.mail import send_mail, get_connection
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.template import TemplateDoesNotExist
 
 
+def mark_notified(transitions):
+    """Запоминает статус, о котором уже написали: {статус: [id брони]}."""
+    from .models import Booking
+
+    for status, booking_ids in transitions.items():
+        Booking._base_manager.filter(id__in=booking_ids, status=status).update(notified_status=status)
+
+
+CELERY_EMAIL_BACKEND_PATH = "djcelery_email.backends.CeleryEmailBackend"
+
+
+def direct_connection():
+    """
+    Транзакционные письма уже выполняются в воркере очереди email —
+    отправляем их напрямую, минуя CeleryEmailBackend и очередь bulk.
+    Транспорт — BOOKING_EMAIL_BACKEND, по умолчанию тот, в который
+    отправляет EMAIL_BACKEND (в тестах это locmem).
+    """
+    backend = getattr(settings, "BOOKING_EMAIL_BACKEND", "") or settings.EMAIL_BACKEND
+    if backend == CELERY_EMAIL_BACKEND_PATH:
+        backend = settings.CELERY_EMAIL_BACKEND
+    return get_connection(backend)
+
+
 @shared_task
 def send_booking_confirmation_email(booking_id):
     from .models import Booking
-    booking = Booking.objects.get(id=booking_id)
+    booking = Booking.objects.select_related("rental_property", "user").get(id=booking_id)
 
     subject = f"Подтверждение бронирования {booking.rental_property.title}"
     try:
@@ -23,14 +48,15 @@ def send_booking_confirmation_email(booking_id):
         plain_message,
         'noreply@rentalhub.com',
         [booking.user.email],
-        html_message=html_message
+        html_message=html_message,
+        connection=direct_connection(),
     )
 
 
 @shared_task
 def send_booking_cancelled_email(booking_id):
     from .models import Booking
-    booking = Booking.objects.get(id=booking_id)
+    booking = Booking.objects.select_related("rental_property", "user").get(id=booking_id)
 
     subject = f"Бронирование отменено: {booking.rental_property.title}"
     try:
@@ -45,14 +71,15 @@ def send_booking_cancelled_email(booking_id):
         plain_message,
         'noreply@rentalhub.com',
         [booking.user.email],
-        html_message=html_message
+        html_message=html_message,
+        connection=direct_connection(),
     )
 
 
 @shared_task
 def send_payment_success_email(booking_id):
     from .models import Booking
-    booking = Booking.objects.get(id=booking_id)
+    booking = Booking.objects.select_related("rental_property", "user").get(id=booking_id)
 
     subject = f"Оплата прошла успешно: {booking.rental_property.title}"
     try:
@@ -67,5 +94,62 @@ def send_payment_success_email(booking_id):
         plain_message,
         'noreply@rentalhub.com',
         [booking.user.email],
-        html_message=html_message
-    )
\ No newline at end of file
+        html_message=html_message,
+        connection=direct_connection(),
+    )
+
+
+# Какое письмо отправляется для итогового статуса брони
+STATUS_EMAIL_TASKS = {
+    "pending": send_booking_confirmation_email,
+    "confirmed": send_payment_success_email,
+    "cancelled": send_booking_cancelled_email,
+}
+
+
+@shared_task
+def dispatch_booking_notification(booking_id):
+    """
+    Отправляет одно письмо по итоговому статусу брони после окна дебаунса.
+    """
+    from .models import Booking
+    from .notifications import release_booking_notification
+
+    # Снимаем маркер до чтения брони: изменения после этой точки
+    # откроют новое окно и не потеряются.
+    release_booking_notification(booking_id)
+
+    row = Booking.objects.filter(id=booking_id).values_list("status", "notified_status").first()
+    if row is None:
+        return
+    status, notified_status = row
+    # Повторное сохранение без смены статуса не должно повторять письмо
+    send_email = STATUS_EMAIL_TASKS.get(status) if status != notified_status else None
+    if send_email is not None:
+        send_email(booking_id)
+        mark_notified({status: [booking_id]})
+
+
+@shared_task
+def send_booking_transition_emails(transitions):
+    """Письма по броням, переведённым пачкой: одно соединение на все письма."""
+    from .notifications import build_transition_messages
+
+    messages = build_transition_messages(transitions)
+    if messages:
+        with direct_connection() as connection:
+            connection.send_messages(messages)
+    mark_notified(transitions)
+    return len(messages)
+
+
+@shared_task
+def advance_booking_lifecycle():
+    """Плановые переходы броней (apps.bookings.lifecycle)."""
+    from .lifecycle import advance_bookings
+
+    report = advance_bookings()
+    if any(report.values()):
+        print(f"[BOOKINGS] Истекло: {report['expired']}, завершено: {report['completed']}, "
+              f"освобождено объектов: {report['released']}")
+    return report
@@ -4,9 +4,11 @@ from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .bulk import BulkPermissionDenied, apply_bulk_action
 from .models import Booking
-from .serializers import BookingSerializer
+from .serializers import BookingSerializer, BulkBookingActionSerializer
 from apps.users.permissions import IsLandlord, IsTenant, IsOwnerOrReadOnly
+from apps.users.roles import get_request_roles
 
 
 class BookingViewSet(viewsets.ModelViewSet):
@@ -30,12 +32,14 @@ class BookingViewSet(viewsets.ModelViewSet):
         user = self.request.user
         include_deleted = self.request.query_params.get("include_deleted") == "true"
         base_qs = Booking.objects.with_deleted() if include_deleted else Booking.objects.all()
+        # Суммы — аннотациями в SQL (Booking.objects.with_totals)
+        base_qs = base_qs.select_related("user").with_totals()
 
         if not user.is_authenticated:
             return Booking.objects.none()
 
         # Хост видит брони на свои объекты, арендатор — только свои
-        if user.groups.filter(name="Host").exists():
+        if get_request_roles(self.request).in_groups("Host"):
             return base_qs.filter(rental_property__owner=user)
         return base_qs.filter(user=user)
 
@@ -58,6 +62,26 @@ class BookingViewSet(viewsets.ModelViewSet):
         booking.cancel()
         return Response({"detail": "Booking cancelled."}, status=status.HTTP_200_OK)
 
+    # --- Массовые действия ---
+    def _bulk_action(self, request, action_name):
+        serializer = BulkBookingActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = apply_bulk_action(action_name, serializer.validated_data["ids"], request.user)
+        except BulkPermissionDenied as e:
+            return Response({"detail": "Not allowed.", "ids": e.booking_ids}, status=status.HTTP_403_FORBIDDEN)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="bulk-confirm", permission_classes=[permissions.IsAuthenticated, IsLandlord])
+    def bulk_confirm(self, request):
+        """Подтверждение списка броней на свои объекты: {"ids": [...]}."""
+        return self._bulk_action(request, "confirm")
+
+    @action(detail=False, methods=["post"], url_path="bulk-cancel", permission_classes=[permissions.IsAuthenticated])
+    def bulk_cancel(self, request):
+        """Отмена списка броней — своих или на свои объекты: {"ids": [...]}."""
+        return self._bulk_action(request, "cancel")
+
     # --- Soft delete ---
     @action(detail=True, methods=["delete"], permission_classes=[permissions.IsAuthenticated, IsOwnerOrReadOnly])
     def soft_delete(self, request, pk=None):
@@ -69,8 +93,8 @@ class BookingViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["patch"], permission_classes=[permissions.IsAuthenticated, IsOwnerOrReadOnly])
     def restore(self, request, pk=None):
         booking = get_object_or_404(Booking.objects.with_deleted(), pk=pk)
-        booking.restore()
-        return Response({"detail": "Booking restored."}, status=status.HTTP_200_OK)
+        restored = booking.restore()
+        return Response({"detail": "Booking restored.", "restored": restored}, status=status.HTTP_200_OK)
 
     # --- Hard delete ---
     @action(detail=True, methods=["delete"], url_path="hard-delete", permission_classes=[permissions.IsAuthenticated, IsOwnerOrReadOnly])
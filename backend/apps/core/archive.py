@@ -0,0 +1,130 @@
+"""
+Перенос давно мягко удалённых строк из горячих таблиц в архив.
+
+Строки старше ARCHIVE_RETENTION_DAYS выбираются пачками по первичному
+ключу, записываются в ArchivedRow (target="db") или в сжатые JSONL-файлы
+(target="jsonl") и удаляются _raw_delete — без сигналов и каскадного
+сбора объектов. Каждая пачка — отдельная короткая транзакция.
+
+Порядок моделей важен: дочерние таблицы архивируются раньше родительских,
+а строка, на которую ещё ссылаются другие строки, не трогается.
+"""
+import gzip
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.core.models import ArchivedRow
+
+ARCHIVE_MODELS = (
+    "payments.Payment",
+    "listings.ViewLog",
+    "reviews.Review",
+    "log.SearchHistory",
+    "bookings.Booking",
+)
+ARCHIVE_CHUNK_SIZE = 500
+
+
+def get_retention_days():
+    return getattr(settings, "ARCHIVE_RETENTION_DAYS", 90)
+
+
+@dataclass
+class ArchiveReport:
+    counts: dict = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+class JsonlWriter:
+    """Дописывает строки в <ARCHIVE_DIR>/<app.Model>-<дата>.jsonl.gz."""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or settings.ARCHIVE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, model, rows):
+        path = self.directory / f"{model._meta.label}-{timezone.now():%Y%m%d}.jsonl.gz"
+        with gzip.open(path, "at", encoding="utf-8") as archive:
+            for row in rows:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+
+
+class DatabaseWriter:
+
+    def write(self, model, rows):
+        ArchivedRow.objects.bulk_create([
+            ArchivedRow(
+                model_label=model._meta.label,
+                object_id=row["id"],
+                deleted_at=row["deleted_at"],
+                data=row,
+            )
+            for row in rows
+        ])
+
+
+def archivable(model, cutoff):
+    """Удалённые до cutoff строки, на которые больше никто не ссылается."""
+    queryset = model._base_manager.filter(is_deleted=True, deleted_at__lt=cutoff)
+    for rel in model._meta.related_objects:
+        if rel.many_to_many:
+            continue
+        referencing = rel.related_model._base_manager.filter(**{rel.field.attname: OuterRef("pk")})
+        queryset = queryset.filter(~Exists(referencing))
+    return queryset
+
+
+def archive_model(model, cutoff, writer, chunk_size=ARCHIVE_CHUNK_SIZE, dry_run=False, on_chunk=None):
+    fields = [f.attname for f in model._meta.concrete_fields]
+    queryset = archivable(model, cutoff).order_by("pk")
+    if dry_run:
+        return queryset.count()
+
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.values(*fields)[:chunk_size])
+            if not rows:
+                return total
+            writer.write(model, rows)
+            model._base_manager.filter(pk__in=[row["id"] for row in rows])._raw_delete(model._base_manager.db)
+        total += len(rows)
+        if on_chunk:
+            on_chunk(model, total)
+
+
+def archive_soft_deleted(days=None, target="db", labels=ARCHIVE_MODELS, chunk_size=ARCHIVE_CHUNK_SIZE,
+                         dry_run=False, on_chunk=None):
+    """Архивирует строки, удалённые больше days дней назад. Возвращает ArchiveReport."""
+    days = get_retention_days() if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    writer = JsonlWriter() if target == "jsonl" else DatabaseWriter()
+    report = ArchiveReport()
+    for label in labels:
+        model = apps.get_model(label)
+        report.counts[label] = archive_model(
+            model, cutoff, writer, chunk_size=chunk_size, dry_run=dry_run, on_chunk=on_chunk
+        )
+    return report
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.archive import ARCHIVE_CHUNK_SIZE, ARCHIVE_MODELS, archive_soft_deleted
+
+
+class Command(BaseCommand):
+    help = "Переносит давно мягко удалённые строки в архив (таблица ArchivedRow или JSONL.gz)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Возраст удаления в днях (по умолчанию ARCHIVE_RETENTION_DAYS)")
+        parser.add_argument("--target", choices=["db", "jsonl"], default="db")
+        parser.add_argument("--models", help="Модели через запятую, например reviews.Review,log.SearchHistory")
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Только посчитать строки")
+
+    def handle(self, *args, **options):
+        labels = options["models"].split(",") if options["models"] else ARCHIVE_MODELS
+
+        def progress(model, done):
+            self.stdout.write(f"  {model._meta.label}: {done}")
+
+        report = archive_soft_deleted(
+            days=options["days"],
+            target=options["target"],
+            labels=labels,
+            chunk_size=options["chunk_size"],
+            dry_run=options["dry_run"],
+            on_chunk=progress,
+        )
+        for label, count in report.counts.items():
+            self.stdout.write(f"{label}: {count}")
+        verb = "Найдено" if options["dry_run"] else "Перенесено"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report.total} строк за {report.elapsed:.1f} c ({report.rows_per_second:.0f} строк/с)"
+        ))
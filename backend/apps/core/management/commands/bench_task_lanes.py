@@ -0,0 +1,50 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.tasks import bench_ping, bench_sleep
+
+
+class Command(BaseCommand):
+    help = (
+        "Замер задержки транзакционной очереди email, пока очередь bulk забита. "
+        "Нужны запущенные воркеры email и bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bulk", type=int, default=2000, help="Сколько тяжёлых задач поставить в bulk")
+        parser.add_argument("--bulk-seconds", type=float, default=0.2, help="Длительность одной тяжёлой задачи")
+        parser.add_argument("--probes", type=int, default=50, help="Сколько замеров сделать в каждой фазе")
+        parser.add_argument("--interval", type=float, default=0.1, help="Пауза между замерами")
+
+    def handle(self, *args, **options):
+        if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+            raise CommandError("Задачи выполняются синхронно (CELERY_TASK_ALWAYS_EAGER) — замер не имеет смысла.")
+
+        idle = self._probe(options["probes"], options["interval"])
+
+        self.stdout.write(f"Ставим {options['bulk']} задач в bulk...")
+        for _ in range(options["bulk"]):
+            bench_sleep.delay(options["bulk_seconds"])
+        loaded = self._probe(options["probes"], options["interval"])
+
+        self._report("Без нагрузки", idle)
+        self._report("Под нагрузкой bulk", loaded)
+
+    def _probe(self, probes, interval):
+        latencies = []
+        for _ in range(probes):
+            result = bench_ping.delay(time.time())
+            latencies.append(result.get(timeout=60))
+            time.sleep(interval)
+        return latencies
+
+    def _report(self, title, latencies):
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f"{title}: медиана {statistics.median(latencies) * 1000:.1f} мс, "
+            f"p95 {p95 * 1000:.1f} мс, макс {latencies[-1] * 1000:.1f} мс"
+        )
@@ -135,12 +135,10 @@ class Command(BaseCommand):
         # 5. Платежи
         for i in range(50):
             booking = random.choice(bookings)
-            days = (booking.end_date - booking.start_date).days
-            amount = booking.rental_property.price * days
             Payment.objects.create(
                 user=booking.user,
                 booking=booking,
-                amount=amount,
+                amount=booking.total_price,
                 status=random.choices(
                     ['pending', 'completed', 'failed'],
                     weights=[1, 5, 1]  # completed чаще
@@ -0,0 +1,110 @@
+"""
+Простой реестр метрик поверх общего кэша (Redis в проде).
+
+Веб-процессы и воркеры Celery пишут в одни и те же ключи,
+поэтому /metrics/ отдаёт сводную картину в формате Prometheus.
+Суммы гистограмм хранятся в микроединицах: INCRBY в Redis целочисленный.
+
+Реестр серий — отдельные ключи без общего read-modify-write: серию
+регистрирует тот процесс, чей cache.add(метка серии) прошёл первым; он
+берёт номер слота через INCR и записывает описание в свой слот.
+"""
+import math
+import time
+
+from django.core.cache import cache
+
+SERIES_KEY = "metrics:series"
+SERIES_COUNT_KEY = f"{SERIES_KEY}:count"
+KEY_PREFIX = "metrics:"
+# Как часто процесс перепроверяет, что его серии есть в кэше (после очистки кэша)
+REGISTRY_RECHECK_SECONDS = 300
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# серия -> время последней проверки регистрации (time.monotonic())
+_known_series = {}
+
+
+def _label_str(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def _register(kind, name, labels, buckets=None):
+    series = (name, _label_str(labels))
+    checked_at = _known_series.get(series)
+    now = time.monotonic()
+    if checked_at is not None and now - checked_at < REGISTRY_RECHECK_SECONDS:
+        return
+    if cache.add(f"{SERIES_KEY}:{name}{series[1]}", True, timeout=None):
+        cache.add(SERIES_COUNT_KEY, 0, timeout=None)
+        slot = cache.incr(SERIES_COUNT_KEY)
+        cache.set(f"{SERIES_KEY}:slot:{slot}", (name, series[1], kind, dict(labels or {}), buckets), timeout=None)
+    _known_series[series] = now
+
+
+def _registry():
+    """{(имя, метки): (тип, метки, границы)} по всем слотам реестра."""
+    count = cache.get(SERIES_COUNT_KEY) or 0
+    slots = cache.get_many([f"{SERIES_KEY}:slot:{slot}" for slot in range(1, count + 1)])
+    return {(name, label_str): (kind, labels, buckets) for name, label_str, kind, labels, buckets in slots.values()}
+
+
+def _incr(key, amount=1):
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+
+def inc_counter(name, labels=None, value=1):
+    _register("counter", name, labels)
+    _incr(f"{KEY_PREFIX}{name}{_label_str(labels)}", value)
+
+
+def observe(name, value, labels=None, buckets=TIME_BUCKETS):
+    """Добавляет наблюдение в гистограмму."""
+    _register("histogram", name, labels, buckets)
+    base = f"{KEY_PREFIX}{name}{_label_str(labels)}"
+    bucket = next((bound for bound in buckets if value <= bound), math.inf)
+    _incr(f"{base}:bucket:{bucket}")
+    _incr(f"{base}:count")
+    _incr(f"{base}:sum", int(round(value * 1_000_000)))
+
+
+def render():
+    """Все зарегистрированные метрики в текстовом формате Prometheus."""
+    registry = _registry()
+    keys = []
+    for (name, label_str), (kind, labels, buckets) in registry.items():
+        base = f"{KEY_PREFIX}{name}{label_str}"
+        if kind == "counter":
+            keys.append(base)
+        else:
+            keys.extend(f"{base}:bucket:{bound}" for bound in (*buckets, math.inf))
+            keys.extend((f"{base}:count", f"{base}:sum"))
+    values = cache.get_many(keys)
+
+    lines = []
+    typed = set()
+    for (name, label_str), (kind, labels, buckets) in sorted(registry.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} {kind}")
+            typed.add(name)
+        base = f"{KEY_PREFIX}{name}{label_str}"
+        if kind == "counter":
+            lines.append(f"{name}{label_str} {values.get(base, 0)}")
+            continue
+        cumulative = 0
+        for bound in (*buckets, math.inf):
+            cumulative += values.get(f"{base}:bucket:{bound}", 0)
+            le = "+Inf" if bound == math.inf else bound
+            lines.append(f"{name}_bucket{_label_str({**labels, 'le': le})} {cumulative}")
+        lines.append(f"{name}_count{label_str} {values.get(f'{base}:count', 0)}")
+        lines.append(f"{name}_sum{label_str} {values.get(f'{base}:sum', 0) / 1_000_000}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,27 @@
+import time
+
+from apps.core import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Время обработки HTTP-запросов по имени маршрута и статусу.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        resolver_match = getattr(request, "resolver_match", None)
+        metrics.observe(
+            "http_request_duration_seconds",
+            time.perf_counter() - started,
+            labels={
+                "view": getattr(resolver_match, "view_name", None) or "unmatched",
+                "method": request.method,
+                "status": response.status_code,
+            },
+        )
+        return response
@@ -1,6 +1,8 @@
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
-from .querysets import SoftDeleteManager
+from .querysets import SoftDeleteManager, cascade_restore, cascade_soft_delete
 
 
 class SoftDeleteModel(models.Model):
@@ -9,18 +11,54 @@ class SoftDeleteModel(models.Model):
 
     objects = SoftDeleteManager()
 
+    # Участвует ли модель в каскаде мягкого удаления родителя (on_delete=CASCADE)
+    soft_delete_cascade = True
+
     class Meta:
         abstract = True
 
     def soft_delete(self):
+        """Помечает удалённой запись и всё, что от неё каскадно зависит."""
         self.is_deleted = True
         self.deleted_at = timezone.now()
+        counts = cascade_soft_delete(type(self), [self.pk], self.deleted_at)
         self.save(update_fields=['is_deleted', 'deleted_at'])
+        return counts
 
     def restore(self):
+        """Восстанавливает запись и зависимые записи, удалённые вместе с ней."""
+        counts = cascade_restore(type(self), [self.pk], self.deleted_at) if self.deleted_at else {}
         self.is_deleted = False
         self.deleted_at = None
         self.save(update_fields=['is_deleted', 'deleted_at'])
+        return counts
 
     def hard_delete(self):
-        super().delete()
\ No newline at end of file
+        super().delete()
+
+class ArchivedRow(models.Model):
+    """
+    Строка, перенесённая из горячей таблицы архиватором (apps.core.archive).
+    Хранит исходные поля как JSON; читается через Model.objects.archived().
+    """
+    model_label = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [models.Index(fields=['model_label', 'object_id'])]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}"
+
+    def to_instance(self):
+        """Несохраняемый экземпляр исходной модели (только для чтения)."""
+        model = apps.get_model(self.model_label)
+        instance = model(**{
+            field.attname: field.to_python(self.data.get(field.attname))
+            for field in model._meta.concrete_fields if field.attname in self.data
+        })
+        instance._archived = True
+        return instance
@@ -1,15 +1,127 @@
+from django.apps import apps
 from django.db import models
+from django.utils import timezone
+
+CASCADE_CHUNK_SIZE = 1000
+
+
+def get_cascade_paths(model, prefix="", seen=()):
+    """
+    Модели с мягким удалением, зависящие от model через on_delete=CASCADE,
+    и путь lookup от них до model. Например, для Property:
+    (Booking, "rental_property"), (Payment, "booking__rental_property"), ...
+    Модель исключается из каскада атрибутом soft_delete_cascade = False.
+    """
+    paths = []
+    for rel in model._meta.related_objects:
+        related_model = rel.related_model
+        if rel.on_delete is not models.CASCADE or not getattr(related_model, "soft_delete_cascade", False):
+            continue
+        if related_model in seen:
+            continue
+        lookup = f"{rel.field.name}__{prefix}" if prefix else rel.field.name
+        paths.append((related_model, lookup))
+        paths.extend(get_cascade_paths(related_model, lookup, (*seen, model)))
+    return paths
+
+
+def _publish_changes(model, pks):
+    """
+    UPDATE не вызывает post_save — изменённые объекты недвижимости
+    публикуются в ленту сами, иначе снимки каталога и подсказок отстанут.
+    """
+    if model._meta.label != "listings.Property":
+        return
+    from apps.listings.change_feed import publish_property_change
+
+    for pk in pks:
+        publish_property_change(pk)
+
+
+def _update_in_chunks(queryset, chunk_size, **values):
+    """
+    UPDATE пачками по первичному ключу: каждая пачка — короткий
+    отдельный запрос, блокировки не держатся на всю выборку.
+    Обновлённые строки выпадают из queryset, поэтому цикл конечен.
+    """
+    total = 0
+    base = queryset.model._base_manager
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return total
+        total += base.filter(pk__in=ids).update(**values)
+        _publish_changes(queryset.model, ids)
+
+
+def cascade_soft_delete(model, pks, deleted_at=None, chunk_size=CASCADE_CHUNK_SIZE):
+    """
+    Помечает удалёнными строки model с pks и всё, что от них зависит.
+    Все строки получают одну метку deleted_at — по ней работает restore.
+    Возвращает {"app.Model": число строк}.
+    """
+    deleted_at = deleted_at or timezone.now()
+    pks = list(pks)
+    counts = {}
+    # Сначала зависимые, затем сами строки: при сбое корень остаётся живым
+    for related_model, lookup in reversed(get_cascade_paths(model)):
+        queryset = related_model._base_manager.filter(**{f"{lookup}__in": pks, "is_deleted": False})
+        counts[related_model._meta.label] = _update_in_chunks(
+            queryset, chunk_size, is_deleted=True, deleted_at=deleted_at
+        )
+    queryset = model._base_manager.filter(pk__in=pks, is_deleted=False)
+    counts[model._meta.label] = _update_in_chunks(queryset, chunk_size, is_deleted=True, deleted_at=deleted_at)
+    return counts
+
+
+def cascade_restore(model, pks, deleted_at, chunk_size=CASCADE_CHUNK_SIZE):
+    """
+    Восстанавливает строки model и зависимые строки, удалённые вместе
+    с ними (с той же меткой deleted_at). Удалённое раньше и отдельно
+    остаётся удалённым.
+    """
+    pks = list(pks)
+    counts = {}
+    queryset = model._base_manager.filter(pk__in=pks, is_deleted=True, deleted_at=deleted_at)
+    counts[model._meta.label] = _update_in_chunks(queryset, chunk_size, is_deleted=False, deleted_at=None)
+    for related_model, lookup in get_cascade_paths(model):
+        queryset = related_model._base_manager.filter(
+            **{f"{lookup}__in": pks, "is_deleted": True, "deleted_at": deleted_at}
+        )
+        counts[related_model._meta.label] = _update_in_chunks(queryset, chunk_size, is_deleted=False, deleted_at=None)
+    return counts
 
 
 class SoftDeleteQuerySet(models.QuerySet):
     def delete(self):
-        return super().update(is_deleted=True)
+        """
+        Каскадное мягкое удаление выборки (см. cascade_soft_delete).
+        Возвращает (всего, {модель: число}), как QuerySet.delete().
+        """
+        counts = cascade_soft_delete(self.model, self.filter(is_deleted=False).values_list("pk", flat=True))
+        return sum(counts.values()), counts
 
     def hard_delete(self):
         return super().delete()
 
     def restore(self):
-        return self.update(is_deleted=False, deleted_at=None)
+        """
+        Каскадное восстановление: строки группируются по deleted_at,
+        чтобы вернуть зависимые, удалённые вместе с каждой из них.
+        """
+        counts = {}
+        by_timestamp = {}
+        for pk, deleted_at in self.filter(is_deleted=True).values_list("pk", "deleted_at"):
+            by_timestamp.setdefault(deleted_at, []).append(pk)
+        for deleted_at, pks in by_timestamp.items():
+            if deleted_at is None:
+                restored = {self.model._meta.label: self.model._base_manager.filter(pk__in=pks).update(is_deleted=False)}
+                _publish_changes(self.model, pks)
+            else:
+                restored = cascade_restore(self.model, pks, deleted_at)
+            for label, count in restored.items():
+                counts[label] = counts.get(label, 0) + count
+        return counts
 
     def alive(self):
         return self.filter(is_deleted=False)
@@ -22,11 +134,27 @@ class SoftDeleteQuerySet(models.QuerySet):
 
 
 class SoftDeleteManager(models.Manager):
+    # Модель со своим QuerySet: SoftDeleteManager.from_queryset(НаследникSoftDeleteQuerySet)
+    _queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).alive()
+        return self._queryset_class(self.model, using=self._db).alive()
 
-    def with_deleted(self):
-        return self.get_queryset().with_deleted()
+    def with_deleted(self, include_archived=False):
+        """
+        Все строки, включая мягко удалённые. С include_archived=True
+        возвращает список, дополненный записями из архива (только для чтения).
+        """
+        # get_queryset() уже отфильтрован alive() — начинаем с полной выборки
+        queryset = self._queryset_class(self.model, using=self._db)
+        if include_archived:
+            return [*queryset, *(row.to_instance() for row in self.archived())]
+        return queryset
 
     def deleted(self):
-        return self.get_queryset().deleted()
\ No newline at end of file
+        return self.with_deleted().deleted()
+
+    def archived(self):
+        """Строки модели, перенесённые в архивную таблицу (ArchivedRow)."""
+        ArchivedRow = apps.get_model("core", "ArchivedRow")
+        return ArchivedRow.objects.filter(model_label=self.model._meta.label)
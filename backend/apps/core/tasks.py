@@ -0,0 +1,24 @@
+import time
+
+from celery import shared_task
+
+
+@shared_task
+def bench_ping(published_at):
+    """Задержка между публикацией и началом выполнения (для bench_task_lanes)."""
+    return time.time() - published_at
+
+
+@shared_task
+def bench_sleep(seconds):
+    """Имитация тяжёлой фоновой задачи (для bench_task_lanes)."""
+    time.sleep(seconds)
+
+
+@shared_task
+def archive_soft_deleted_rows():
+    """Ночной перенос давно удалённых строк в архив."""
+    from apps.core.archive import archive_soft_deleted
+
+    report = archive_soft_deleted()
+    return report.counts
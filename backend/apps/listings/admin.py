@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import Property
+from .models import PriceRule, Property, PropertySignature
+
+
+class PriceRuleInline(admin.TabularInline):
+    model = PriceRule
+    extra = 0
+    fields = ('start_date', 'end_date', 'weekdays', 'nightly_price', 'min_nights', 'priority')
+
 
 @admin.register(Property)
 class PropertyAdmin(admin.ModelAdmin):
@@ -9,3 +16,13 @@ class PropertyAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at', 'view_count', 'average_rating')
     ordering = ('-created_at',)
     filter_horizontal = ()  # Если есть ManyToMany поля
+    inlines = [PriceRuleInline]
+
+
+@admin.register(PropertySignature)
+class PropertySignatureAdmin(admin.ModelAdmin):
+    list_display = ('property', 'duplicate_of', 'similarity', 'updated_at')
+    list_filter = (('duplicate_of', admin.EmptyFieldListFilter),)
+    raw_id_fields = ('property', 'duplicate_of')
+    exclude = ('signature',)
+    ordering = ('-updated_at',)
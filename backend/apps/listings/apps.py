@@ -7,7 +7,7 @@ from django.utils.html import strip_tags
 @shared_task
 def send_booking_confirmation_email(booking_id):
     from apps.bookings.models import Booking
-    booking = Booking.objects.get(id=booking_id)
+    booking = Booking.objects.select_related("rental_property", "user").get(id=booking_id)
 
     subject = f"Подтверждение бронирования {booking.rental_property.title}"
     html_message = render_to_string('emails/../../templates/listings/booking_confirmation.html', {'booking': booking})
@@ -20,7 +20,7 @@ def send_booking_confirmation_email(booking_id):
 @shared_task
 def send_booking_cancelled_email(booking_id):
     from apps.bookings.models import Booking
-    booking = Booking.objects.get(id=booking_id)
+    booking = Booking.objects.select_related("rental_property", "user").get(id=booking_id)
 
     subject = f"Бронирование отменено: {booking.rental_property.title}"
     html_message = render_to_string('emails/../../templates/listings/booking_cancelled.html', {'booking': booking})
@@ -33,7 +33,7 @@ def send_booking_cancelled_email(booking_id):
 @shared_task
 def send_payment_success_email(booking_id):
     from apps.bookings.models import Booking
-    booking = Booking.objects.get(id=booking_id)
+    booking = Booking.objects.select_related("rental_property", "user").get(id=booking_id)
 
     subject = f"Оплата прошла успешно: {booking.rental_property.title}"
     html_message = render_to_string('emails/../../templates/listings/payment_success.html', {'booking': booking})
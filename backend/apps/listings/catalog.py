@@ -0,0 +1,178 @@
+"""
+Колоночный снимок каталога для фильтрации и сортировки без БД.
+
+Каждый процесс держит NumPy-массивы по активным и доступным объектам:
+цена, комнаты, тип, рейтинг, дата создания. Запрос списка с фильтрами
+по этим колонкам считается векторными масками, страница выбирается
+np.argpartition, из БД забираются только строки итоговой страницы.
+
+Снимок дочитывает изменения из ленты (apps.listings.change_feed):
+изменённые id удаляются из массивов и добавляются заново, если объект
+всё ещё подходит; получается новый снимок, старый не меняется. Запросы
+с поиском по тексту или локации идут через ORM, как и всё, пока первый
+снимок строится.
+"""
+import numpy as np
+from django.conf import settings
+
+from apps.listings.change_feed import FeedSnapshotService
+from apps.listings.models import Property
+
+TYPE_CODES = {value: code for code, (value, _) in enumerate(Property.PROPERTY_TYPES)}
+COLUMNS = ("id", "price", "rooms", "property_type", "average_rating", "created_at")
+DTYPES = {
+    "id": np.int64,
+    "price": np.float64,
+    "rooms": np.int32,
+    "property_type": np.int8,
+    "average_rating": np.float64,
+    "created_at": np.int64,
+}
+
+RANGE_FILTERS = {
+    "price__gte": ("price", float, np.greater_equal),
+    "price__lte": ("price", float, np.less_equal),
+    "rooms__gte": ("rooms", int, np.greater_equal),
+    "rooms__lte": ("rooms", int, np.less_equal),
+}
+ORDERINGS = {"price", "created_at", "average_rating"}
+# Параметры, которые снимок понимает; с любыми другими запрос идёт в ORM
+HANDLED_PARAMS = {*RANGE_FILTERS, "property_type", "ordering", "page", "page_size", "format"}
+
+
+def _row_values(row):
+    pk, price, rooms, property_type, rating, created_at = row
+    return (
+        pk, float(price), rooms, TYPE_CODES.get(property_type, -1), float(rating),
+        int(created_at.timestamp() * 1_000_000),
+    )
+
+
+def _load_rows(queryset):
+    return [_row_values(row) for row in queryset.values_list(*COLUMNS)]
+
+
+def _to_columns(rows):
+    columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+    return {name: np.array(values, dtype=DTYPES[name]) for name, values in zip(COLUMNS, columns)}
+
+
+def catalog_queryset():
+    """То же множество, что и PropertyViewSet.get_queryset() без include_deleted."""
+    return Property.objects.filter(is_active=True, is_available=True)
+
+
+class CatalogSnapshot:
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def build(cls):
+        return cls(_to_columns(_load_rows(catalog_queryset())))
+
+    @property
+    def size(self):
+        return len(self.columns["id"])
+
+    def with_changes(self, property_ids):
+        """Новый снимок с перечитанными строками property_ids."""
+        keep = ~np.isin(self.columns["id"], property_ids)
+        fresh = _to_columns(_load_rows(catalog_queryset().filter(pk__in=property_ids)))
+        return CatalogSnapshot({
+            name: np.concatenate([self.columns[name][keep], fresh[name]]) for name in COLUMNS
+        })
+
+    @staticmethod
+    def mask(columns, params):
+        """Булева маска по фильтрам или None, если значение фильтра некорректно."""
+        mask = np.ones(len(columns["id"]), dtype=bool)
+        for param, (column, cast, compare) in RANGE_FILTERS.items():
+            value = params.get(param)
+            if value in (None, ""):
+                continue
+            try:
+                mask &= compare(columns[column], cast(value))
+            except ValueError:
+                return None
+        property_type = params.get("property_type")
+        if property_type:
+            # Неизвестный тип — ORM, где фильтр вернёт 400
+            if property_type not in TYPE_CODES:
+                return None
+            mask &= columns["property_type"] == TYPE_CODES[property_type]
+        return mask
+
+    def select(self, params):
+        """CatalogResult или None, если запрос должен идти через ORM."""
+        if not set(params) <= HANDLED_PARAMS:
+            return None
+        ordering = params.get("ordering") or "-created_at"
+        descending = ordering.startswith("-")
+        column = ordering.lstrip("-")
+        if column not in ORDERINGS:
+            return None
+        columns = self.columns
+        mask = self.mask(columns, params)
+        if mask is None:
+            return None
+        positions = np.flatnonzero(mask)
+        keys = columns[column][positions]
+        return CatalogResult(positions, -keys if descending else keys, columns["id"])
+
+
+class CatalogResult:
+    """
+    Отфильтрованная выборка, которую понимает Paginator: len() и срезы.
+    Сортируется только нужный префикс, строки страницы читаются из БД.
+    """
+
+    def __init__(self, positions, keys, ids):
+        self.positions = positions
+        self.keys = keys
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.positions)
+
+    def count(self):
+        return len(self)
+
+    def _ordered(self, stop):
+        if stop >= len(self.keys):
+            head = np.arange(len(self.keys))
+        else:
+            head = np.argpartition(self.keys, stop)[:stop]
+        ids = self.ids[self.positions[head]]
+        # Равные ключи упорядочиваем по id — страницы стабильны
+        return head[np.lexsort((ids, self.keys[head]))]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            raise TypeError("CatalogResult поддерживает только срезы")
+        start, stop, _ = item.indices(len(self))
+        order = self._ordered(stop)[start:stop]
+        ids = [int(pk) for pk in self.ids[self.positions[order]]]
+        rows = catalog_queryset().in_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]
+
+
+class CatalogService(FeedSnapshotService):
+    """Снимок процесса; перед каждым запросом дочитывает ленту изменений."""
+
+    interval_setting = "CATALOG_REBUILD_INTERVAL"
+
+    def build(self):
+        return CatalogSnapshot.build()
+
+    def apply_changes(self, snapshot, property_ids):
+        return snapshot.with_changes(property_ids)
+
+    def select(self, params):
+        if not getattr(settings, "CATALOG_SNAPSHOT_ENABLED", True):
+            return None
+        snapshot = self.get_snapshot(wait=False)
+        return snapshot.select(params) if snapshot is not None else None
+
+
+catalog_service = CatalogService()
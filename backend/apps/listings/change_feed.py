@@ -0,0 +1,147 @@
+"""
+Лента изменений объектов недвижимости для снимков внутри процессов.
+
+Каждое сохранение или удаление Property получает номер в общем кэше.
+Процесс, держащий снимок (подсказки, колоночный каталог), помнит номер,
+до которого он актуален, и дочитывает только новые id. Если записи
+ленты уже вытеснены или отставание слишком велико — снимок строится заново.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+
+FEED_SEQ_KEY = "property_feed:seq"
+FEED_ITEM_KEY = "property_feed:{}"
+FEED_TTL = 60 * 60
+# Дальше этого отставания дешевле перестроить снимок целиком
+MAX_FEED_LAG = 5000
+
+
+def current_seq():
+    return cache.get(FEED_SEQ_KEY, 0)
+
+
+def _publish(property_id):
+    try:
+        seq = cache.incr(FEED_SEQ_KEY)
+    except ValueError:
+        cache.add(FEED_SEQ_KEY, 0, timeout=None)
+        seq = cache.incr(FEED_SEQ_KEY)
+    cache.set(FEED_ITEM_KEY.format(seq), property_id, timeout=FEED_TTL)
+
+
+def publish_property_change(property_id):
+    """Публикует изменение после коммита транзакции."""
+    transaction.on_commit(lambda: _publish(property_id))
+
+
+def read_changes(since):
+    """
+    (seq, [property_id, ...]) — изменения после номера since.
+    None, если лента неполная и снимок нужно перестроить.
+    """
+    seq = current_seq()
+    if seq == since:
+        return seq, []
+    # seq < since — счётчик ленты потерян (кэш очищен), доверять нельзя
+    if seq < since or seq - since > MAX_FEED_LAG:
+        return None
+    keys = [FEED_ITEM_KEY.format(number) for number in range(since + 1, seq + 1)]
+    items = cache.get_many(keys)
+    if len(items) != len(keys):
+        return None
+    return seq, sorted(set(items.values()))
+
+
+class FeedSnapshotService:
+    """
+    Снимок процесса, актуализируемый по ленте изменений.
+
+    Наследник задаёт build() -> снимок и apply_changes(снимок, [id]) ->
+    новый снимок; прежний не изменяется. Текущий снимок подменяется одной
+    ссылкой, поэтому читатели работают с одной версией без блокировки.
+
+    Перестройка — одна на процесс (single-flight). Устаревший снимок или
+    снимок с неполной лентой перестраивается в фоновом потоке, а запросы
+    тем временем обслуживает прежний. Первый снимок строится в фоне при
+    старте воркера (warm_up) или синхронно при первом обращении.
+    """
+    interval_setting = None
+    default_interval = 3600
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self.snapshot = None
+        self.seq = 0
+        self.built_at = 0.0
+
+    def build(self):
+        raise NotImplementedError
+
+    def apply_changes(self, snapshot, property_ids):
+        raise NotImplementedError
+
+    def _install(self):
+        seq = current_seq()
+        snapshot = self.build()
+        with self._lock:
+            self.snapshot, self.seq, self.built_at = snapshot, seq, time.monotonic()
+        return snapshot
+
+    def rebuild(self):
+        """Синхронная перестройка; параллельный вызов дожидается текущей."""
+        with self._rebuild_lock:
+            return self._install()
+
+    def warm_up(self):
+        """Перестройка в фоновом потоке, если она ещё не идёт."""
+        if not self._rebuild_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self._install()
+            except Exception as e:
+                print(f"[SNAPSHOT] Не удалось перестроить {type(self).__name__}: {e}")
+            finally:
+                self._rebuild_lock.release()
+                connections.close_all()
+
+        threading.Thread(target=run, name=f"{type(self).__name__}-rebuild", daemon=True).start()
+        return True
+
+    def get_snapshot(self, wait=True):
+        """
+        Актуальный снимок. Пока первый снимок строится в фоне, при
+        wait=False возвращается None (вызывающий идёт в БД).
+        """
+        if self.snapshot is None:
+            if not wait and self._rebuild_lock.locked():
+                return None
+            with self._rebuild_lock:
+                if self.snapshot is None:
+                    self._install()
+            return self.snapshot
+
+        max_age = getattr(settings, self.interval_setting, self.default_interval)
+        if time.monotonic() - self.built_at > max_age:
+            self.warm_up()
+        since = self.seq
+        changes = read_changes(since)
+        if changes is None:
+            self.warm_up()
+            return self.snapshot
+        seq, property_ids = changes
+        if seq == since:
+            return self.snapshot
+        with self._lock:
+            # Пока читали ленту, снимок мог смениться — тогда дочитаем в следующий раз
+            if self.seq == since:
+                if property_ids:
+                    self.snapshot = self.apply_changes(self.snapshot, property_ids)
+                self.seq = seq
+        return self.snapshot
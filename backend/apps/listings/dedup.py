@@ -0,0 +1,210 @@
+"""
+Поиск почти одинаковых объявлений: MinHash по шинглам и LSH-корзины.
+
+Подпись — NUM_PERM минимумов хэш-перестановок по шинглам title и
+description; доля совпавших позиций двух подписей оценивает сходство
+Жаккара их текстов. Подпись режется на BANDS полос по ROWS значений;
+объекты с совпадающей полосой попадают в одну корзину (PropertyLSHBand)
+и проверяются точно. Порог, с которого пара почти наверняка попадает
+в кандидаты, ≈ (1 / BANDS) ** (1 / ROWS) ≈ 0.7.
+
+Новый объект проверяется одной выборкой по индексу (band, bucket) —
+без перебора каталога.
+"""
+import hashlib
+from functools import reduce
+from operator import or_
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Q
+
+from apps.listings.models import Property, PropertyLSHBand, PropertySignature
+from apps.listings.shingles import shingle_array
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.8
+
+_PRIME = np.uint64(4294967311)  # простое больше 2**32
+_rng = np.random.RandomState(20240601)
+# a < 2**31, x < 2**32: произведение помещается в uint64
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+
+def listing_text(title, description):
+    return f"{title or ''} {description or ''}"
+
+
+def minhash(shingles):
+    """Подпись uint32[NUM_PERM] по массиву хэшей шинглов."""
+    if len(shingles) == 0:
+        return _EMPTY.copy()
+    values = shingles.astype(np.uint64)[:, None]
+    hashed = (values * _A + _B) % _PRIME
+    return (hashed.min(axis=0) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def signature_for(title, description):
+    return minhash(shingle_array(listing_text(title, description)))
+
+
+def is_empty(signature):
+    """Подпись пустого текста — такие объекты не сравниваем."""
+    return bool((signature == _EMPTY).all())
+
+
+def band_buckets(signature):
+    """[(полоса, корзина)] — 63-битный хэш каждой полосы подписи."""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "big") >> 1))
+    return buckets
+
+
+def similarity(left, right):
+    """Оценка сходства Жаккара по двум подписям."""
+    return float(np.mean(left == right))
+
+
+def from_bytes(raw):
+    return np.frombuffer(bytes(raw), dtype=np.uint32)
+
+
+def find_candidates(signature, exclude_id=None):
+    """Объекты, у которых совпала хотя бы одна полоса подписи."""
+    query = reduce(or_, (Q(band=band, bucket=bucket) for band, bucket in band_buckets(signature)))
+    candidates = PropertyLSHBand.objects.filter(query)
+    if exclude_id is not None:
+        candidates = candidates.exclude(property_id=exclude_id)
+    return set(candidates.values_list("property_id", flat=True))
+
+
+def find_near_duplicates(signature, exclude_id=None, threshold=DUPLICATE_THRESHOLD):
+    """[(property_id, сходство)] по убыванию сходства — только среди активных объектов."""
+    if is_empty(signature):
+        return []
+    candidate_ids = find_candidates(signature, exclude_id)
+    if not candidate_ids:
+        return []
+    rows = PropertySignature.objects.filter(
+        property_id__in=candidate_ids, property__is_active=True, property__is_deleted=False
+    ).values_list("property_id", "signature")
+    matches = [(pk, similarity(signature, from_bytes(raw))) for pk, raw in rows]
+    return sorted(
+        [(pk, score) for pk, score in matches if score >= threshold],
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
+def store_signatures(items):
+    """items: [(property_id, signature)] — пишет подписи и корзины пачкой."""
+    property_ids = [pk for pk, _ in items]
+    with transaction.atomic():
+        PropertyLSHBand.objects.filter(property_id__in=property_ids).delete()
+        existing = set(
+            PropertySignature.objects.filter(property_id__in=property_ids).values_list("property_id", flat=True)
+        )
+        PropertySignature.objects.bulk_create(
+            [PropertySignature(property_id=pk, signature=sig.tobytes()) for pk, sig in items if pk not in existing]
+        )
+        for pk, sig in items:
+            if pk in existing:
+                PropertySignature.objects.filter(property_id=pk).update(signature=sig.tobytes())
+        PropertyLSHBand.objects.bulk_create([
+            PropertyLSHBand(property_id=pk, band=band, bucket=bucket)
+            for pk, sig in items
+            if not is_empty(sig)
+            for band, bucket in band_buckets(sig)
+        ], batch_size=5000)
+
+
+def index_property(property_id):
+    """
+    Считает подпись объекта, ищет более ранние почти-дубликаты и
+    сохраняет подпись в индекс. Возвращает найденные совпадения.
+    """
+    row = Property.objects.filter(pk=property_id).values_list("title", "description").first()
+    if row is None:
+        return []
+    signature = signature_for(*row)
+    duplicates = [
+        (pk, score) for pk, score in find_near_duplicates(signature, exclude_id=property_id) if pk < property_id
+    ]
+    store_signatures([(property_id, signature)])
+    best = duplicates[0] if duplicates else (None, None)
+    PropertySignature.objects.filter(property_id=property_id).update(duplicate_of_id=best[0], similarity=best[1])
+    return duplicates
+
+
+def signatures_for_rows(rows):
+    """[(pk, title, description)] -> [(pk, подпись)]; без БД, годится для пула процессов."""
+    return [(pk, signature_for(title, description)) for pk, title, description in rows]
+
+
+def group_duplicates(items, threshold=DUPLICATE_THRESHOLD):
+    """
+    Кластеры почти-дубликатов в памяти: кандидаты из общих LSH-корзин,
+    проверка подписей, объединение через union-find. Группы от двух объектов.
+    """
+    signatures = dict(items)
+    parent = {pk: pk for pk in signatures}
+
+    def find(pk):
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    buckets = {}
+    for pk, sig in items:
+        if is_empty(sig):
+            continue
+        for key in band_buckets(sig):
+            buckets.setdefault(key, []).append(pk)
+
+    for members in buckets.values():
+        for i, left in enumerate(members):
+            for right in members[i + 1:]:
+                if find(left) != find(right) and similarity(signatures[left], signatures[right]) >= threshold:
+                    parent[find(right)] = find(left)
+
+    groups = {}
+    for pk in signatures:
+        groups.setdefault(find(pk), []).append(pk)
+    return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=lambda group: group[0])
+
+
+def report_to_moderators(groups, limit=50):
+    """Письмо модераторам со списком групп почти-дубликатов. Возвращает число адресатов."""
+    recipients = list(
+        User.objects.filter(groups__name="Moderator", is_active=True)
+        .exclude(email="")
+        .values_list("email", flat=True)
+        .distinct()
+    )
+    if not groups or not recipients:
+        return 0
+    shown = {pk for group in groups[:limit] for pk in group}
+    titles = dict(Property.objects.filter(pk__in=shown).values_list("pk", "title"))
+    lines = [
+        "; ".join(f"#{pk} {titles.get(pk, '')}" for pk in group)
+        for group in groups[:limit]
+    ]
+    if len(groups) > limit:
+        lines.append(f"... и ещё {len(groups) - limit} групп")
+    send_mail(
+        f"Найдено групп почти одинаковых объявлений: {len(groups)}",
+        "\n".join(lines),
+        settings.DEFAULT_FROM_EMAIL,
+        recipients,
+    )
+    return len(recipients)
@@ -0,0 +1,88 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import QueryDict
+
+from apps.listings.catalog import CatalogSnapshot, catalog_queryset
+from apps.listings.models import Property
+
+User = get_user_model()
+
+QUERIES = [
+    "",
+    "ordering=price",
+    "price__gte=50&price__lte=150&ordering=-average_rating",
+    "rooms__gte=3&property_type=house",
+    "property_type=studio&ordering=price&page=20",
+]
+PAGE_SIZE = 10
+
+
+class Command(BaseCommand):
+    help = "Сравнение ORM и колоночного снимка на синтетическом каталоге (данные откатываются)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100000,1000000", help="Размеры каталога через запятую")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        for size in [int(value) for value in options["sizes"].split(",")]:
+            with transaction.atomic():
+                self._seed(size)
+                started = time.perf_counter()
+                snapshot = CatalogSnapshot.build()
+                self.stdout.write(f"\n{size} объектов, снимок построен за {time.perf_counter() - started:.2f} c")
+                for query in QUERIES:
+                    orm = self._measure(lambda: self._orm(query), options["repeat"])
+                    columnar = self._measure(lambda: self._snapshot(snapshot, query), options["repeat"])
+                    self.stdout.write(
+                        f"  {query or '(без фильтров)':<55} ORM {orm * 1000:8.1f} мс   снимок {columnar * 1000:7.1f} мс"
+                    )
+                transaction.set_rollback(True)
+
+    def _measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def _orm(self, query):
+        params = QueryDict(query)
+        queryset = catalog_queryset()
+        for param in ("price__gte", "price__lte", "rooms__gte", "property_type"):
+            if params.get(param):
+                queryset = queryset.filter(**{param: params[param]})
+        queryset = queryset.order_by(params.get("ordering") or "-created_at")
+        page = int(params.get("page", 1))
+        queryset.count()
+        return list(queryset[(page - 1) * PAGE_SIZE:page * PAGE_SIZE])
+
+    def _snapshot(self, snapshot, query):
+        params = QueryDict(query)
+        result = snapshot.select(params)
+        page = int(params.get("page", 1))
+        len(result)
+        return result[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+
+    def _seed(self, size):
+        self.stdout.write(f"Создаём {size} объектов...")
+        rng = random.Random(size)
+        owner = User.objects.create(username=f"bench_catalog_{int(time.time())}")
+        types = [value for value, _ in Property.PROPERTY_TYPES]
+        batch = []
+        for i in range(size):
+            batch.append(Property(
+                title=f"Listing {i}", description="-", location=f"City {i % 500}",
+                price=rng.randint(20, 500), rooms=rng.randint(1, 6), property_type=rng.choice(types),
+                average_rating=round(rng.uniform(1, 5), 2), owner=owner,
+            ))
+            if len(batch) == 5000:
+                Property.objects.bulk_create(batch)
+                batch = []
+        Property.objects.bulk_create(batch)
@@ -0,0 +1,44 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.listings.suggest import KIND_LOCATION, KIND_QUERY, KIND_TITLE, SuggestIndex
+
+
+class Command(BaseCommand):
+    help = "Замер задержки подсказок на синтетическом индексе (без БД)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entries", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=20000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        syllables = ["ber", "lin", "mun", "ich", "ham", "burg", "kö", "ln", "dres", "den", "lei", "pzig", "flat", "loft"]
+
+        def word():
+            return "".join(rng.choice(syllables) for _ in range(rng.randint(1, 3)))
+
+        entries = [
+            (" ".join(word() for _ in range(rng.randint(1, 3))), rng.choice((KIND_LOCATION, KIND_TITLE, KIND_QUERY)),
+             int(rng.paretovariate(1.2)))
+            for _ in range(options["entries"])
+        ]
+        started = time.perf_counter()
+        index = SuggestIndex(entries)
+        self.stdout.write(f"Индекс: {index.size} ключей за {time.perf_counter() - started:.1f} c")
+
+        prefixes = [word()[:rng.randint(1, 6)] or rng.choice(string.ascii_lowercase) for _ in range(options["queries"])]
+        latencies = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            index.search(prefix, 10)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        pick = lambda q: latencies[int(len(latencies) * q) - 1] * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(latencies)} запросов: p50 {pick(0.5):.3f} мс, p99 {pick(0.99):.3f} мс, макс {latencies[-1] * 1000:.3f} мс"
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.listings.similarity import TOP_N, rebuild_neighbor_table
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает таблицу похожих объектов (top-N соседей по признакам)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=TOP_N, help="Сколько соседей хранить на объект")
+        parser.add_argument("--block-size", type=int, help="Строк в одном блоке матрицы сходства")
+
+    def handle(self, *args, **options):
+        stats = rebuild_neighbor_table(top_n=options["top"], block_size=options["block_size"])
+        self.stdout.write(
+            f"Признаки: {stats['features_seconds']} c, соседи: {stats['knn_seconds']} c, "
+            f"запись: {stats['write_seconds']} c"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Объектов: {stats['properties']}, строк в таблице соседей: {stats['neighbors']}"
+        ))
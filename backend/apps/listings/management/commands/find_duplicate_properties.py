@@ -0,0 +1,56 @@
+import time
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand
+
+from apps.listings.dedup import (
+    DUPLICATE_THRESHOLD, group_duplicates, report_to_moderators, signatures_for_rows, store_signatures,
+)
+from apps.listings.models import Property
+
+CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = "Ищет группы почти одинаковых объявлений по всему каталогу (MinHash/LSH)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Сколько процессов считают подписи")
+        parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD, help="Порог сходства 0..1")
+        parser.add_argument("--store", action="store_true", help="Сохранить подписи в LSH-индекс")
+        parser.add_argument("--notify", action="store_true", help="Отправить отчёт модераторам")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = list(
+            Property.objects.filter(is_active=True).order_by("pk").values_list("pk", "title", "description")
+        )
+        chunks = [rows[i:i + CHUNK_SIZE] for i in range(0, len(rows), CHUNK_SIZE)]
+        if options["processes"] > 1:
+            with Pool(options["processes"]) as pool:
+                results = pool.map(signatures_for_rows, chunks)
+        else:
+            results = [signatures_for_rows(chunk) for chunk in chunks]
+        items = [item for chunk in results for item in chunk]
+        signed = time.perf_counter()
+
+        groups = group_duplicates(items, options["threshold"])
+        grouped = time.perf_counter()
+        self.stdout.write(
+            f"Объектов: {len(items)}, подписи: {signed - started:.2f} c, группы: {grouped - signed:.2f} c"
+        )
+
+        if options["store"]:
+            for i in range(0, len(items), CHUNK_SIZE):
+                store_signatures(items[i:i + CHUNK_SIZE])
+            self.stdout.write(f"Подписи сохранены за {time.perf_counter() - grouped:.2f} c")
+
+        for group in groups[:50]:
+            self.stdout.write("  " + ", ".join(f"#{pk}" for pk in group))
+        if len(groups) > 50:
+            self.stdout.write(f"  ... и ещё {len(groups) - 50}")
+
+        if options["notify"]:
+            sent = report_to_moderators(groups)
+            self.stdout.write(f"Отчёт отправлен модераторам: {sent}")
+        self.stdout.write(self.style.SUCCESS(f"Групп почти-дубликатов: {len(groups)}"))
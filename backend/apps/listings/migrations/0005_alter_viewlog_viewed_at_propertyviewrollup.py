@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0004_property_image'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='viewlog',
+            name='viewed_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='PropertyViewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_rollups', to='listings.property')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'period_start', 'property'), name='unique_property_view_rollup')],
+            },
+        ),
+    ]
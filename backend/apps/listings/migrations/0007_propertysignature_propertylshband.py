@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_propertyneighbor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertySignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.BinaryField()),
+                ('similarity', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('duplicate_of', models.ForeignKey(blank=True, help_text='Ранее созданный объект с почти тем же текстом', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='listings.property')),
+                ('property', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='listings.property')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PropertyLSHBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_bands', to='listings.property')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='listings_pr_band_e9daf8_idx')],
+            },
+        ),
+    ]
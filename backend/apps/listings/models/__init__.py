@@ -1,4 +1,5 @@
 from .property import Property
-from .view_log import ViewLog
+from .view_log import ViewLog, PropertyViewRollup
 from .rental import Rental
-
+from .similarity import PropertyNeighbor, PropertySignature, PropertyLSHBand
+from .pricing import PriceRule
@@ -0,0 +1,37 @@
+from django.db import models
+
+from .property import Property
+
+
+class PriceRule(models.Model):
+    """
+    Тариф объекта на диапазон ночей [start_date, end_date) — сезон, выходные.
+    Пустая граница диапазона — без ограничения. Ночи без подходящего
+    тарифа стоят Property.price; из нескольких подходящих действует
+    тариф с большим priority (при равенстве — созданный позже).
+    """
+    # Биты дней недели: 0 — ночь с понедельника на вторник, ..., 6 — с воскресенья
+    ALL_DAYS = 0b1111111
+    WEEKEND_NIGHTS = 0b0110000  # ночи с пятницы и с субботы
+
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='price_rules')
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    weekdays = models.PositiveSmallIntegerField(default=ALL_DAYS)
+    nightly_price = models.DecimalField(max_digits=10, decimal_places=2)
+    min_nights = models.PositiveSmallIntegerField(default=1)
+    priority = models.SmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['property', 'priority', 'id']
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(start_date__isnull=True) | models.Q(end_date__isnull=True)
+                | models.Q(end_date__gt=models.F('start_date')),
+                name='price_rule_valid_dates',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id}: {self.nightly_price} ({self.start_date or '…'} → {self.end_date or '…'})"
@@ -59,12 +59,27 @@ class Property(SoftDeleteModel):
 
 
 # Сигналы
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from apps.listings.utils import send_new_property_notification
+from apps.listings.change_feed import publish_property_change
+from apps.listings.utils import (
+    send_new_property_notification, schedule_signature_update, SEARCHABLE_FIELDS, SIGNATURE_FIELDS,
+)
 
 
 @receiver(post_save, sender=Property)
-def notify_new_property(sender, instance, created, **kwargs):
-    if created:
-        send_new_property_notification(instance)
\ No newline at end of file
+def notify_new_property(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or SEARCHABLE_FIELDS & set(update_fields):
+        send_new_property_notification(instance)
+
+
+@receiver(post_save, sender=Property)
+def update_property_signature(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or SIGNATURE_FIELDS & set(update_fields):
+        schedule_signature_update(instance)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def publish_to_change_feed(sender, instance, **kwargs):
+    publish_property_change(instance.pk)
\ No newline at end of file
@@ -0,0 +1,45 @@
+from django.db import models
+
+from .property import Property
+
+
+class PropertyNeighbor(models.Model):
+    """Похожий объект: top-N соседей пересчитывается пакетно (apps.listings.similarity)."""
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='neighbors')
+    neighbor = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['property', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'rank'], name='unique_property_neighbor_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} → {self.neighbor_id} ({self.score:.3f})"
+
+
+class PropertySignature(models.Model):
+    """MinHash-подпись текста объявления (apps.listings.dedup)."""
+    property = models.OneToOneField(Property, on_delete=models.CASCADE, related_name='signature')
+    signature = models.BinaryField()
+    duplicate_of = models.ForeignKey(
+        Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+        help_text='Ранее созданный объект с почти тем же текстом',
+    )
+    similarity = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Signature of {self.property_id}"
+
+
+class PropertyLSHBand(models.Model):
+    """Корзина LSH: объекты с совпадающей полосой подписи — кандидаты в дубликаты."""
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='lsh_bands')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=['band', 'bucket'])]
@@ -6,7 +6,29 @@ from apps.listings.models.property import Property
 class ViewLog(SoftDeleteModel):
     user = models.ForeignKey(get_user_model(), on_delete=models.SET_NULL, null=True, blank=True)
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='view_logs')
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    viewed_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
-        return f"{self.user} viewed {self.property.title} at {self.viewed_at}"
\ No newline at end of file
+        return f"{self.user} viewed {self.property.title} at {self.viewed_at}"
+
+
+class PropertyViewRollup(models.Model):
+    """Число просмотров объекта за час или за день (см. apps.log.rollups)."""
+    HOUR = 'hour'
+    DAY = 'day'
+    GRANULARITY_CHOICES = [(HOUR, 'Hour'), (DAY, 'Day')]
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    period_start = models.DateTimeField()
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='view_rollups')
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'period_start', 'property'], name='unique_property_view_rollup'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} @ {self.period_start:%Y-%m-%d %H:00} ({self.granularity}): {self.views}"
@@ -0,0 +1,169 @@
+"""
+Расчёт стоимости проживания по ценовому календарю объекта.
+
+Календарь — базовая цена Property.price и тарифы PriceRule (диапазоны
+дат, дни недели, минимальный срок). Цены ночей считаются матрицей
+«тариф × ночь» в NumPy: для каждой ночи берётся последний подходящий
+тариф в порядке (priority, id), без цикла по ночам. Деньги внутри —
+целые копейки int64, наружу — Decimal.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from apps.listings.models import Property
+
+RULE_FIELDS = ("property_id", "start_date", "end_date", "weekdays", "nightly_price", "min_nights")
+# Ординалы вместо отсутствующих границ тарифа
+_OPEN_START = 0
+_OPEN_END = date.max.toordinal() + 1
+
+
+def to_cents(price):
+    return int((Decimal(price) * 100).to_integral_value())
+
+
+def from_cents(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+@dataclass
+class Quote:
+    property_id: int
+    start_date: date
+    end_date: date
+    cents: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    min_nights: int = 1
+    total_cents: int = None
+
+    @property
+    def nights(self):
+        return len(self.cents)
+
+    @property
+    def nightly(self):
+        return [from_cents(value) for value in self.cents.tolist()]
+
+    @property
+    def total(self):
+        return from_cents(self.cents.sum() if self.total_cents is None else self.total_cents)
+
+    @property
+    def meets_min_stay(self):
+        return self.nights >= self.min_nights
+
+    def as_dict(self):
+        return {
+            "property_id": self.property_id,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "nights": self.nights,
+            "min_nights": self.min_nights,
+            "meets_min_stay": self.meets_min_stay,
+            "total": str(self.total),
+            "nightly": [
+                {"date": date.fromordinal(self.start_date.toordinal() + i).isoformat(), "price": str(price)}
+                for i, price in enumerate(self.nightly)
+            ],
+        }
+
+
+class PriceCalendar:
+
+    def __init__(self, property_id, base_price, rules=()):
+        """rules: [(start_date, end_date, weekdays, nightly_price, min_nights)] в порядке (priority, id)."""
+        self.property_id = property_id
+        self.base_cents = to_cents(base_price)
+        rules = list(rules)
+        self.starts = np.array([r[0].toordinal() if r[0] else _OPEN_START for r in rules], dtype=np.int64)
+        self.ends = np.array([r[1].toordinal() if r[1] else _OPEN_END for r in rules], dtype=np.int64)
+        self.weekdays = np.array([r[2] for r in rules], dtype=np.int64)
+        self.cents = np.array([to_cents(r[3]) for r in rules], dtype=np.int64)
+        self.min_nights = np.array([r[4] for r in rules], dtype=np.int64)
+
+    def rates(self, first, last):
+        """(копейки за ночь, минимальный срок по тарифу ночи) для ординалов [first, last)."""
+        days = np.arange(first, last, dtype=np.int64)
+        if not len(self.cents):
+            return np.full(len(days), self.base_cents, dtype=np.int64), np.ones(len(days), dtype=np.int64)
+        weekday = (days - 1) % 7  # date.fromordinal(1) — понедельник
+        applies = (
+            (days >= self.starts[:, None])
+            & (days < self.ends[:, None])
+            & ((self.weekdays[:, None] >> weekday) & 1).astype(bool)
+        )
+        # Последний подходящий тариф — первый True в перевёрнутой матрице
+        covered = applies.any(axis=0)
+        winner = len(self.cents) - 1 - np.argmax(applies[::-1], axis=0)
+        cents = np.where(covered, self.cents[winner], self.base_cents)
+        minimum = np.where(covered, self.min_nights[winner], 1)
+        return cents, minimum
+
+    def quote(self, start_date, end_date):
+        first, last = start_date.toordinal(), end_date.toordinal()
+        if last <= first:
+            return Quote(self.property_id, start_date, end_date)
+        cents, minimum = self.rates(first, last)
+        # Минимальный срок задаёт тариф ночи заезда
+        return Quote(self.property_id, start_date, end_date, cents=cents, min_nights=int(minimum[0]))
+
+
+def load_calendars(property_ids):
+    """{property_id: PriceCalendar} активных объектов — цены и тарифы одним запросом (LEFT JOIN)."""
+    rows = (
+        Property.objects.filter(pk__in=property_ids, is_active=True)
+        .order_by("pk", "price_rules__priority", "price_rules__id")
+        .values_list("pk", "price", *(f"price_rules__{name}" for name in RULE_FIELDS[1:]))
+    )
+    prices, rules = {}, {}
+    for pk, price, *rule in rows:
+        prices[pk] = price
+        # У объекта без тарифов JOIN даёт одну строку с пустыми полями тарифа
+        if rule[3] is not None:
+            rules.setdefault(pk, []).append(rule)
+    return {pk: PriceCalendar(pk, price, rules.get(pk, ())) for pk, price in prices.items()}
+
+
+def quote_many(items):
+    """
+    items: [(property_id, start_date, end_date)] -> [Quote или None] в том же порядке.
+    Цены ночей объекта считаются один раз на общий диапазон его запросов,
+    суммы — разностью префиксных сумм.
+    """
+    calendars = load_calendars({pk for pk, _, _ in items})
+    positions = {}
+    for i, (pk, _, _) in enumerate(items):
+        positions.setdefault(pk, []).append(i)
+
+    quotes = [None] * len(items)
+    for pk, indexes in positions.items():
+        calendar = calendars.get(pk)
+        if calendar is None:
+            continue
+        starts = np.array([items[i][1].toordinal() for i in indexes], dtype=np.int64)
+        ends = np.maximum(np.array([items[i][2].toordinal() for i in indexes], dtype=np.int64), starts)
+        first = int(starts.min())
+        cents, minimum = calendar.rates(first, int(ends.max()) + 1)
+        cumulative = np.concatenate([[0], np.cumsum(cents)])
+        totals = cumulative[ends - first] - cumulative[starts - first]
+        for i, start, end, total in zip(indexes, (starts - first).tolist(), (ends - first).tolist(), totals.tolist()):
+            _, start_date, end_date = items[i]
+            quotes[i] = Quote(
+                pk, start_date, end_date,
+                cents=cents[start:end],
+                min_nights=int(minimum[start]) if end > start else 1,
+                total_cents=total,
+            )
+    return quotes
+
+
+def calendar_for(property_obj):
+    rules = property_obj.price_rules.order_by("priority", "id").values_list(*RULE_FIELDS[1:])
+    return PriceCalendar(property_obj.pk, property_obj.price, rules)
+
+
+def quote_stay(property_obj, start_date, end_date):
+    """Стоимость проживания в объекте с start_date по end_date (ночи до end_date)."""
+    return calendar_for(property_obj).quote(start_date, end_date)
@@ -1,5 +1,8 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Property
+from .models import PriceRule, Property
 
 
 class PropertySerializer(serializers.ModelSerializer):
@@ -8,4 +11,48 @@ class PropertySerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
         fields = "__all__"
-        read_only_fields = ("owner", "created_at", "updated_at")
\ No newline at end of file
+        read_only_fields = ("owner", "created_at", "updated_at")
+
+class PriceRuleSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = PriceRule
+        fields = ("id", "start_date", "end_date", "weekdays", "nightly_price", "min_nights", "priority", "created_at")
+        read_only_fields = ("created_at",)
+
+    def validate(self, data):
+        start_date, end_date = data.get("start_date"), data.get("end_date")
+        if start_date and end_date and end_date <= start_date:
+            raise serializers.ValidationError("Дата окончания тарифа должна быть позже даты начала.")
+        if not 0 < data.get("weekdays", PriceRule.ALL_DAYS) <= PriceRule.ALL_DAYS:
+            raise serializers.ValidationError("weekdays — битовая маска дней недели от 1 до 127.")
+        if data.get("nightly_price", 0) < 0:
+            raise serializers.ValidationError("Цена не может быть отрицательной.")
+        return data
+
+
+MAX_QUOTE_ITEMS = 500
+MAX_QUOTE_NIGHTS = 365
+# Насколько вперёд можно запрашивать цены
+QUOTE_HORIZON_DAYS = 730
+
+
+class QuoteItemSerializer(serializers.Serializer):
+    property_id = serializers.IntegerField(min_value=1)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, data):
+        nights = (data["end_date"] - data["start_date"]).days
+        if nights < 1:
+            raise serializers.ValidationError("Дата выезда должна быть позже даты заезда.")
+        if nights > MAX_QUOTE_NIGHTS:
+            raise serializers.ValidationError(f"Не больше {MAX_QUOTE_NIGHTS} ночей.")
+        today = timezone.now().date()
+        if not today <= data["start_date"] <= today + timedelta(days=QUOTE_HORIZON_DAYS):
+            raise serializers.ValidationError(f"Дата заезда — от сегодня до {QUOTE_HORIZON_DAYS} дней вперёд.")
+        return data
+
+
+class QuoteRequestSerializer(serializers.Serializer):
+    items = QuoteItemSerializer(many=True, allow_empty=False, max_length=MAX_QUOTE_ITEMS)
@@ -0,0 +1,30 @@
+"""
+Шинглы текста объявлений: последовательности из k слов, хэшированные в int.
+
+crc32 одинаков во всех процессах (в отличие от hash()), поэтому шинглы
+можно считать в разных воркерах и сравнивать между собой.
+"""
+import re
+import zlib
+
+import numpy as np
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return WORD_RE.findall((text or "").lower())
+
+
+def shingles(text, k=3):
+    """Множество хэшей k-шинглов по словам; короткий текст — один шингл."""
+    words = tokenize(text)
+    if not words:
+        return set()
+    if len(words) <= k:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {zlib.crc32(" ".join(words[i:i + k]).encode()) for i in range(len(words) - k + 1)}
+
+
+def shingle_array(text, k=3):
+    return np.fromiter(shingles(text, k), dtype=np.uint32)
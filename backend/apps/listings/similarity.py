@@ -0,0 +1,150 @@
+"""
+Похожие объекты: признаки, поиск ближайших соседей и таблица соседей.
+
+Каждый активный объект превращается в вектор из блоков: тип (one-hot),
+комнаты, логарифм цены, хэш слов локации, рейтинг и хэш шинглов
+описания. Блоки взвешены, строки нормированы — косинусная близость
+становится скалярным произведением. Матрица сходства считается блоками
+строк (Xb @ X.T), чтобы память не росла как N².
+
+Результат пишется в PropertyNeighbor; запросы читают его по индексу.
+"""
+import time
+import zlib
+
+import numpy as np
+from django.db import transaction
+
+from apps.listings.models import Property, PropertyNeighbor
+from apps.listings.shingles import shingles, tokenize
+
+TOP_N = 10
+LOCATION_BUCKETS = 64
+SHINGLE_BUCKETS = 256
+# Сколько float32 держит одна блочная матрица сходства (~128 МБ)
+BLOCK_CELLS = 32_000_000
+WRITE_CHUNK_SIZE = 5000
+
+WEIGHTS = {
+    "type": 1.0,
+    "rooms": 0.8,
+    "price": 1.0,
+    "location": 1.2,
+    "rating": 0.3,
+    "description": 0.8,
+}
+TYPE_INDEX = {value: i for i, (value, _) in enumerate(Property.PROPERTY_TYPES)}
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def build_features(rows):
+    """
+    rows: [(property_type, rooms, price, location, average_rating, description)].
+    Возвращает матрицу float32 N×D с нормированными строками.
+    """
+    count = len(rows)
+    types = np.zeros((count, len(TYPE_INDEX)), dtype=np.float32)
+    location = np.zeros((count, LOCATION_BUCKETS), dtype=np.float32)
+    description = np.zeros((count, SHINGLE_BUCKETS), dtype=np.float32)
+    rooms = np.zeros(count, dtype=np.float32)
+    price = np.zeros(count, dtype=np.float32)
+    rating = np.zeros(count, dtype=np.float32)
+
+    for i, (property_type, room_count, price_value, location_text, rating_value, text) in enumerate(rows):
+        if property_type in TYPE_INDEX:
+            types[i, TYPE_INDEX[property_type]] = 1
+        rooms[i] = room_count or 0
+        price[i] = np.log1p(float(price_value or 0))
+        rating[i] = float(rating_value or 0)
+        for word in tokenize(location_text):
+            location[i, zlib.crc32(word.encode()) % LOCATION_BUCKETS] = 1
+        for shingle in shingles(text):
+            description[i, shingle % SHINGLE_BUCKETS] += 1
+
+    def closeness(column):
+        # Число -> точка на четверти окружности: скалярное произведение
+        # двух точек равно cos(разницы), т.е. тем больше, чем ближе значения
+        low, high = np.percentile(column, [1, 99]) if count else (0, 0)
+        angle = np.clip((column - low) / ((high - low) or 1), 0, 1) * (np.pi / 2)
+        return np.column_stack([np.cos(angle), np.sin(angle)])
+
+    blocks = [
+        WEIGHTS["type"] * types,
+        WEIGHTS["rooms"] * closeness(rooms),
+        WEIGHTS["price"] * closeness(price),
+        WEIGHTS["location"] * _normalize_rows(location),
+        WEIGHTS["rating"] * closeness(rating),
+        WEIGHTS["description"] * _normalize_rows(description),
+    ]
+    return _normalize_rows(np.hstack(blocks).astype(np.float32))
+
+
+def nearest_neighbors(features, top_n=TOP_N, block_size=None):
+    """(индексы N×k, близости N×k) по убыванию близости, без самого объекта."""
+    count = len(features)
+    k = min(top_n, count - 1)
+    if k <= 0:
+        return np.empty((count, 0), dtype=np.int64), np.empty((count, 0), dtype=np.float32)
+    block_size = block_size or max(1, BLOCK_CELLS // count)
+
+    indices = np.empty((count, k), dtype=np.int64)
+    scores = np.empty((count, k), dtype=np.float32)
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        similarity = features[start:stop] @ features.T
+        similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    return indices, scores
+
+
+def rebuild_neighbor_table(top_n=TOP_N, block_size=None):
+    """Пересчитывает таблицу соседей для всех активных объектов. Возвращает статистику."""
+    started = time.perf_counter()
+    data = list(
+        Property.objects.filter(is_active=True, is_deleted=False)
+        .order_by("pk")
+        .values_list("pk", "property_type", "rooms", "price", "location", "average_rating", "description")
+    )
+    ids = np.array([row[0] for row in data], dtype=np.int64)
+    features = build_features([row[1:] for row in data])
+    featurized = time.perf_counter()
+
+    indices, scores = nearest_neighbors(features, top_n, block_size)
+    computed = time.perf_counter()
+
+    neighbors = [
+        PropertyNeighbor(property_id=int(ids[i]), neighbor_id=int(ids[j]), rank=rank, score=float(score))
+        for i in range(len(ids))
+        for rank, (j, score) in enumerate(zip(indices[i], scores[i]), start=1)
+    ]
+    with transaction.atomic():
+        PropertyNeighbor.objects.all()._raw_delete(PropertyNeighbor.objects.db)
+        PropertyNeighbor.objects.bulk_create(neighbors, batch_size=WRITE_CHUNK_SIZE)
+    finished = time.perf_counter()
+
+    return {
+        "properties": len(ids),
+        "neighbors": len(neighbors),
+        "features_seconds": round(featurized - started, 3),
+        "knn_seconds": round(computed - featurized, 3),
+        "write_seconds": round(finished - computed, 3),
+    }
+
+
+def similar_properties(property_id, limit=TOP_N):
+    """Соседи объекта из таблицы — один запрос по индексу."""
+    rows = (
+        PropertyNeighbor.objects.filter(property_id=property_id, neighbor__is_active=True, neighbor__is_deleted=False)
+        .select_related("neighbor")
+        .order_by("rank")[:limit]
+    )
+    return [row.neighbor for row in rows]
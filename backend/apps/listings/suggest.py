@@ -0,0 +1,244 @@
+"""
+Подсказки при вводе: локации, популярные названия объектов и частые запросы.
+
+Индекс — отсортированный список нормализованных ключей и параллельные
+массивы весов и типов. Префикс находится двумя bisect, лучшие по весу
+выбираются np.argpartition только внутри найденного диапазона. Для
+очень широких диапазонов (1–2 буквы) результат запоминается.
+
+Каждая строка индексируется также с начала каждого следующего слова:
+"mitte" находит "Berlin, Mitte".
+
+Изменения объектов дочитываются из ленты (apps.listings.change_feed)
+в небольшой добавочный словарь: для затронутых локаций и названий вес
+пересчитывается по БД так же, как при построении индекса, а вес 0
+скрывает строку индекса (объект удалён или снят). Целиком индекс
+перестраивается в фоне, когда лента неполна, добавок разросся или
+индекс устарел.
+"""
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+from django.db.models import Count, F, Sum
+
+from apps.listings.change_feed import FeedSnapshotService
+from apps.listings.models import Property
+
+KIND_LOCATION = 0
+KIND_TITLE = 1
+KIND_QUERY = 2
+KIND_NAMES = {KIND_LOCATION: "location", KIND_TITLE: "title", KIND_QUERY: "query"}
+
+TITLE_LIMIT = 20000
+QUERY_LIMIT = 5000
+# Диапазоны шире этого считаются один раз и запоминаются
+HOT_RANGE = 20000
+MAX_OVERLAY = 5000
+# Сколько строк индекса сверх limit берётся, чтобы добавок мог их перевзвесить
+MAX_OVERFETCH = 500
+_END = "\U0010ffff"
+
+
+def normalize(text):
+    return " ".join((text or "").lower().replace(",", " ").split())
+
+
+def _word_starts(key):
+    """Ключ и все его хвосты, начинающиеся с нового слова."""
+    yield key
+    position = key.find(" ")
+    while position != -1:
+        yield key[position + 1:]
+        position = key.find(" ", position + 1)
+
+
+class SuggestIndex:
+
+    def __init__(self, entries):
+        """entries: [(текст, тип, вес)]; одинаковые тексты одного типа суммируются."""
+        merged = Counter()
+        for text, kind, weight in entries:
+            text = (text or "").strip()
+            if text:
+                merged[(text, kind)] += weight
+
+        rows = []
+        for (text, kind), weight in merged.items():
+            for key in _word_starts(normalize(text)):
+                rows.append((key, text, kind, weight))
+        rows.sort(key=lambda row: row[0])
+
+        self.keys = [row[0] for row in rows]
+        self.texts = [row[1] for row in rows]
+        self.kinds = np.fromiter((row[2] for row in rows), dtype=np.int8, count=len(rows))
+        self.weights = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+        self._hot = {}
+
+    @property
+    def size(self):
+        return len(self.keys)
+
+    def _top_positions(self, lo, hi, count):
+        if hi - lo <= count:
+            positions = np.arange(lo, hi)
+        else:
+            positions = lo + np.argpartition(-self.weights[lo:hi], count)[:count]
+        return positions[np.argsort(-self.weights[positions], kind="stable")]
+
+    def search(self, prefix, limit=10):
+        """[(текст, тип, вес)] по убыванию веса, без повторов текста."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _END, lo)
+        # Один текст может попасть в диапазон несколькими ключами — берём с запасом
+        count = limit * 3
+        if hi - lo > HOT_RANGE:
+            positions = self._hot.get((prefix, count))
+            if positions is None:
+                positions = self._hot[(prefix, count)] = self._top_positions(lo, hi, count)
+        else:
+            positions = self._top_positions(lo, hi, count)
+
+        results = []
+        seen = set()
+        for position in positions:
+            text = self.texts[position]
+            if text in seen:
+                continue
+            seen.add(text)
+            results.append((text, int(self.kinds[position]), int(self.weights[position])))
+            if len(results) == limit:
+                break
+        return results
+
+
+def collect_entries():
+    """Локации активных объектов, популярные названия и частые запросы за 30 дней."""
+    from apps.log.models import SearchHistory
+
+    active = Property.objects.filter(is_active=True)
+    entries = [
+        (row["location"], KIND_LOCATION, row["total"])
+        for row in active.values("location").annotate(total=Count("pk")).order_by()
+    ]
+    entries += [
+        (title, KIND_TITLE, views + 1)
+        for title, views in active.order_by(F("view_count").desc(), "-average_rating")
+        .values_list("title", "view_count")[:TITLE_LIMIT]
+    ]
+    entries += [
+        (row["search_query"], KIND_QUERY, row["count"])
+        for row in SearchHistory.get_popular_queries(limit=QUERY_LIMIT)
+    ]
+    return entries
+
+
+def load_property_texts():
+    """{id: (локация, название)} активных объектов — чтобы знать прежние тексты изменённых."""
+    return {
+        pk: (location, title)
+        for pk, location, title in Property.objects.filter(is_active=True).values_list("pk", "location", "title")
+    }
+
+
+def current_weights(affected):
+    """{(текст, тип): вес} по активным объектам — те же формулы, что в collect_entries."""
+    locations = [text for text, kind in affected if kind == KIND_LOCATION]
+    titles = [text for text, kind in affected if kind == KIND_TITLE]
+    active = Property.objects.filter(is_active=True)
+    weights = {}
+    if locations:
+        for row in active.filter(location__in=locations).values("location").annotate(total=Count("pk")).order_by():
+            weights[(row["location"], KIND_LOCATION)] = row["total"]
+    if titles:
+        rows = (
+            active.filter(title__in=titles).values("title")
+            .annotate(total=Sum("view_count") + Count("pk")).order_by()
+        )
+        for row in rows:
+            weights[(row["title"], KIND_TITLE)] = row["total"]
+    return weights
+
+
+def _text_keys(texts):
+    if texts is None:
+        return []
+    location, title = texts
+    return [(text, kind) for text, kind in ((location, KIND_LOCATION), (title, KIND_TITLE)) if text]
+
+
+class SuggestSnapshot:
+    """Индекс, тексты объектов и добавок {(текст, тип): вес}; не изменяется после создания."""
+
+    def __init__(self, index, property_texts, overlay=None):
+        self.index = index
+        self.property_texts = property_texts
+        self.overlay = overlay or {}
+
+    @classmethod
+    def build(cls):
+        return cls(SuggestIndex(collect_entries()), load_property_texts())
+
+    def with_changes(self, property_ids):
+        property_texts = dict(self.property_texts)
+        affected = set()
+        for pk in property_ids:
+            affected.update(_text_keys(property_texts.pop(pk, None)))
+        rows = Property.objects.filter(pk__in=property_ids, is_active=True).values_list("pk", "location", "title")
+        for pk, location, title in rows:
+            property_texts[pk] = (location, title)
+            affected.update(_text_keys((location, title)))
+        weights = current_weights(affected)
+        # Индекс хранит тексты без крайних пробелов
+        updates = Counter()
+        for text, kind in affected:
+            updates[(text.strip(), kind)] += weights.get((text, kind), 0)
+        return SuggestSnapshot(self.index, property_texts, {**self.overlay, **updates})
+
+    def suggest(self, prefix, limit=10):
+        results = []
+        seen = set()
+        # Добавок обнуляет или поднимает строки индекса — берём с запасом и режем после перевзвешивания
+        fetch = limit + min(len(self.overlay), MAX_OVERFETCH)
+        for text, kind, weight in self.index.search(prefix, fetch):
+            seen.add((text, kind))
+            weight = self.overlay.get((text, kind), weight)
+            if weight > 0:
+                results.append((text, kind, weight))
+        prefix = normalize(prefix)
+        if prefix and self.overlay:
+            shown = {text for text, _, _ in results}
+            for (text, kind), weight in self.overlay.items():
+                if weight <= 0 or (text, kind) in seen or text in shown:
+                    continue
+                if any(start.startswith(prefix) for start in _word_starts(normalize(text))):
+                    results.append((text, kind, weight))
+        results.sort(key=lambda item: -item[2])
+        return results[:limit]
+
+
+class SuggestService(FeedSnapshotService):
+    """Снимок подсказок процесса; добавок дочитывается из ленты изменений."""
+
+    interval_setting = "SUGGEST_REBUILD_INTERVAL"
+
+    def build(self):
+        return SuggestSnapshot.build()
+
+    def apply_changes(self, snapshot, property_ids):
+        return snapshot.with_changes(property_ids)
+
+    def suggest(self, prefix, limit=10):
+        snapshot = self.get_snapshot()
+        if len(snapshot.overlay) > MAX_OVERLAY:
+            self.warm_up()
+        return [
+            {"text": text, "kind": KIND_NAMES[kind], "score": weight}
+            for text, kind, weight in snapshot.suggest(prefix, limit)
+        ]
+
+
+suggest_service = SuggestService()
@@ -0,0 +1,20 @@
+from celery import shared_task
+
+
+@shared_task
+def rebuild_similar_properties():
+    """Ночной пересчёт таблицы похожих объектов (apps.listings.similarity)."""
+    from .similarity import rebuild_neighbor_table
+
+    return rebuild_neighbor_table()
+
+
+@shared_task
+def index_property_signature(property_id):
+    """Подпись MinHash нового или изменённого объекта и поиск его почти-дубликатов."""
+    from .dedup import index_property
+
+    duplicates = index_property(property_id)
+    if duplicates:
+        print(f"[DEDUP] Объект {property_id} похож на {duplicates[0][0]} ({duplicates[0][1]:.2f})")
+    return len(duplicates)
@@ -1,2 +1,24 @@
+from django.db import transaction
+
+# Изменения этих полей могут сделать объект подходящим под сохранённые поиски
+SEARCHABLE_FIELDS = {"title", "description", "location", "price", "rooms", "property_type", "is_active"}
+# Поля, из которых строится подпись MinHash (apps.listings.dedup)
+SIGNATURE_FIELDS = {"title", "description"}
+
+
 def send_new_property_notification(property_instance):
-    print(f"New property added: {property_instance.title}")
+    """
+    Ставит проверку объекта по сохранённым поискам после коммита транзакции.
+    """
+    from apps.log.tasks import percolate_property
+
+    property_id = property_instance.pk
+    transaction.on_commit(lambda: percolate_property.delay(property_id))
+
+
+def schedule_signature_update(property_instance):
+    """Ставит пересчёт подписи и поиск почти-дубликатов после коммита."""
+    from apps.listings.tasks import index_property_signature
+
+    property_id = property_instance.pk
+    transaction.on_commit(lambda: index_property_signature.delay(property_id))
@@ -1,5 +1,6 @@
 from django.shortcuts import get_object_or_404
 from django.core.cache import cache
+from django.db.models import Q
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
@@ -7,9 +8,14 @@ from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Property
-from .serializers import PropertySerializer
+from .catalog import catalog_service
+from .pricing import quote_many
+from .serializers import PriceRuleSerializer, PropertySerializer, QuoteRequestSerializer
+from .similarity import similar_properties
+from .suggest import suggest_service
 from apps.users.permissions import IsLandlord, IsOwnerOrReadOnly
 from apps.bookings.models import Booking
+from apps.log.search_log import log_search
 
 
 class PropertyPagination(PageNumberPagination):
@@ -37,16 +43,35 @@ class PropertyViewSet(viewsets.ModelViewSet):
     ordering_fields = ["price", "created_at", "average_rating"]
     ordering = ["-created_at"]
 
+    def include_deleted(self):
+        """Удалённые объекты видят только персонал (все) и владельцы (свои)."""
+        return self.request.query_params.get("include_deleted") == "true" and self.request.user.is_authenticated
+
     def get_queryset(self):
-        include_deleted = self.request.query_params.get("include_deleted") == "true"
-        qs = Property.objects.with_deleted() if include_deleted else Property.objects.all()
+        qs = Property.objects.all()
+        if self.include_deleted():
+            user = self.request.user
+            qs = Property.objects.with_deleted()
+            if not user.is_staff:
+                qs = qs.filter(Q(is_deleted=False) | Q(owner=user))
         return qs.filter(is_active=True, is_available=True)
 
     def list(self, request, *args, **kwargs):
+        # Поиск попадает в SearchHistory асинхронно, пачками (apps.log.search_log)
+        log_search(request.query_params, request.user)
+        if self.include_deleted():
+            # Выдача зависит от пользователя — общий кэш списка не используем
+            return super().list(request, *args, **kwargs)
         cache_key = f"property_list_{request.GET.urlencode()}"
         cached_data = cache.get(cache_key)
         if cached_data is None:
-            response = super().list(request, *args, **kwargs)
+            # Фильтры и сортировка по числовым колонкам — из снимка в памяти
+            result = catalog_service.select(request.query_params)
+            if result is not None:
+                page = self.paginate_queryset(result)
+                response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+            else:
+                response = super().list(request, *args, **kwargs)
             cache.set(cache_key, response.data, timeout=300)
             return response
         return Response(cached_data)
@@ -54,6 +79,53 @@ class PropertyViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    # --- Похожие объекты ---
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def similar(self, request, pk=None):
+        """Похожие объекты из предрассчитанной таблицы соседей; неизвестный или удалённый объект — 404."""
+        property_obj = self.get_object()
+        return Response(self.get_serializer(similar_properties(property_obj.pk), many=True).data)
+
+    # --- Ценовой календарь ---
+    @action(detail=True, methods=["get", "post"], url_path="price-rules",
+            permission_classes=[permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly])
+    def price_rules(self, request, pk=None):
+        """Тарифы объекта; добавлять их может только владелец."""
+        property_obj = self.get_object()
+        if request.method == "GET":
+            rules = property_obj.price_rules.order_by("priority", "id")
+            return Response(PriceRuleSerializer(rules, many=True).data)
+        serializer = PriceRuleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(property=property_obj)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    # --- Расчёт стоимости пачкой ---
+    @action(detail=False, methods=["post"], permission_classes=[permissions.AllowAny])
+    def quotes(self, request):
+        """Стоимость для списка {property_id, start_date, end_date} — с разбивкой по ночам."""
+        serializer = QuoteRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = [
+            (item["property_id"], item["start_date"], item["end_date"])
+            for item in serializer.validated_data["items"]
+        ]
+        results = [
+            quote.as_dict() if quote is not None else {"property_id": pk, "error": "Объект не найден."}
+            for (pk, _, _), quote in zip(items, quote_many(items))
+        ]
+        return Response({"results": results})
+
+    # --- Подсказки при вводе ---
+    @action(detail=False, methods=["get"], permission_classes=[permissions.AllowAny])
+    def suggest(self, request):
+        """Локации, названия и частые запросы по префиксу (?q=ber&limit=10)."""
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        return Response(suggest_service.suggest(request.query_params.get("q", ""), limit))
+
     # --- Soft delete ---
     @action(detail=True, methods=["delete"], permission_classes=[permissions.IsAuthenticated, IsOwnerOrReadOnly])
     def soft_delete(self, request, pk=None):
@@ -66,8 +138,8 @@ class PropertyViewSet(viewsets.ModelViewSet):
     def restore(self, request, pk=None):
         property_obj = get_object_or_404(Property.objects.with_deleted(), pk=pk)
         self.check_object_permissions(request, property_obj)
-        property_obj.restore()
-        return Response({"detail": "Property restored."}, status=status.HTTP_200_OK)
+        restored = property_obj.restore()
+        return Response({"detail": "Property restored.", "restored": restored}, status=status.HTTP_200_OK)
 
     # --- Hard delete ---
     @action(detail=True, methods=["delete"], url_path="hard-delete", permission_classes=[permissions.IsAuthenticated, IsOwnerOrReadOnly])
@@ -3,6 +3,8 @@ from django.contrib import messages
 from django.utils import timezone
 from django.urls import reverse
 from apps.listings.models import Property
+from apps.listings.pricing import quote_stay
+from apps.listings.similarity import similar_properties
 from apps.bookings.models import Booking
 from apps.reviews.models import Review
 from apps.users.decorators import landlord_required
@@ -49,16 +51,19 @@ def property_detail_html(request, pk):
             return redirect(request.path)
 
 
-        booking = Booking.objects.create(
+        quote = quote_stay(property_obj, start_date_parsed, end_date_parsed)
+        if not quote.meets_min_stay:
+            messages.error(request, f"Минимальный срок проживания на эти даты — {quote.min_nights} ноч.")
+            return redirect(request.path)
+
+        booking = Booking(
             user=request.user,
             rental_property=property_obj,
             start_date=start_date_parsed,
             end_date=end_date_parsed,
         )
-
-
-        booking.total_price = booking.total_price
-        booking.save(update_fields=["updated_at"])
+        booking.apply_quote(quote)
+        booking.save()
 
         messages.success(request, f"Бронирование создано! Итоговая сумма: {booking.total_price} руб.")
         return redirect("booking-confirmation", pk=booking.id)
@@ -90,7 +95,10 @@ def property_detail_html(request, pk):
         return redirect(request.path)
 
 
-    return render(request, "listings/property_detail.html", {"property": property_obj})
+    return render(request, "listings/property_detail.html", {
+        "property": property_obj,
+        "similar_properties": similar_properties(property_obj.pk, limit=6),
+    })
 
 
 def booking_success(request, pk):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SearchHistory
+from .models import SearchHistory, SavedSearch, SearchQueryRollup
 
 @admin.register(SearchHistory)
 class SearchHistoryAdmin(admin.ModelAdmin):
@@ -8,3 +8,21 @@ class SearchHistoryAdmin(admin.ModelAdmin):
     search_fields = ('search_query', 'location', 'user__username')
     readonly_fields = ('created_at',)
     ordering = ('-created_at',)
+
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('user', 'name', 'search_query', 'location', 'property_type', 'is_active', 'last_notified_at')
+    list_filter = ('is_active', 'property_type', 'created_at')
+    search_fields = ('name', 'search_query', 'location', 'user__username')
+    readonly_fields = ('created_at', 'last_notified_at')
+
+
+
+@admin.register(SearchQueryRollup)
+class SearchQueryRollupAdmin(admin.ModelAdmin):
+    list_display = ('search_query', 'granularity', 'period_start', 'count')
+    list_filter = ('granularity', 'period_start')
+    search_fields = ('search_query',)
+    ordering = ('-period_start', '-count')
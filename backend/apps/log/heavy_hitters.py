@@ -0,0 +1,92 @@
+"""
+Популярные поисковые запросы в скользящих окнах (Space-Saving).
+
+Для каждого окна время делится на корзины (5 минут для часа, час для
+суток, день для недели). В корзине хранится сводка Space-Saving не
+больше CAPACITY запросов: при переполнении вытесняется запрос с
+минимальным счётчиком, а новый наследует его значение как погрешность.
+Ответ — сумма сводок последних корзин окна: объём работы ограничен
+числом корзин и CAPACITY и не зависит от размера истории.
+
+Сводка корзины обновляется чтением и перезаписью, поэтому писатель
+один: record_queries вызывают только задачи очереди analytics
+(record_search_batch, record_popular_queries), а её воркер однопоточный.
+"""
+import time
+
+from django.core.cache import cache
+
+CAPACITY = 100
+BUCKET_KEY = "heavy_hitters:{}:{}"
+TOP_CACHE_KEY = "heavy_hitters_top:{}:{}"
+TOP_CACHE_TIMEOUT = 30
+
+# окно: (длина корзины в секундах, число корзин)
+WINDOWS = {
+    "hour": (300, 12),
+    "day": (3600, 24),
+    "week": (86400, 7),
+}
+
+
+def normalize_query(query):
+    return " ".join((query or "").lower().split())
+
+
+def space_saving_update(summary, counts, capacity=CAPACITY):
+    """summary: {запрос: [count, error]}; counts: {запрос: прирост}."""
+    for query, weight in counts.items():
+        if query in summary:
+            summary[query][0] += weight
+        elif len(summary) < capacity:
+            summary[query] = [weight, 0]
+        else:
+            victim = min(summary, key=lambda key: summary[key][0])
+            floor = summary.pop(victim)[0]
+            summary[query] = [floor + weight, floor]
+    return summary
+
+
+def _bucket_start(window, now):
+    size, _ = WINDOWS[window]
+    return int(now // size) * size
+
+
+def record_queries(queries, now=None):
+    """Учитывает пачку запросов во всех окнах. Только из очереди analytics (см. выше)."""
+    counts = {}
+    for query in queries:
+        query = normalize_query(query)
+        if query:
+            counts[query] = counts.get(query, 0) + 1
+    if not counts:
+        return
+
+    now = now or time.time()
+    keys = {window: BUCKET_KEY.format(window, _bucket_start(window, now)) for window in WINDOWS}
+    summaries = cache.get_many(keys.values())
+    for window, key in keys.items():
+        size, buckets = WINDOWS[window]
+        summary = space_saving_update(summaries.get(key) or {}, counts)
+        cache.set(key, summary, timeout=size * (buckets + 1))
+
+
+def top_queries(window="day", limit=10, now=None):
+    """[{"search_query", "count"}] за последнее окно, по убыванию count."""
+    if window not in WINDOWS:
+        raise ValueError(f"Неизвестное окно: {window}")
+    now = now or time.time()
+    size, buckets = WINDOWS[window]
+    current = _bucket_start(window, now)
+
+    top_key = TOP_CACHE_KEY.format(window, current)
+    cached = cache.get(top_key)
+    if cached is None:
+        keys = [BUCKET_KEY.format(window, current - size * i) for i in range(buckets)]
+        totals = {}
+        for summary in cache.get_many(keys).values():
+            for query, (count, _) in summary.items():
+                totals[query] = totals.get(query, 0) + count
+        cached = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:CAPACITY]
+        cache.set(top_key, cached, timeout=TOP_CACHE_TIMEOUT)
+    return [{"search_query": query, "count": count} for query, count in cached[:limit]]
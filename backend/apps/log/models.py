@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from apps.core.models import SoftDeleteModel
 
@@ -10,14 +13,75 @@ class SearchHistory(SoftDeleteModel):
     max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     rooms = models.PositiveIntegerField(null=True, blank=True)
     property_type = models.CharField(max_length=20, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"Search by {self.user.username if self.user else 'Anonymous'}: {self.search_query}"
 
     @classmethod
-    def get_popular_queries(cls, limit=10):
-        """Возвращает популярные поисковые запросы"""
-        return cls.objects.values('search_query').annotate(
-            count=models.Count('search_query')
-        ).order_by('-count')[:limit]
\ No newline at end of file
+    def get_popular_queries(cls, limit=10, days=30):
+        """
+        Возвращает популярные поисковые запросы за последние days дней.
+        Читает дневные агрегаты (SearchQueryRollup), а не сырую историю.
+        """
+        since = timezone.now() - timedelta(days=days)
+        return SearchQueryRollup.objects.filter(
+            granularity=SearchQueryRollup.DAY, period_start__gte=since
+        ).values('search_query').annotate(
+            count=models.Sum('count')
+        ).order_by('-count')[:limit]
+
+
+class SearchQueryRollup(models.Model):
+    """Число поисков по запросу за час или за день (см. apps.log.rollups)."""
+    HOUR = 'hour'
+    DAY = 'day'
+    GRANULARITY_CHOICES = [(HOUR, 'Hour'), (DAY, 'Day')]
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    period_start = models.DateTimeField()
+    search_query = models.CharField(max_length=200)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'period_start', 'search_query'], name='unique_search_query_rollup'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.search_query} @ {self.period_start:%Y-%m-%d %H:00} ({self.granularity}): {self.count}"
+
+class SavedSearch(SoftDeleteModel):
+    """Сохранённый поиск — по нему пользователь получает уведомления о новых объектах."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    search_query = models.CharField(max_length=200, blank=True)
+    location = models.CharField(max_length=200, blank=True, null=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    rooms = models.PositiveIntegerField(null=True, blank=True)
+    property_type = models.CharField(max_length=20, null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    last_notified_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Saved search by {self.user.username}: {self.name or self.search_query or self.location}"
+
+    @classmethod
+    def from_history(cls, history):
+        """Создаёт сохранённый поиск из записи истории поиска."""
+        return cls.objects.create(
+            user=history.user,
+            search_query=history.search_query,
+            location=history.location,
+            min_price=history.min_price,
+            max_price=history.max_price,
+            rooms=history.rooms,
+            property_type=history.property_type,
+        )
@@ -0,0 +1,140 @@
+"""
+Перколятор сохранённых поисков: вместо перебора всех SavedSearch
+для нового объекта ищем подходящие поиски по индексу.
+
+Поиски раскладываются по корзинам (тип объекта, токен локации);
+внутри корзины строки отсортированы по нижней границе цены, поэтому
+интервальная проверка цены и комнат делается одним срезом и векторной маской.
+"""
+import re
+from collections import defaultdict
+
+import numpy as np
+from django.core.cache import cache
+
+INDEX_VERSION_KEY = "saved_search_index_version"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_index = None
+_index_version = None
+
+
+def tokenize(text):
+    return frozenset(TOKEN_RE.findall((text or "").lower()))
+
+
+class _Bucket:
+    """Поиски с одинаковым типом объекта и ключевым токеном локации."""
+    __slots__ = ("min_prices", "max_prices", "min_rooms", "search_ids", "user_ids", "extras")
+
+    def __init__(self, rows):
+        rows.sort(key=lambda row: row[2])
+        self.search_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.user_ids = np.array([row[1] for row in rows], dtype=np.int64)
+        self.min_prices = np.array([row[2] for row in rows], dtype=np.float64)
+        self.max_prices = np.array([row[3] for row in rows], dtype=np.float64)
+        self.min_rooms = np.array([row[4] for row in rows], dtype=np.int64)
+        # Дополнительные условия (остальные токены локации и текста запроса);
+        # None — строке достаточно совпадения по корзине и интервалам.
+        self.extras = [row[5] for row in rows]
+
+    def match(self, price, rooms, location_tokens, text_tokens):
+        end = int(np.searchsorted(self.min_prices, price, side="right"))
+        if not end:
+            return []
+        mask = (self.max_prices[:end] >= price) & (self.min_rooms[:end] <= rooms)
+        matches = []
+        for i in np.flatnonzero(mask):
+            extra = self.extras[i]
+            if extra is not None:
+                location_required, query_required = extra
+                if not (location_required <= location_tokens and query_required <= text_tokens):
+                    continue
+            matches.append((int(self.search_ids[i]), int(self.user_ids[i])))
+        return matches
+
+
+class SavedSearchIndex:
+    """
+    Индекс сохранённых поисков.
+    rows — кортежи (id, user_id, search_query, location, min_price, max_price, rooms, property_type).
+    """
+
+    def __init__(self, rows):
+        staging = defaultdict(list)
+        self.size = 0
+        for search_id, user_id, query, location, min_price, max_price, rooms, property_type in rows:
+            location_tokens = tokenize(location)
+            # Ключ корзины — самый длинный (обычно самый избирательный) токен локации
+            key_token = max(location_tokens, key=lambda t: (len(t), t)) if location_tokens else None
+            location_required = location_tokens - {key_token} if key_token else frozenset()
+            query_required = tokenize(query)
+            extra = (location_required, query_required) if (location_required or query_required) else None
+            staging[(property_type or None, key_token)].append((
+                search_id,
+                user_id,
+                float(min_price) if min_price is not None else -np.inf,
+                float(max_price) if max_price is not None else np.inf,
+                rooms or 0,
+                extra,
+            ))
+            self.size += 1
+        self.buckets = {key: _Bucket(items) for key, items in staging.items()}
+
+    def match(self, property_type, location, price, rooms, text=""):
+        """Возвращает список (saved_search_id, user_id), подходящих под объект."""
+        location_tokens = tokenize(location)
+        text_tokens = tokenize(text) | location_tokens
+        price = float(price)
+        rooms = rooms or 0
+
+        matches = []
+        for type_key in {property_type, None}:
+            for token_key in (*location_tokens, None):
+                bucket = self.buckets.get((type_key, token_key))
+                if bucket is not None:
+                    matches.extend(bucket.match(price, rooms, location_tokens, text_tokens))
+        return matches
+
+    def match_property(self, property_obj):
+        return self.match(
+            property_obj.property_type,
+            property_obj.location,
+            property_obj.price,
+            property_obj.rooms,
+            f"{property_obj.title} {property_obj.description}",
+        )
+
+
+def build_saved_search_index():
+    from apps.log.models import SavedSearch
+
+    rows = (
+        SavedSearch.objects.filter(is_active=True)
+        .values_list(
+            "id", "user_id", "search_query", "location",
+            "min_price", "max_price", "rooms", "property_type",
+        )
+        .iterator(chunk_size=5000)
+    )
+    return SavedSearchIndex(rows)
+
+
+def get_saved_search_index():
+    """
+    Индекс живёт в памяти процесса и перестраивается,
+    когда версия в общем кэше меняется.
+    """
+    global _index, _index_version
+    version = cache.get(INDEX_VERSION_KEY, 0)
+    if _index is None or version != _index_version:
+        _index = build_saved_search_index()
+        _index_version = version
+    return _index
+
+
+def invalidate_saved_search_index():
+    try:
+        cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_KEY, 1, timeout=None)
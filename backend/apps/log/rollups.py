@@ -0,0 +1,145 @@
+"""
+Почасовые и дневные агрегаты по истории поиска и просмотрам объектов.
+
+Сырые SearchHistory и ViewLog только дописываются и растут без предела.
+Отчёты (популярные запросы, просмотры объекта) читают агрегаты:
+каждый час задача пересчитывает завершённые и текущий час, затем дни,
+которых они касаются. Пересчёт идемпотентен — строки периода заменяются.
+
+Старые сырые строки удаляются пачками по первичному ключу и только
+после того, как их период уже попал в агрегаты.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+from apps.listings.models import PropertyViewRollup, ViewLog
+from apps.log.models import SearchHistory, SearchQueryRollup
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+# Сколько часов догоняет один запуск (после простоя воркера)
+MAX_HOURS_PER_RUN = 48
+PURGE_CHUNK_SIZE = 2000
+
+RollupSource = namedtuple("RollupSource", ["raw", "time_field", "key", "rollup", "value"])
+
+SOURCES = {
+    "search": RollupSource(SearchHistory, "created_at", "search_query", SearchQueryRollup, "count"),
+    "views": RollupSource(ViewLog, "viewed_at", "property_id", PropertyViewRollup, "views"),
+}
+
+
+def floor_hour(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _replace_period(source, granularity, period_start, totals):
+    rollup = source.rollup
+    with transaction.atomic():
+        rollup.objects.filter(granularity=granularity, period_start=period_start).delete()
+        rollup.objects.bulk_create([
+            rollup(granularity=granularity, period_start=period_start, **{source.key: key, source.value: total})
+            for key, total in totals
+            if key
+        ])
+    return len(totals)
+
+
+def rollup_hour(source, hour_start):
+    # _base_manager: просмотр или поиск, удалённый позже, всё равно был
+    totals = (
+        source.raw._base_manager
+        .filter(**{f"{source.time_field}__gte": hour_start, f"{source.time_field}__lt": hour_start + HOUR})
+        .values_list(source.key)
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    return _replace_period(source, source.rollup.HOUR, hour_start, list(totals))
+
+
+def rollup_day(source, day_start):
+    totals = (
+        source.rollup.objects
+        .filter(granularity=source.rollup.HOUR, period_start__gte=day_start, period_start__lt=day_start + DAY)
+        .values_list(source.key)
+        .annotate(total=Sum(source.value))
+        .order_by()
+    )
+    return _replace_period(source, source.rollup.DAY, day_start, list(totals))
+
+
+def _pending_hours(source, now):
+    last = source.rollup.objects.filter(granularity=source.rollup.HOUR).aggregate(last=Max("period_start"))["last"]
+    if last is None:
+        first = source.raw._base_manager.aggregate(first=Min(source.time_field))["first"]
+        if first is None:
+            return []
+        last = floor_hour(first)
+    # Последний посчитанный час пересчитываем: он мог быть неполным
+    hours = []
+    hour = last
+    current = floor_hour(now)
+    while hour <= current and len(hours) < MAX_HOURS_PER_RUN:
+        hours.append(hour)
+        hour += HOUR
+    return hours
+
+
+def run_rollups(now=None):
+    """Пересчитывает агрегаты по всем источникам. Возвращает {источник: число часов}."""
+    now = now or timezone.now()
+    result = {}
+    for name, source in SOURCES.items():
+        hours = _pending_hours(source, now)
+        for hour in hours:
+            rollup_hour(source, hour)
+        for day in sorted({floor_day(hour) for hour in hours}):
+            rollup_day(source, day)
+        result[name] = len(hours)
+    return result
+
+
+def _delete_in_chunks(queryset, chunk_size):
+    """Удаление пачками по pk — короткие транзакции вместо одного большого DELETE."""
+    total = 0
+    model = queryset.model
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return total
+        model._base_manager.filter(pk__in=ids)._raw_delete(model._base_manager.db)
+        total += len(ids)
+
+
+def purge_raw_activity(now=None, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Удаляет сырые строки старше ACTIVITY_RAW_RETENTION_DAYS и почасовые
+    агрегаты старше ACTIVITY_HOURLY_RETENTION_DAYS. Дневные агрегаты остаются.
+    """
+    now = now or timezone.now()
+    raw_cutoff = floor_day(now - timedelta(days=settings.ACTIVITY_RAW_RETENTION_DAYS))
+    hourly_cutoff = floor_day(now - timedelta(days=settings.ACTIVITY_HOURLY_RETENTION_DAYS))
+    result = {}
+    for name, source in SOURCES.items():
+        last = source.rollup.objects.filter(granularity=source.rollup.HOUR).aggregate(last=Max("period_start"))["last"]
+        # Сырые строки без агрегата не трогаем
+        cutoff = min(raw_cutoff, last) if last else None
+        raw = 0
+        if cutoff:
+            raw = _delete_in_chunks(
+                source.raw._base_manager.filter(**{f"{source.time_field}__lt": cutoff}), chunk_size
+            )
+        hourly = _delete_in_chunks(
+            source.rollup.objects.filter(granularity=source.rollup.HOUR, period_start__lt=hourly_cutoff), chunk_size
+        )
+        result[name] = {"raw": raw, "hourly": hourly}
+    return result
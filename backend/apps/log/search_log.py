@@ -0,0 +1,116 @@
+"""
+Автоматическая запись поисков из списка объектов (PropertyViewSet.list).
+
+Параметры поиска складываются в буфер процесса и уходят пачкой в задачу
+Celery record_search_batch, которая делает один bulk_create. Запрос
+поиска в БД не пишет. Пачка уходит, когда набралось batch_size записей
+или по таймеру через flush_interval секунд после первой записи — даже
+если новых поисков больше нет; при завершении процесса остаток буфера
+сбрасывается.
+"""
+import atexit
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+
+# query-параметр списка объектов -> поле SearchHistory
+SEARCH_PARAMS = {
+    "search": "search_query",
+    "location__icontains": "location",
+    "price__gte": "min_price",
+    "price__lte": "max_price",
+    "rooms__gte": "rooms",
+    "property_type": "property_type",
+}
+
+
+def _decimal_str(value):
+    # Цены остаются строками (уходят в JSON задачи), но должны быть числом
+    return str(Decimal(value))
+
+
+NUMERIC_FIELDS = {"min_price": _decimal_str, "max_price": _decimal_str, "rooms": int}
+
+
+def search_entry_from_params(params, user_id=None):
+    """Запись для SearchHistory из query-параметров или None, если это не поиск."""
+    entry = {}
+    for param, field in SEARCH_PARAMS.items():
+        value = (params.get(param) or "").strip()
+        if not value:
+            continue
+        cast = NUMERIC_FIELDS.get(field)
+        if cast:
+            try:
+                value = cast(value)
+            except (ValueError, ArithmeticError):
+                continue
+        entry[field] = value
+    if not entry:
+        return None
+    entry["search_query"] = entry.get("search_query", "")[:200]
+    entry["user_id"] = user_id
+    return entry
+
+
+class SearchLogBuffer:
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = batch_size or getattr(settings, "SEARCH_LOG_BATCH_SIZE", 50)
+        self.flush_interval = flush_interval or getattr(settings, "SEARCH_LOG_FLUSH_INTERVAL", 5)
+        self._entries = []
+        self._first_at = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            if not self._entries:
+                self._first_at = time.monotonic()
+                self._start_timer()
+            self._entries.append(entry)
+            full = len(self._entries) >= self.batch_size
+            stale = time.monotonic() - self._first_at >= self.flush_interval
+            batch = self._take() if full or stale else None
+        if batch:
+            self._send(batch)
+
+    def flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _start_timer(self):
+        self._timer = threading.Timer(self.flush_interval, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _take(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._entries = self._entries, []
+        return batch
+
+    def _send(self, batch):
+        from .tasks import record_search_batch
+
+        try:
+            record_search_batch.delay(batch)
+        except Exception as e:
+            # Журнал поиска не должен ронять выдачу
+            print(f"[SEARCH LOG] Не удалось отправить пачку из {len(batch)} записей: {e}")
+
+
+search_log_buffer = SearchLogBuffer()
+atexit.register(search_log_buffer.flush)
+
+
+def log_search(params, user=None):
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    entry = search_entry_from_params(params, user_id)
+    if entry is not None:
+        search_log_buffer.add(entry)
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import SearchHistory
+from .models import SearchHistory, SavedSearch
 
 
 class SearchHistorySerializer(serializers.ModelSerializer):
@@ -16,4 +16,31 @@ class SearchHistorySerializer(serializers.ModelSerializer):
             "property_type",
             "created_at",
         ]
-        read_only_fields = ["user", "created_at"]
\ No newline at end of file
+        read_only_fields = ["user", "created_at"]
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = [
+            "id",
+            "user",
+            "name",
+            "search_query",
+            "location",
+            "min_price",
+            "max_price",
+            "rooms",
+            "property_type",
+            "is_active",
+            "last_notified_at",
+            "created_at",
+        ]
+        read_only_fields = ["user", "last_notified_at", "created_at"]
+
+    def validate(self, data):
+        min_price = data.get("min_price")
+        max_price = data.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError("Минимальная цена не может быть больше максимальной.")
+        return data
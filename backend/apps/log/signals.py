@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.log.models import SavedSearch
+from apps.log.percolator import invalidate_saved_search_index
+
+
+@receiver(post_save, sender=SavedSearch)
+@receiver(post_delete, sender=SavedSearch)
+def reset_saved_search_index(sender, instance, **kwargs):
+    """
+    Любое изменение сохранённых поисков делает индекс перколятора устаревшим.
+    """
+    invalidate_saved_search_index()
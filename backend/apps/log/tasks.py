@@ -0,0 +1,125 @@
+from collections import defaultdict
+
+from celery import shared_task
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+# Сколько сохранённых поисков обрабатывает одна задача рассылки
+ALERT_BATCH_SIZE = 500
+# Повторно о том же объекте по тому же поиску не пишем
+ALERT_DEDUP_TIMEOUT = 60 * 60 * 24 * 7
+ALERT_DEDUP_KEY = "saved_search_alert:{}:{}"
+
+
+@shared_task
+def percolate_property(property_id):
+    """
+    Ищет сохранённые поиски, подходящие под объект, и раскладывает
+    совпадения по пакетным задачам рассылки.
+    """
+    from apps.listings.models import Property
+    from .percolator import get_saved_search_index
+
+    property_obj = Property.objects.filter(pk=property_id, is_active=True).first()
+    if property_obj is None:
+        return 0
+
+    matches = get_saved_search_index().match_property(property_obj)
+    search_ids = [search_id for search_id, user_id in matches if user_id != property_obj.owner_id]
+
+    for start in range(0, len(search_ids), ALERT_BATCH_SIZE):
+        send_saved_search_alerts.delay(property_id, search_ids[start:start + ALERT_BATCH_SIZE])
+    return len(search_ids)
+
+
+@shared_task
+def send_saved_search_alerts(property_id, saved_search_ids):
+    """
+    Одно письмо на пользователя по пакету сохранённых поисков,
+    все письма пакета уходят через одно соединение.
+    """
+    from apps.listings.models import Property
+    from .models import SavedSearch
+
+    keys = {ALERT_DEDUP_KEY.format(search_id, property_id): search_id for search_id in saved_search_ids}
+    already_sent = cache.get_many(list(keys))
+    pending_ids = [search_id for key, search_id in keys.items() if key not in already_sent]
+    if not pending_ids:
+        return 0
+
+    property_obj = Property.objects.filter(pk=property_id).values("title", "location", "price").first()
+    if property_obj is None:
+        return 0
+
+    searches_by_email = defaultdict(list)
+    rows = (
+        SavedSearch.objects.filter(id__in=pending_ids, is_active=True)
+        .exclude(user__email="")
+        .values_list("id", "name", "search_query", "user__email")
+    )
+    for search_id, name, query, email in rows:
+        searches_by_email[email].append((search_id, name or query or property_obj["location"]))
+
+    messages = []
+    for email, searches in searches_by_email.items():
+        names = ", ".join(sorted({name for _, name in searches}))
+        messages.append(EmailMessage(
+            subject=f"Новый объект по вашему поиску: {property_obj['title']}",
+            body=(
+                f"По сохранённым поискам ({names}) появился объект "
+                f"«{property_obj['title']}» в {property_obj['location']} "
+                f"за {property_obj['price']} руб./ночь.\n"
+                f"/properties/{property_id}/"
+            ),
+            from_email="noreply@rentalhub.com",
+            to=[email],
+        ))
+
+    if messages:
+        connection = get_connection()
+        connection.send_messages(messages)
+
+    sent_ids = [search_id for searches in searches_by_email.values() for search_id, _ in searches]
+    SavedSearch.objects.filter(id__in=sent_ids).update(last_notified_at=timezone.now())
+    cache.set_many(
+        {ALERT_DEDUP_KEY.format(search_id, property_id): True for search_id in sent_ids},
+        timeout=ALERT_DEDUP_TIMEOUT,
+    )
+    return len(messages)
+
+
+@shared_task
+def rollup_activity():
+    """Ежечасный пересчёт агрегатов поиска и просмотров (apps.log.rollups)."""
+    from .rollups import run_rollups
+
+    return run_rollups()
+
+
+@shared_task
+def purge_activity_logs():
+    """Удаляет старые сырые строки SearchHistory/ViewLog, уже попавшие в агрегаты."""
+    from .rollups import purge_raw_activity
+
+    return purge_raw_activity()
+
+
+@shared_task
+def record_search_batch(entries):
+    """Пачка поисков из списка объектов: один bulk_create и счётчики популярных запросов."""
+    from .heavy_hitters import record_queries
+    from .models import SearchHistory
+
+    SearchHistory.objects.bulk_create([SearchHistory(**entry) for entry in entries])
+    record_queries([entry["search_query"] for entry in entries])
+    return len(entries)
+
+
+@shared_task
+def record_popular_queries(queries):
+    """Счётчики популярных запросов для поисков, сохранённых через API истории."""
+    from .heavy_hitters import record_queries
+
+    record_queries(queries)
+    return len(queries)
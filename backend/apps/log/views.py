@@ -1,9 +1,12 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
+from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
 
-from .models import SearchHistory
-from .serializers import SearchHistorySerializer
+from .heavy_hitters import WINDOWS, top_queries
+from .models import SearchHistory, SavedSearch
+from .serializers import SearchHistorySerializer, SavedSearchSerializer
+from .tasks import record_popular_queries
 
 
 class SearchHistoryViewSet(viewsets.ModelViewSet):
@@ -20,11 +23,51 @@ class SearchHistoryViewSet(viewsets.ModelViewSet):
         return SearchHistory.objects.filter(user=self.request.user).order_by("-created_at")
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        history = serializer.save(user=self.request.user)
+        # Сводки популярных запросов пишет только очередь analytics
+        record_popular_queries.delay([history.search_query])
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
         return Response(
             {"message": "Search history saved", "data": response.data},
             status=status.HTTP_201_CREATED,
-        )
\ No newline at end of file
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.AllowAny])
+    def popular(self, request):
+        """Популярные запросы за окно hour, day или week (?window=day&limit=10)."""
+        window = request.query_params.get("window", "day")
+        if window not in WINDOWS:
+            return Response(
+                {"error": f"window должен быть одним из: {', '.join(WINDOWS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 100)
+        except ValueError:
+            limit = 10
+        return Response({"window": window, "results": top_queries(window, limit)})
+
+    @action(detail=True, methods=["post"], url_path="save")
+    def save_search(self, request, pk=None):
+        """Сохраняет запись истории как поиск с уведомлениями."""
+        history = self.get_object()
+        saved = SavedSearch.from_history(history)
+        return Response(SavedSearchSerializer(saved).data, status=status.HTTP_201_CREATED)
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """
+    CRUD для сохранённых поисков.
+    По ним приходят уведомления о новых и изменённых объектах.
+    """
+    queryset = SavedSearch.objects.all()
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
@@ -26,5 +26,6 @@ class Payment(SoftDeleteModel):
 
     def save(self, *args, **kwargs):
         if not self.amount:
-            self.amount = self.booking.total_price
+            booking = self.booking
+            self.amount = booking.total_price if booking.total_price is not None else booking.quote().total
         super().save(*args, **kwargs)
\ No newline at end of file
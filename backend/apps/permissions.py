@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from apps.users.roles import get_request_roles
+
 
 class HasGroupPermission(BasePermission):
     """
@@ -8,9 +10,7 @@ class HasGroupPermission(BasePermission):
     group_names = []
 
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return request.user.groups.filter(name__in=self.group_names).exists()
+        return get_request_roles(request).in_groups(*self.group_names)
 
 
 class IsTenant(HasGroupPermission):
@@ -2,14 +2,26 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from .models import UserProfile
+from .roles import KNOWN_ROLES, bulk_change_role
 
 class UserProfileInline(admin.StackedInline):
     model = UserProfile
     can_delete = False
     verbose_name_plural = 'User Profile'
 
+
+def make_change_role_action(role):
+    def action(modeladmin, request, queryset):
+        count = bulk_change_role(queryset.values_list('pk', flat=True), role)
+        modeladmin.message_user(request, f"Переведено в {role}: {count}")
+    action.__name__ = f'change_role_to_{role}'
+    action.short_description = f'Сменить тип пользователя на {role}'
+    return action
+
+
 class UserAdmin(BaseUserAdmin):
     inlines = (UserProfileInline,)
+    actions = [make_change_role_action(role) for role in KNOWN_ROLES]
 
 admin.site.unregister(User)
-admin.site.register(User, UserAdmin)
\ No newline at end of file
+admin.site.register(User, UserAdmin)
@@ -0,0 +1,111 @@
+"""
+Кэшированный снимок аутентифицированного пользователя.
+
+Снимок (основные поля User, id профиля, тип пользователя и группы)
+собирается одним запросом и хранится в кэше под версионированным
+ключом. Сохранение пользователя, профиля или смена групп поднимают
+версию, поэтому устаревший снимок больше не читается.
+
+Из снимка собираются экземпляры User/UserProfile через from_db:
+незагруженные поля остаются отложенными и подгружаются из БД
+только при обращении к ним.
+
+Хэш пароля в снимок не попадает: для проверки сессии хранится только
+get_session_auth_hash() — HMAC хэша пароля на SECRET_KEY.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from apps.users.models import UserProfile, UserType
+from apps.users.roles import RoleInfo
+
+SNAPSHOT_KEY = "user_snapshot:{}:{}"
+SNAPSHOT_VERSION_KEY = "user_snapshot_version:{}"
+
+USER_FIELDS = ("id", "username", "email", "is_staff", "is_superuser", "is_active")
+
+
+def get_snapshot_timeout():
+    return getattr(settings, "USER_SNAPSHOT_TIMEOUT", 900)
+
+
+def _get_version(user_id):
+    key = SNAPSHOT_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Начинаем с метки времени, а не с 1: если ключ версии вытеснили,
+        # старые снимки с маленькими номерами не оживут.
+        version = int(time.time() * 1000)
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def build_user_snapshot(user_id):
+    User = get_user_model()
+    rows = list(
+        User.objects.filter(pk=user_id).values_list(
+            *USER_FIELDS, "password", "profile__id", "profile__user_type_id", "profile__user_type__name", "groups__name",
+        )
+    )
+    if not rows:
+        return None
+    first = rows[0]
+    field_count = len(USER_FIELDS)
+    return {
+        "user": dict(zip(USER_FIELDS, first[:field_count])),
+        "session_auth_hash": User(password=first[field_count]).get_session_auth_hash(),
+        "profile_id": first[field_count + 1],
+        "user_type_id": first[field_count + 2],
+        "user_type_name": first[field_count + 3],
+        "groups": sorted({row[-1] for row in rows if row[-1]}),
+    }
+
+
+def _from_db(model, values):
+    """Экземпляр модели с загруженными values, остальные поля отложены."""
+    field_names = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db("default", field_names, [values[name] for name in field_names])
+
+
+def user_from_snapshot(snapshot):
+    user = _from_db(get_user_model(), snapshot["user"])
+    if snapshot["profile_id"] is not None:
+        profile = _from_db(UserProfile, {
+            "id": snapshot["profile_id"],
+            "user_id": user.pk,
+            "user_type_id": snapshot["user_type_id"],
+        })
+        if snapshot["user_type_id"] is not None:
+            user_type = _from_db(UserType, {"id": snapshot["user_type_id"], "name": snapshot["user_type_name"]})
+            UserProfile._meta.get_field("user_type").set_cached_value(profile, user_type)
+        user_field = UserProfile._meta.get_field("user")
+        user_field.set_cached_value(profile, user)
+        user_field.remote_field.set_cached_value(user, profile)
+
+    user._session_auth_hash = snapshot.get("session_auth_hash")
+    user._role_info = RoleInfo((snapshot["user_type_name"] or "").lower(), frozenset(snapshot["groups"]))
+    return user
+
+
+def load_cached_user(user_id):
+    """Пользователь по id из кэша; при промахе — один запрос в БД."""
+    key = SNAPSHOT_KEY.format(user_id, _get_version(user_id))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_user_snapshot(user_id)
+        if snapshot is None:
+            return None
+        cache.set(key, snapshot, timeout=get_snapshot_timeout())
+    return user_from_snapshot(snapshot)
+
+
+def invalidate_user_snapshot(user_id):
+    try:
+        cache.incr(SNAPSHOT_VERSION_KEY.format(user_id))
+    except ValueError:
+        _get_version(user_id)
+        cache.incr(SNAPSHOT_VERSION_KEY.format(user_id))
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users.auth_cache import load_cached_user
+from apps.users.roles import RoleInfo, get_role_fingerprint
+
+
+def load_user(user_id):
+    user = load_cached_user(get_user_model()._meta.pk.to_python(user_id))
+    if user is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return user
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    Пользователь, собранный из claims токена.
+
+    id, username, is_staff и роль берутся из токена; строка User
+    загружается только при обращении к остальным полям, сравнении
+    или передаче в ORM.
+    """
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: load_user(user_id))
+        self.__dict__["_token"] = token
+
+    @property
+    def _claims(self):
+        return self.__dict__["_token"]
+
+    @property
+    def pk(self):
+        # simplejwt хранит идентификатор строкой
+        return get_user_model()._meta.pk.to_python(self._claims[api_settings.USER_ID_CLAIM])
+
+    id = pk
+
+    @property
+    def username(self):
+        return self._claims["username"]
+
+    @property
+    def is_staff(self):
+        return self._claims.get("is_staff", False)
+
+    @property
+    def is_active(self):
+        return True
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    @property
+    def _role_info(self):
+        return RoleInfo(self._claims["role"], frozenset(self._claims.get("groups", ())))
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса к БД: права проверяются по claims роли.
+    Токен с устаревшим отпечатком роли (claim "rv") отклоняется.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if "role" not in validated_token:
+            # Токены, выпущенные до появления claims роли
+            return load_user(user_id)
+
+        if validated_token.get("rv") != get_role_fingerprint(user_id):
+            raise InvalidToken(_("Роль пользователя изменилась, получите новый токен."))
+
+        return ClaimsUser(validated_token)
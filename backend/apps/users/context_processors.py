@@ -0,0 +1,15 @@
+from apps.users.roles import get_request_roles
+
+
+def user_role(request):
+    """
+    Роль текущего пользователя, загруженная один раз на запрос:
+    {{ current_role }} в шаблоне, теги user_roles берут её из того же мемо.
+    """
+    info = get_request_roles(request)
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        role = "anonymous"
+    else:
+        role = info.role or "unknown"
+    return {"current_role": role, "current_role_info": info}
@@ -2,10 +2,12 @@ from functools import wraps
 from django.shortcuts import redirect
 from django.contrib import messages
 
+from apps.users.roles import get_request_roles
+
 
 def role_required(allowed_roles):
     """
-    Универсальный декоратор для проверки ролей через user.profile.user_type.name
+    Универсальный декоратор для проверки ролей (user.profile.user_type.name через apps.users.roles)
     Пример: @role_required(["landlord", "admin"])
     """
     def decorator(view_func):
@@ -15,9 +17,8 @@ def role_required(allowed_roles):
                 messages.error(request, "Сначала войдите в систему.")
                 return redirect("/admin/login/")
 
-            try:
-                user_type = getattr(request.user.profile.user_type, "name", "").lower()
-            except AttributeError:
+            user_type = get_request_roles(request).role
+            if not user_type:
                 messages.error(request, "Не определён тип пользователя.")
                 return redirect("/")
 
@@ -0,0 +1,130 @@
+"""
+Ежедневный дайджест для арендодателей.
+
+Все показатели считаются несколькими GROUP BY-запросами сразу
+для всех хостов, а не отдельными запросами на каждого.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage
+from django.db.models import Avg, Count, Sum
+from django.template.loader import get_template
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.bookings.tasks import direct_connection
+from apps.payments.models import Payment
+from apps.reviews.models import Review
+
+User = get_user_model()
+
+DIGEST_TEMPLATE = "emails/host_digest.txt"
+SEND_CHUNK_SIZE = 500
+PAID_STATUSES = ("paid", "completed")
+
+
+def _empty_digest():
+    return {
+        "new_bookings": 0,
+        "cancellations": 0,
+        "reviews": 0,
+        "average_rating": None,
+        "payments": 0,
+        "revenue": 0,
+    }
+
+
+def collect_host_digests(since, until):
+    """
+    Возвращает {host_id: показатели} за период [since, until).
+    Хосты без событий в периоде в результат не попадают.
+    """
+    digests = defaultdict(_empty_digest)
+
+    new_bookings = (
+        Booking.objects.filter(created_at__gte=since, created_at__lt=until)
+        .values("rental_property__owner_id")
+        .annotate(n=Count("id"))
+    )
+    for row in new_bookings:
+        digests[row["rental_property__owner_id"]]["new_bookings"] = row["n"]
+
+    cancellations = (
+        Booking.objects.filter(status="cancelled", cancelled_at__gte=since, cancelled_at__lt=until)
+        .values("rental_property__owner_id")
+        .annotate(n=Count("id"))
+    )
+    for row in cancellations:
+        digests[row["rental_property__owner_id"]]["cancellations"] = row["n"]
+
+    reviews = (
+        Review.objects.filter(created_at__gte=since, created_at__lt=until)
+        .values("property__owner_id")
+        .annotate(n=Count("id"), avg=Avg("rating"))
+    )
+    for row in reviews:
+        digest = digests[row["property__owner_id"]]
+        digest["reviews"] = row["n"]
+        digest["average_rating"] = round(row["avg"], 2)
+
+    payments = (
+        Payment.objects.filter(status__in=PAID_STATUSES, created_at__gte=since, created_at__lt=until)
+        .values("booking__rental_property__owner_id")
+        .annotate(n=Count("id"), total=Sum("amount"))
+    )
+    for row in payments:
+        digest = digests[row["booking__rental_property__owner_id"]]
+        digest["payments"] = row["n"]
+        digest["revenue"] = row["total"]
+
+    return dict(digests)
+
+
+def render_host_digests(digests, since, until):
+    """Рендерит письма пакетом: шаблон компилируется один раз."""
+    template = get_template(DIGEST_TEMPLATE)
+    hosts = (
+        User.objects.filter(id__in=list(digests), is_active=True)
+        .exclude(email="")
+        .values_list("id", "username", "email")
+    )
+    messages = []
+    for host_id, username, email in hosts.iterator(chunk_size=2000):
+        body = template.render({
+            "username": username,
+            "since": since,
+            "until": until,
+            "digest": digests[host_id],
+        })
+        messages.append(EmailMessage(
+            subject=f"RentalHub: сводка за {since:%d.%m.%Y}",
+            body=body,
+            from_email="noreply@rentalhub.com",
+            to=[email],
+        ))
+    return messages
+
+
+def send_in_chunks(messages, chunk_size=SEND_CHUNK_SIZE):
+    """
+    Отправляет письма через одно открытое соединение реального бэкенда:
+    задача уже в воркере, CeleryEmailBackend лишь разбил бы её на новые задачи.
+    """
+    sent = 0
+    with direct_connection() as connection:
+        for start in range(0, len(messages), chunk_size):
+            chunk = messages[start:start + chunk_size]
+            connection.send_messages(chunk)
+            sent += len(chunk)
+    return sent
+
+
+def send_host_digests(until=None, period=timedelta(days=1)):
+    until = until or timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = until - period
+    digests = collect_host_digests(since, until)
+    messages = render_host_digests(digests, since, until)
+    sent = send_in_chunks(messages)
+    return {"hosts": len(digests), "messages": len(messages), "sent": sent}
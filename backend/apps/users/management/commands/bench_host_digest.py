@@ -0,0 +1,99 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.listings.models import Property
+from apps.payments.models import Payment
+from apps.reviews.models import Review
+from apps.users.digest import collect_host_digests, render_host_digests, send_in_chunks
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Замер времени построения дайджеста хостов на синтетических данных (данные откатываются)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hosts", type=int, default=10000, help="Количество хостов")
+        parser.add_argument("--bookings-per-host", type=int, default=3)
+
+    def handle(self, *args, **options):
+        hosts = options["hosts"]
+        per_host = options["bookings_per_host"]
+
+        with transaction.atomic():
+            self._seed(hosts, per_host)
+            until = timezone.now() + timedelta(minutes=1)
+            since = until - timedelta(days=1)
+
+            with override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", DEBUG=True):
+                reset_queries()
+                started = time.perf_counter()
+                digests = collect_host_digests(since, until)
+                collected = time.perf_counter()
+                messages = render_host_digests(digests, since, until)
+                rendered = time.perf_counter()
+                send_in_chunks(messages)
+                finished = time.perf_counter()
+                queries = len(connection.queries)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Хостов в дайджесте: {len(digests)}, писем: {len(messages)}, SQL-запросов: {queries}")
+        self.stdout.write(f"  агрегация: {collected - started:.3f} c")
+        self.stdout.write(f"  рендер:    {rendered - collected:.3f} c")
+        self.stdout.write(f"  отправка:  {finished - rendered:.3f} c")
+        self.stdout.write(self.style.SUCCESS(f"Итого: {finished - started:.3f} c"))
+
+    def _seed(self, hosts, per_host):
+        self.stdout.write(f"Создаём {hosts} хостов и {hosts * per_host} бронирований...")
+        prefix = f"bench{int(time.time())}"
+        User.objects.bulk_create(
+            [User(username=f"{prefix}_host{i}", email=f"host{i}@example.com") for i in range(hosts)]
+            + [User(username=f"{prefix}_guest", email="guest@example.com")],
+            batch_size=1000,
+        )
+        host_ids = list(User.objects.filter(username__startswith=f"{prefix}_host").values_list("id", flat=True))
+        guest = User.objects.get(username=f"{prefix}_guest")
+
+        Property.objects.bulk_create(
+            [
+                Property(
+                    owner_id=host_id, title=f"Объект {host_id}", description="", location="Berlin",
+                    price=random.randint(50, 500), rooms=2, property_type="apartment",
+                )
+                for host_id in host_ids
+            ],
+            batch_size=1000,
+        )
+        properties = list(Property.objects.filter(owner_id__in=host_ids).values_list("id", "price"))
+
+        today = timezone.now().date()
+        Booking.objects.bulk_create(
+            [
+                Booking(
+                    user=guest, rental_property_id=property_id,
+                    start_date=today + timedelta(days=10 * n), end_date=today + timedelta(days=10 * n + 3),
+                    status=random.choice(["pending", "confirmed", "cancelled"]),
+                )
+                for property_id, _ in properties
+                for n in range(per_host)
+            ],
+            batch_size=1000,
+        )
+        bookings = Booking.objects.filter(rental_property_id__in=[pk for pk, _ in properties]).values_list("id", flat=True)
+        Payment.objects.bulk_create(
+            [Payment(booking_id=booking_id, user=guest, amount=300, status="paid") for booking_id in bookings],
+            batch_size=1000,
+        )
+        Review.objects.bulk_create(
+            [Review(user=guest, property_id=property_id, rating=random.randint(1, 5)) for property_id, _ in properties],
+            batch_size=1000,
+        )
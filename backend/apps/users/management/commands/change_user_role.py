@@ -0,0 +1,43 @@
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.roles import BULK_CHUNK_SIZE, KNOWN_ROLES, bulk_change_role
+
+
+class Command(BaseCommand):
+    help = "Массовый перевод пользователей в другой тип (роль) с пакетным обновлением групп"
+
+    def add_arguments(self, parser):
+        parser.add_argument("role", choices=KNOWN_ROLES, help="Новый тип пользователя")
+        parser.add_argument("--from-role", help="Перевести всех пользователей с этим типом")
+        parser.add_argument("--usernames", help="Список логинов через запятую")
+        parser.add_argument("--file", help="Файл с логинами, по одному в строке")
+        parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.all()
+        usernames = []
+        if options["usernames"]:
+            usernames += [name.strip() for name in options["usernames"].split(",") if name.strip()]
+        if options["file"]:
+            path = Path(options["file"])
+            if not path.exists():
+                raise CommandError(f"Файл не найден: {path}")
+            usernames += [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+        if usernames:
+            users = users.filter(username__in=usernames)
+        if options["from_role"]:
+            users = users.filter(profile__user_type__name=options["from_role"].lower())
+        if not usernames and not options["from_role"]:
+            raise CommandError("Укажите --from-role, --usernames или --file")
+
+        user_ids = list(users.values_list("pk", flat=True))
+        started = time.perf_counter()
+        count = bulk_change_role(user_ids, options["role"], chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Переведено в {options['role']}: {count} пользователей за {time.perf_counter() - started:.1f} c"
+        ))
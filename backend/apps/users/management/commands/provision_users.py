@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.provisioning import DEFAULT_CHUNK_SIZE, iter_rows, provision_users
+
+
+class Command(BaseCommand):
+    help = "Массовое создание пользователей, профилей и членства в группах из CSV/JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу .csv или .jsonl")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Формат (по умолчанию — по расширению)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--default-role", default="tenant", help="Роль для строк без колонки role")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"Файл не найден: {path}")
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+
+        def progress(report):
+            self.stdout.write(
+                f"  обработано {report.rows}, создано {report.created}, "
+                f"{report.rows_per_second:.0f} строк/с"
+            )
+
+        with path.open(encoding="utf-8", newline="") as stream:
+            try:
+                report = provision_users(
+                    iter_rows(stream, fmt),
+                    default_role=options["default_role"],
+                    chunk_size=options["chunk_size"],
+                    on_chunk=progress,
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        for error in report.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"  строка {error['row']}: {error['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово: {report.rows} строк, создано {report.created}, пропущено {report.skipped}, "
+            f"ошибок {len(report.errors)} за {report.elapsed:.1f} c ({report.rows_per_second:.0f} строк/с)"
+        ))
@@ -0,0 +1,48 @@
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from apps.users.auth_cache import load_cached_user
+
+# Бэкенды, пользователей которых можно брать из кэшированного снимка
+CACHEABLE_BACKENDS = {"django.contrib.auth.backends.ModelBackend"}
+
+
+def get_session_user(request):
+    """
+    Аналог django.contrib.auth.get_user, но пользователь берётся
+    из кэшированного снимка, а хэш сессии сверяется с сохранённым
+    в снимке (сам хэш пароля не кэшируется). При несовпадении решение
+    (ротация ключей, сброс сессии) отдаётся стандартной реализации.
+    """
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    if backend_path not in CACHEABLE_BACKENDS:
+        return auth.get_user(request)
+
+    user = load_cached_user(user_id)
+    if user is None or not user.is_active:
+        return AnonymousUser()
+
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    cached_hash = getattr(user, "_session_auth_hash", None)
+    if not session_hash or not cached_hash or not constant_time_compare(session_hash, cached_hash):
+        return auth.get_user(request)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware без запроса пользователя по первичному ключу
+    на каждый запрос: request.user собирается из кэшированного снимка.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_session_user(request))
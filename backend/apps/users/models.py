@@ -20,5 +20,14 @@ class UserProfile(SoftDeleteModel):
     location = models.CharField(max_length=30, blank=True)
     birth_date = models.DateField(null=True, blank=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Тип на момент загрузки: группы синхронизируются только при его смене
+        self._original_user_type_id = self.__dict__.get("user_type_id", models.DEFERRED)
+
+    @property
+    def user_type_changed(self):
+        return self.user_type_id != self._original_user_type_id
+
     def __str__(self):
         return f"{self.user.username} ({self.user_type.name if self.user_type else 'No Type'})"
\ No newline at end of file
@@ -1,24 +1,18 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from apps.users.roles import get_request_roles
+
 
 class IsTenant(BasePermission):
     """Арендатор — может бронировать, оставлять отзывы."""
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return getattr(getattr(request.user, "profile", None), "user_type", "").name.lower() in [
-            "tenant", "admin", "moderator"
-        ]
+        return get_request_roles(request).has_role("tenant", "admin", "moderator")
 
 
 class IsLandlord(BasePermission):
     """Арендодатель — может управлять своими объявлениями."""
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return getattr(getattr(request.user, "profile", None), "user_type", "").name.lower() in [
-            "landlord", "admin", "moderator"
-        ]
+        return get_request_roles(request).has_role("landlord", "admin", "moderator")
 
     def has_object_permission(self, request, view, obj):
         owner = getattr(obj, "owner", None)
@@ -28,19 +22,13 @@ class IsLandlord(BasePermission):
 class IsAdmin(BasePermission):
     """Администратор — полный доступ."""
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return getattr(getattr(request.user, "profile", None), "user_type", "").name.lower() == "admin"
+        return get_request_roles(request).has_role("admin")
 
 
 class IsModerator(BasePermission):
     """Модератор — может модерировать контент."""
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return getattr(getattr(request.user, "profile", None), "user_type", "").name.lower() in [
-            "moderator", "admin"
-        ]
+        return get_request_roles(request).has_role("moderator", "admin")
 
 
 class IsOwnerOrReadOnly(BasePermission):
@@ -0,0 +1,206 @@
+"""
+Массовое создание пользователей из CSV/JSONL.
+
+Обычное создание пользователя запускает create_or_update_user_profile
+(get_or_create типа и группы, профиль, добавление в группу) — около
+шести запросов на строку. Здесь пользователи, профили и членство в
+группах создаются bulk_create пачками; сигналы post_save при этом не
+срабатывают, их работа выполняется здесь же.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from apps.users.models import UserProfile, UserType
+from apps.users.roles import KNOWN_ROLES, ROLE_GROUPS, role_group_name
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class ProvisioningReport:
+    rows: int = 0
+    created: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "skipped": self.skipped,
+            "errors": self.errors[:100],
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def iter_rows(stream, fmt):
+    """Построчно читает текстовый поток CSV (с заголовком) или JSONL."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Неизвестный формат: {fmt}")
+
+
+def _password_value(row):
+    """
+    Готовый хэш (password_hash) переносится как есть. Открытый пароль
+    хэшируется — это самая медленная часть импорта. Без пароля
+    создаётся пользователь с неиспользуемым паролем.
+    """
+    password_hash = row.get("password_hash")
+    if password_hash:
+        identify_hasher(password_hash)
+        return password_hash
+    return make_password(row.get("password") or None)
+
+
+TEXT_FIELDS = ("username", "email", "first_name", "last_name")
+REQUIRED_FIELDS = ("username", "email")
+
+
+def _clean_fields(row):
+    """
+    Текстовые поля строки, проверенные валидаторами полей User.
+    Неверная строка — ValueError: она попадёт в errors, а не уронит пачку.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("row must be an object")
+    values = {}
+    for name in TEXT_FIELDS:
+        value = row.get(name)
+        if value is None:
+            value = ""
+        if not isinstance(value, str):
+            raise ValueError(f"{name} must be a string")
+        value = value.strip()
+        if not value and name in REQUIRED_FIELDS:
+            raise ValueError(f"{name} is required")
+        if value:
+            try:
+                User._meta.get_field(name).clean(value, None)
+            except ValidationError as e:
+                raise ValueError(f"invalid {name}: {' '.join(e.messages)}")
+        values[name] = value
+    return values
+
+
+class UserProvisioner:
+
+    def __init__(self, default_role="tenant", chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.default_role = default_role.strip().lower()
+        # Создаются только известные типы; default_role — один из них или уже существующий
+        for name in KNOWN_ROLES:
+            UserType.objects.get_or_create(name=name)
+        self.user_types = {user_type.name.lower(): user_type.pk for user_type in UserType.objects.all()}
+        if self.default_role not in self.user_types:
+            raise ValueError(f"Неизвестная роль по умолчанию: {default_role}")
+        self.groups = {}
+        for name in ROLE_GROUPS:
+            group, _ = Group.objects.get_or_create(name=name)
+            self.groups[name] = group.pk
+
+    def run(self, rows, report=None, on_chunk=None):
+        report = report or ProvisioningReport()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._provision_chunk(chunk, report)
+            if on_chunk:
+                on_chunk(report)
+        return report
+
+    def _provision_chunk(self, chunk, report):
+        report.rows += len(chunk)
+        prepared = {}
+        # Ключ без учёта регистра: в MySQL «Alice» и «alice» нарушают уникальность
+        seen = {}
+        for number, row in enumerate(chunk, start=report.rows - len(chunk) + 1):
+            try:
+                fields = _clean_fields(row)
+                role = row.get("role") or row.get("user_type") or self.default_role
+                if not isinstance(role, str):
+                    raise ValueError("role must be a string")
+            except ValueError as e:
+                report.errors.append({"row": number, "error": str(e)})
+                continue
+            username = fields["username"]
+            role = role.strip().lower()
+            if role not in self.user_types:
+                report.errors.append({"row": number, "error": f"unknown role {role}"})
+                continue
+            if username in prepared:
+                report.skipped += 1
+                continue
+            if username.lower() in seen:
+                report.errors.append({"row": number, "error": f"duplicate username {seen[username.lower()]}"})
+                continue
+            try:
+                password = _password_value(row)
+            except (TypeError, ValueError) as e:
+                report.errors.append({"row": number, "error": str(e)})
+                continue
+            seen[username.lower()] = username
+            prepared[username] = (User(password=password, **fields), role)
+
+        existing = set(User.objects.filter(username__in=list(prepared)).values_list("username", flat=True))
+        report.skipped += len(existing)
+        new = {username: item for username, item in prepared.items() if username not in existing}
+        if not new:
+            return
+
+        with transaction.atomic():
+            # bulk_create не шлёт post_save: профиль и группы создаём сами
+            User.objects.bulk_create([user for user, _ in new.values()], batch_size=self.chunk_size)
+            # MySQL не возвращает pk из bulk_create — забираем их отдельным запросом
+            user_ids = dict(User.objects.filter(username__in=list(new)).values_list("username", "id"))
+
+            UserProfile.objects.bulk_create(
+                [
+                    UserProfile(user_id=user_ids[username], user_type_id=self.user_types[role])
+                    for username, (_, role) in new.items()
+                ],
+                batch_size=self.chunk_size,
+            )
+
+            Membership = User.groups.through
+            memberships = []
+            for username, (_, role) in new.items():
+                group_name = role_group_name(role)
+                if group_name:
+                    memberships.append(Membership(user_id=user_ids[username], group_id=self.groups[group_name]))
+            Membership.objects.bulk_create(memberships, batch_size=self.chunk_size, ignore_conflicts=True)
+
+        report.created += len(new)
+
+
+def provision_users(rows, default_role="tenant", chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    return UserProvisioner(default_role=default_role, chunk_size=chunk_size).run(rows, on_chunk=on_chunk)
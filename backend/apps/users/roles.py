@@ -0,0 +1,165 @@
+"""
+Единая точка определения роли пользователя.
+
+Роль (user.profile.user_type.name) и группы загружаются одним запросом
+и запоминаются на объекте пользователя/запроса, а между запросами —
+в кэше. Кэш сбрасывается при смене типа пользователя или групп.
+"""
+import hashlib
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.users.models import UserProfile, UserType
+
+ROLE_GROUPS = ["Tenant", "Host", "Admin", "Moderator"]
+# Типы пользователей, которые используются в правах доступа (permissions.py)
+KNOWN_ROLES = ("tenant", "landlord", "admin", "moderator")
+BULK_CHUNK_SIZE = 1000
+ROLE_CACHE_KEY = "user_roles:{}"
+ROLE_FINGERPRINT_KEY = "user_role_fp:{}"
+
+
+class RoleInfo(namedtuple("RoleInfo", ["role", "groups"])):
+    """role — имя типа пользователя в нижнем регистре ("" если не задан)."""
+
+    def has_role(self, *roles):
+        return self.role in roles
+
+    def in_groups(self, *names):
+        return not self.groups.isdisjoint(names)
+
+
+ANONYMOUS = RoleInfo("", frozenset())
+
+
+def role_group_name(user_type_name):
+    """Django-группа, соответствующая типу пользователя (или None)."""
+    name = (user_type_name or "").capitalize()
+    return name if name in ROLE_GROUPS else None
+
+
+def get_role_cache_timeout():
+    return getattr(settings, "ROLE_CACHE_TIMEOUT", 300)
+
+
+def load_user_roles(user_id):
+    """Роль и группы пользователя одним запросом (LEFT JOIN профиля и групп)."""
+    rows = get_user_model().objects.filter(pk=user_id).values_list("profile__user_type__name", "groups__name")
+    role = ""
+    groups = set()
+    for user_type_name, group_name in rows:
+        role = (user_type_name or "").lower()
+        if group_name:
+            groups.add(group_name)
+    return RoleInfo(role, frozenset(groups))
+
+
+def get_user_roles(user):
+    """Роли пользователя; результат запоминается на самом объекте user."""
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS
+
+    info = getattr(user, "_role_info", None)
+    if info is not None:
+        return info
+
+    timeout = get_role_cache_timeout()
+    key = ROLE_CACHE_KEY.format(user.pk)
+    info = cache.get(key) if timeout else None
+    if info is None:
+        info = load_user_roles(user.pk)
+        if timeout:
+            cache.set(key, info, timeout=timeout)
+
+    user._role_info = info
+    return info
+
+
+def get_request_roles(request):
+    """
+    Роли текущего пользователя запроса. Работает и с HttpRequest,
+    и с DRF Request — мемо хранится на исходном HttpRequest.
+    """
+    http_request = getattr(request, "_request", request)
+    info = getattr(http_request, "_role_info", None)
+    if info is None:
+        info = get_user_roles(getattr(request, "user", None))
+        http_request._role_info = info
+    return info
+
+
+def compute_role_fingerprint(user_id):
+    """
+    Короткий хэш роли, групп, is_staff и активности пользователя.
+    Попадает в JWT (claim "rv"): если он изменился, токен надо перевыпустить.
+    """
+    rows = list(
+        get_user_model().objects.filter(pk=user_id)
+        .values_list("is_active", "is_staff", "profile__user_type__name", "groups__name")
+    )
+    if not rows:
+        return ""
+    is_active, is_staff, user_type_name, _ = rows[0]
+    groups = ",".join(sorted(row[3] for row in rows if row[3]))
+    raw = f"{is_active}|{is_staff}|{(user_type_name or '').lower()}|{groups}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def get_role_fingerprint(user_id):
+    key = ROLE_FINGERPRINT_KEY.format(user_id)
+    fingerprint = cache.get(key)
+    if fingerprint is None:
+        fingerprint = compute_role_fingerprint(user_id)
+        cache.set(key, fingerprint, timeout=None)
+    return fingerprint
+
+
+def invalidate_user_roles(user_id):
+    cache.delete_many([ROLE_CACHE_KEY.format(user_id), ROLE_FINGERPRINT_KEY.format(user_id)])
+
+
+def bulk_change_role(user_ids, user_type_name, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Переводит пользователей в другой тип пачками: профили обновляются
+    одним UPDATE, членство в ролевых группах — одним DELETE и одним
+    INSERT на пачку. Сигналы post_save не вызываются, кэши ролей и
+    снимков сбрасываются здесь же. Возвращает число пользователей.
+    """
+    # auth_cache сам импортирует roles — импорт здесь, чтобы не было цикла
+    from apps.users.auth_cache import invalidate_user_snapshot
+
+    user_type, _ = UserType.objects.get_or_create(name=user_type_name.lower())
+    group_name = role_group_name(user_type.name)
+    group_id = Group.objects.get_or_create(name=group_name)[0].pk if group_name else None
+    role_group_ids = list(Group.objects.filter(name__in=ROLE_GROUPS).values_list("pk", flat=True))
+    Membership = get_user_model().groups.through
+    # _base_manager видит и мягко удалённые профили (user_id уникален)
+    profiles = UserProfile._base_manager
+
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        with transaction.atomic():
+            existing = set(profiles.filter(user_id__in=chunk).values_list("user_id", flat=True))
+            profiles.filter(user_id__in=chunk).update(user_type=user_type)
+            profiles.bulk_create([
+                UserProfile(user_id=user_id, user_type=user_type) for user_id in chunk if user_id not in existing
+            ])
+            Membership.objects.filter(user_id__in=chunk, group_id__in=role_group_ids).delete()
+            if group_id:
+                Membership.objects.bulk_create(
+                    [Membership(user_id=user_id, group_id=group_id) for user_id in chunk],
+                    ignore_conflicts=True,
+                )
+        cache.delete_many(
+            [ROLE_CACHE_KEY.format(user_id) for user_id in chunk]
+            + [ROLE_FINGERPRINT_KEY.format(user_id) for user_id in chunk]
+        )
+        for user_id in chunk:
+            invalidate_user_snapshot(user_id)
+    return len(user_ids)
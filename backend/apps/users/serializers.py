@@ -1,9 +1,22 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from apps.users.tokens import RoleRefreshToken
 
 User = get_user_model()
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ["id", "username", "email", "first_name", "last_name"]
\ No newline at end of file
+        fields = ["id", "username", "email", "first_name", "last_name"]
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Выдаёт пару токенов с claims роли и групп."""
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Обновляет access-токен с актуальными claims роли."""
+    token_class = RoleRefreshToken
@@ -1,8 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from .models import UserProfile, UserType
+from .roles import ROLE_GROUPS, invalidate_user_roles, role_group_name
+from .auth_cache import invalidate_user_snapshot
 
 User = get_user_model()
 
@@ -11,39 +13,66 @@ User = get_user_model()
 def create_or_update_user_profile(sender, instance, created, **kwargs):
     """
     Автоматически создаёт профиль при создании пользователя
-    и добавляет его в соответствующую группу.
+    (группа назначается в sync_user_group_with_usertype).
+    При обновлении сбрасывает кэш ролей: is_active/is_staff входят в отпечаток JWT.
     """
     if created:
         tenant_type, _ = UserType.objects.get_or_create(
             name="tenant", defaults={"description": "Арендатор"}
         )
-        profile = UserProfile.objects.create(user=instance, user_type=tenant_type)
-
-        tenant_group, _ = Group.objects.get_or_create(name="Tenant")
-        instance.groups.add(tenant_group)
+        UserProfile.objects.create(user=instance, user_type=tenant_type)
         print(f"[SIGNAL] Новый пользователь {instance.username} добавлен в группу Tenant.")
     else:
-        # При обновлении пользователя — обновляем профиль
-        if hasattr(instance, "profile"):
-            instance.profile.save()
+        invalidate_user_roles(instance.pk)
 
 
 @receiver(post_save, sender=UserProfile)
-def sync_user_group_with_usertype(sender, instance, **kwargs):
+def sync_user_group_with_usertype(sender, instance, created, **kwargs):
     """
     При изменении типа пользователя (user_type)
     обновляет его принадлежность к Django-группам.
+    Сохранения профиля без смены типа ничего не делают.
     """
+    if not created and not instance.user_type_changed:
+        return
+    instance._original_user_type_id = instance.user_type_id
+
     user = instance.user
     if not user:
         return
 
     # Удаляем из всех ролей-групп, чтобы не было дубликатов
-    role_groups = ["Tenant", "Host", "Admin", "Moderator"]
-    user.groups.remove(*Group.objects.filter(name__in=role_groups))
+    if not created:
+        user.groups.remove(*Group.objects.filter(name__in=ROLE_GROUPS))
 
-    user_type_name = instance.user_type.name.capitalize() if instance.user_type else None
-    if user_type_name in role_groups:
+    user_type_name = role_group_name(instance.user_type.name) if instance.user_type else None
+    if user_type_name:
         group, _ = Group.objects.get_or_create(name=user_type_name)
         user.groups.add(group)
         print(f"[SIGNAL] Пользователь {user.username} перемещён в группу {user_type_name}.")
+
+    invalidate_user_roles(user.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def reset_roles_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Группы изменены напрямую (админка, shell) — сбрасываем кэш ролей.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    user_ids = [instance.pk] if not reverse else list(pk_set or ())
+    for user_id in user_ids:
+        invalidate_user_roles(user_id)
+        invalidate_user_snapshot(user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def reset_user_snapshot(sender, instance, **kwargs):
+    """
+    Сбрасывает кэшированный снимок пользователя (см. apps.users.auth_cache).
+    """
+    invalidate_user_snapshot(instance.pk if sender is User else instance.user_id)
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+
+@shared_task
+def send_host_daily_digest():
+    """Ежедневная сводка для арендодателей (запускается celery beat)."""
+    from .digest import send_host_digests
+    return send_host_digests()
@@ -1,5 +1,7 @@
 from django import template
 
+from apps.users.roles import get_request_roles, get_user_roles
+
 register = template.Library()
 
 @register.simple_tag(takes_context=True)
@@ -8,16 +10,16 @@ def user_role(context):
     Возвращает тип пользователя (tenant, landlord, admin, moderator)
     Пример: {% user_role as role %} → {{ role }}
     """
+    if "current_role" in context:
+        return context["current_role"]
+
     request = context.get("request")
     user = getattr(request, "user", None)
 
     if not user or not user.is_authenticated:
         return "anonymous"
 
-    try:
-        return getattr(user.profile.user_type, "name", "").lower()
-    except AttributeError:
-        return "unknown"
+    return get_request_roles(request).role or "unknown"
 
 
 @register.filter
@@ -28,11 +30,22 @@ def has_role(user, role_name):
         ...
     {% endif %}
     """
-    if not user.is_authenticated:
+    if not getattr(user, "is_authenticated", False):
         return False
 
-    try:
-        user_role = getattr(user.profile.user_type, "name", "").lower()
-        return user_role == role_name.lower() or user_role == "admin"
-    except AttributeError:
+    user_role = get_user_roles(user).role
+    return bool(user_role) and (user_role == role_name.lower() or user_role == "admin")
+
+
+@register.filter
+def has_any_role(user, role_names):
+    """
+    Проверка сразу нескольких ролей:
+    {% if user|has_any_role:"landlord,moderator" %}
+    """
+    if not getattr(user, "is_authenticated", False):
         return False
+
+    user_role = get_user_roles(user).role
+    roles = {name.strip().lower() for name in role_names.split(",")}
+    return bool(user_role) and (user_role in roles or user_role == "admin")
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.roles import get_user_roles, get_role_fingerprint
+
+
+def set_role_claims(token, user):
+    """Кладёт в токен всё, что нужно для проверки прав без обращения к БД."""
+    info = get_user_roles(user)
+    token["username"] = user.username
+    token["is_staff"] = user.is_staff
+    token["role"] = info.role
+    token["groups"] = sorted(info.groups)
+    token["rv"] = get_role_fingerprint(user.pk)
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh-токен с claims роли. При выпуске access-токена claims
+    обновляются из БД, поэтому смена роли доходит до клиента при refresh.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        set_role_claims(token, user)
+        token._claims_fresh = True
+        return token
+
+    @property
+    def access_token(self):
+        if not getattr(self, "_claims_fresh", False):
+            user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+            user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is not None:
+                set_role_claims(self, user)
+            self._claims_fresh = True
+        return super().access_token
@@ -1,12 +1,17 @@
+import io
+
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
 
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from apps.bookings.models import Booking
 from apps.payments.models import Payment
+from apps.users.permissions import IsAdmin
+from apps.users.provisioning import iter_rows, provision_users
 from apps.users.serializers import UserSerializer
 
 User = get_user_model()
@@ -18,7 +23,12 @@ def user_profile(request):
     """
     HTML-страница профиля пользователя с его бронированиями и платежами
     """
-    bookings = Booking.objects.filter(user=request.user).order_by("-start_date")
+    bookings = (
+        Booking.objects.filter(user=request.user)
+        .select_related("rental_property")
+        .with_totals()
+        .order_by("-start_date")
+    )
     payments = Payment.objects.filter(booking__user=request.user).order_by("-created_at")
     return render(request, "user_profile.html", {
         "bookings": bookings,
@@ -50,6 +60,27 @@ class UserViewSet(viewsets.ModelViewSet):
             return super().get_object()
         return user
 
+    @action(detail=False, methods=["post"], permission_classes=[permissions.IsAdminUser | IsAdmin])
+    def provision(self, request):
+        """
+        Массовое создание пользователей: файл CSV/JSONL (поле file)
+        или JSON-список в поле users.
+        """
+        upload = request.FILES.get("file")
+        if upload is not None:
+            fmt = request.data.get("format") or upload.name.rsplit(".", 1)[-1].lower()
+            rows = iter_rows(io.TextIOWrapper(upload.file, encoding="utf-8", newline=""), fmt)
+        elif isinstance(request.data.get("users"), list):
+            rows = request.data["users"]
+        else:
+            return Response({"error": "Передайте file или список users"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = provision_users(rows, default_role=request.data.get("default_role") or "tenant")
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED)
+
 
 class UserRegisterView(viewsets.ModelViewSet):
     """
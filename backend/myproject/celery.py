@@ -1,9 +1,147 @@
 from __future__ import absolute_import, unicode_literals
 import os
+import time
 from celery import Celery
+from kombu import Queue
+from celery.signals import before_task_publish, task_prerun, task_postrun, task_retry, task_failure
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
 app = Celery('myproject')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+
+# --- Очереди ---
+# Транзакционные письма не должны ждать за массовыми рассылками и
+# фоновыми пересчётами, поэтому у каждого класса задач своя очередь
+# и свои воркеры (см. deploy/docker-compose.yml).
+
+app.conf.task_queues = (
+    Queue('email', routing_key='email'),
+    Queue('bulk', routing_key='bulk'),
+    Queue('analytics', routing_key='analytics'),
+    Queue('maintenance', routing_key='maintenance'),
+    Queue('default', routing_key='default'),
+)
+app.conf.task_default_queue = 'default'
+app.conf.task_default_priority = 5
+
+# Приоритет действует внутри очереди. В Redis 0 — самый высокий,
+# 9 — самый низкий: транзакционные письма 0, рассылки и дайджесты 8.
+app.conf.task_routes = {
+    'apps.bookings.tasks.advance_booking_lifecycle': {'queue': 'maintenance'},
+    'apps.bookings.tasks.send_booking_transition_emails': {'queue': 'bulk', 'priority': 6},
+    'apps.bookings.tasks.send_booking_confirmation_email': {'queue': 'email', 'priority': 0},
+    'apps.bookings.tasks.send_booking_cancelled_email': {'queue': 'email', 'priority': 0},
+    'apps.bookings.tasks.send_payment_success_email': {'queue': 'email', 'priority': 0},
+    'apps.bookings.tasks.dispatch_booking_notification': {'queue': 'email', 'priority': 0},
+    'apps.core.tasks.bench_ping': {'queue': 'email', 'priority': 0},
+    'apps.core.tasks.bench_sleep': {'queue': 'bulk', 'priority': 8},
+    'apps.core.tasks.archive_soft_deleted_rows': {'queue': 'maintenance'},
+    'apps.log.tasks.percolate_property': {'queue': 'bulk', 'priority': 6},
+    'apps.log.tasks.send_saved_search_alerts': {'queue': 'bulk', 'priority': 6},
+    'apps.log.tasks.rollup_activity': {'queue': 'analytics'},
+    'apps.listings.tasks.rebuild_similar_properties': {'queue': 'analytics'},
+    'apps.listings.tasks.index_property_signature': {'queue': 'bulk', 'priority': 6},
+    'apps.log.tasks.record_search_batch': {'queue': 'analytics'},
+    'apps.log.tasks.record_popular_queries': {'queue': 'analytics'},
+    'apps.log.tasks.purge_activity_logs': {'queue': 'maintenance'},
+    'apps.users.tasks.send_host_daily_digest': {'queue': 'bulk', 'priority': 8},
+    'djcelery_email_send_multiple': {'queue': 'bulk', 'priority': 8},
+}
+
+# Redis эмулирует приоритеты отдельными подочередями
+app.conf.broker_transport_options = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+
+# Параметры воркера для каждой очереди. Воркер выбирает свою очередь
+# через CELERY_LANE и запускается с -Q <lane>.
+WORKER_LANES = {
+    'email': {'concurrency': 4, 'prefetch_multiplier': 1, 'acks_late': True},
+    'bulk': {'concurrency': 2, 'prefetch_multiplier': 4, 'acks_late': False},
+    # Один процесс: сводки популярных запросов (apps.log.heavy_hitters) пишет единственный воркер
+    'analytics': {'concurrency': 1, 'prefetch_multiplier': 1, 'acks_late': True},
+    'maintenance': {'concurrency': 1, 'prefetch_multiplier': 1, 'acks_late': True},
+    'default': {'concurrency': 2, 'prefetch_multiplier': 4, 'acks_late': False},
+}
+
+lane = WORKER_LANES.get(os.environ.get('CELERY_LANE', ''))
+if lane:
+    app.conf.worker_concurrency = lane['concurrency']
+    app.conf.worker_prefetch_multiplier = lane['prefetch_multiplier']
+    app.conf.task_acks_late = lane['acks_late']
+
+
+# --- Метрики задач (экспортируются через /metrics/ вместе с веб-метриками) ---
+
+class QueryCounter:
+    """Обёртка execute_wrapper, считающая SQL-запросы задачи."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault('enqueued_at', time.time())
+
+
+@task_prerun.connect
+def start_task_metrics(task=None, **kwargs):
+    from django.db import connection
+    from apps.core import metrics
+
+    request = task.request
+    enqueued_at = getattr(request, 'enqueued_at', None) or (request.headers or {}).get('enqueued_at')
+    if enqueued_at:
+        metrics.observe(
+            'celery_task_queue_wait_seconds',
+            max(time.time() - float(enqueued_at), 0),
+            labels={'task': task.name},
+        )
+    request._metrics_started = time.perf_counter()
+    request._metrics_queries = QueryCounter()
+    connection.execute_wrappers.append(request._metrics_queries)
+
+
+@task_postrun.connect
+def finish_task_metrics(task=None, state=None, **kwargs):
+    from django.db import connection
+    from apps.core import metrics
+
+    request = task.request
+    started = getattr(request, '_metrics_started', None)
+    counter = getattr(request, '_metrics_queries', None)
+    if started is None or counter is None:
+        return
+    if counter in connection.execute_wrappers:
+        connection.execute_wrappers.remove(counter)
+
+    labels = {'task': task.name}
+    metrics.observe('celery_task_runtime_seconds', time.perf_counter() - started, labels=labels)
+    metrics.observe('celery_task_queries', counter.count, labels=labels, buckets=metrics.COUNT_BUCKETS)
+    metrics.inc_counter('celery_tasks_total', labels={**labels, 'state': state or 'UNKNOWN'})
+
+
+@task_retry.connect
+def count_task_retry(sender=None, **kwargs):
+    from apps.core import metrics
+    metrics.inc_counter('celery_task_retries_total', labels={'task': sender.name})
+
+
+@task_failure.connect
+def count_task_failure(sender=None, exception=None, **kwargs):
+    from apps.core import metrics
+    metrics.inc_counter(
+        'celery_task_failures_total',
+        labels={'task': sender.name, 'exception': type(exception).__name__},
+    )
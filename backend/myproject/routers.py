@@ -5,7 +5,7 @@ from apps.listings.views import PropertyViewSet
 from apps.bookings.views import BookingViewSet
 from apps.payments.views import PaymentViewSet
 from apps.reviews.views import ReviewViewSet
-from apps.log.views import SearchHistoryViewSet
+from apps.log.views import SearchHistoryViewSet, SavedSearchViewSet
 
 router = DefaultRouter()
 
@@ -20,4 +20,5 @@ router.register(r"payments", PaymentViewSet, basename="payment")
 router.register(r"reviews", ReviewViewSet, basename="review")
 
 # Логи / история поиска
-router.register(r"search-history", SearchHistoryViewSet, basename="search-history")
\ No newline at end of file
+router.register(r"search-history", SearchHistoryViewSet, basename="search-history")
+router.register(r"saved-searches", SavedSearchViewSet, basename="saved-search")
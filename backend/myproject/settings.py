@@ -2,6 +2,7 @@ import os
 import socket
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from django.utils.translation import gettext_lazy as _
 from decouple import Config, RepositoryEnv
 
@@ -53,13 +54,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -77,6 +79,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.users.context_processors.user_role',
             ],
         },
     },
@@ -133,7 +136,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.RoleClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -147,10 +150,41 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.RoleTokenRefreshSerializer',
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Сколько секунд роль и группы пользователя живут в общем кэше (0 — только в рамках запроса)
+ROLE_CACHE_TIMEOUT = config('ROLE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Время жизни кэшированного снимка пользователя (сек.)
+USER_SNAPSHOT_TIMEOUT = config('USER_SNAPSHOT_TIMEOUT', default=900, cast=int)
+
+# Через сколько дней мягко удалённые строки уходят в архив (apps.core.archive)
+ARCHIVE_RETENTION_DAYS = config('ARCHIVE_RETENTION_DAYS', default=90, cast=int)
+# Каталог для архивов в формате JSONL.gz (archive_deleted --target jsonl)
+ARCHIVE_DIR = config('ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+
+# Сколько дней хранятся сырые SearchHistory/ViewLog и почасовые агрегаты по ним (apps.log.rollups)
+ACTIVITY_RAW_RETENTION_DAYS = config('ACTIVITY_RAW_RETENTION_DAYS', default=180, cast=int)
+ACTIVITY_HOURLY_RETENTION_DAYS = config('ACTIVITY_HOURLY_RETENTION_DAYS', default=30, cast=int)
+
+# Буфер автоматической записи поисков: размер пачки и максимальная задержка (сек.)
+SEARCH_LOG_BATCH_SIZE = config('SEARCH_LOG_BATCH_SIZE', default=50, cast=int)
+SEARCH_LOG_FLUSH_INTERVAL = config('SEARCH_LOG_FLUSH_INTERVAL', default=5, cast=int)
+
+# Не реже этого (сек.) индекс подсказок перестраивается целиком (apps.listings.suggest)
+SUGGEST_REBUILD_INTERVAL = config('SUGGEST_REBUILD_INTERVAL', default=3600, cast=int)
+
+# Колоночный снимок каталога для списка объектов (apps.listings.catalog)
+CATALOG_SNAPSHOT_ENABLED = config('CATALOG_SNAPSHOT_ENABLED', default=True, cast=bool)
+CATALOG_REBUILD_INTERVAL = config('CATALOG_REBUILD_INTERVAL', default=3600, cast=int)
+
+# /metrics/ требует заголовок "Authorization: Bearer <token>"; без токена закрыт
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Rental Hub API',
     'DESCRIPTION': 'API for rental hub project',
@@ -180,7 +214,38 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+CELERY_BEAT_SCHEDULE = {
+    'host-daily-digest': {
+        'task': 'apps.users.tasks.send_host_daily_digest',
+        'schedule': crontab(hour=6, minute=0),
+    },
+    'rollup-activity': {
+        'task': 'apps.log.tasks.rollup_activity',
+        'schedule': crontab(minute=5),
+    },
+    'purge-activity-logs': {
+        'task': 'apps.log.tasks.purge_activity_logs',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    'rebuild-similar-properties': {
+        'task': 'apps.listings.tasks.rebuild_similar_properties',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'archive-soft-deleted': {
+        'task': 'apps.core.tasks.archive_soft_deleted_rows',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'advance-booking-lifecycle': {
+        'task': 'apps.bookings.tasks.advance_booking_lifecycle',
+        'schedule': crontab(minute='*/15'),
+    },
+}
+
 EMAIL_BACKEND = 'djcelery_email.backends.CeleryEmailBackend'
+# Реальный бэкенд, через который отправляют воркеры
+CELERY_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Бэкенд прямой отправки писем о бронях из воркера email; пусто — тот же, что у EMAIL_BACKEND
+BOOKING_EMAIL_BACKEND = config('BOOKING_EMAIL_BACKEND', default='')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.mailtrap.io')
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
@@ -206,3 +271,8 @@ LOGGING = {
         'level': 'INFO',
     },
 }
+
+# Окно (сек.), в течение которого изменения одной брони схлопываются в одно письмо
+BOOKING_NOTIFICATION_DEBOUNCE = config('BOOKING_NOTIFICATION_DEBOUNCE', default=10, cast=int)
+# Через сколько часов неподтверждённая бронь отменяется автоматически
+BOOKING_PENDING_TTL_HOURS = config('BOOKING_PENDING_TTL_HOURS', default=48, cast=int)
@@ -1,6 +1,10 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render, get_object_or_404
+from django.utils.crypto import constant_time_compare
 from django.db.models import Count
 from apps.listings.models import Property
+from apps.core import metrics
 
 
 def home(request):
@@ -28,3 +32,12 @@ def user_profile(request):
 
 def payment_form(request):
     return render(request, "listings/payment_form.html")
+
+
+
+def metrics_view(request):
+    """Метрики веб-процессов и воркеров Celery в формате Prometheus. Без METRICS_TOKEN закрыты."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token or not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4")
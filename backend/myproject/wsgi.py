@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Rental_HUB.settings')
 
 application = get_wsgi_application()
+
+# Снимки каталога и подсказок строятся в фоне при старте воркера, до первых запросов
+from apps.listings.catalog import catalog_service  # noqa: E402
+from apps.listings.suggest import suggest_service  # noqa: E402
+
+catalog_service.warm_up()
+suggest_service.warm_up()
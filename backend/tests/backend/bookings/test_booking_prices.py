@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.bookings.models import Booking
+from apps.listings.models import PriceRule, Property
+from apps.payments.models import Payment
+
+
+class BookingPriceSnapshotTest(TestCase):
+
+    def setUp(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        self.guest = User.objects.create_user(username="guest", password="pass")
+        self.flat = Property.objects.create(title="Flat", description="d", location="Berlin", price=100, rooms=2,
+                                            property_type="apartment", owner=owner)
+        self.start = date.today() + timedelta(days=10)
+        PriceRule.objects.create(property=self.flat, start_date=self.start, end_date=self.start + timedelta(days=1),
+                                 nightly_price=Decimal("160.00"))
+
+    def book(self, nights=3):
+        return Booking.objects.create(user=self.guest, rental_property=self.flat, start_date=self.start,
+                                      end_date=self.start + timedelta(days=nights))
+
+    def test_price_is_stored_on_create_and_survives_price_changes(self):
+        booking = self.book()
+        assert booking.total_price == Decimal("360.00")
+        assert booking.nightly_price == Decimal("120.00")
+
+        Property.objects.filter(pk=self.flat.pk).update(price=999)
+        booking.confirm()
+        booking.refresh_from_db()
+        assert booking.total_price == Decimal("360.00")
+
+        booking.end_date = self.start + timedelta(days=2)
+        booking.save()
+        assert booking.total_price == Decimal("1159.00")
+
+    def test_totals_are_annotated_without_property_queries(self):
+        first, second = self.book(), self.book(nights=1)
+        Payment.objects.create(booking=first, user=self.guest, status="paid")
+
+        with self.assertNumQueries(1):
+            rows = {b.pk: (b.amount, b.paid_amount) for b in Booking.objects.with_totals()}
+        assert rows == {first.pk: (Decimal("360.00"), Decimal("360.00")), second.pk: (Decimal("160.00"), 0)}
+
+    def test_booking_list_reads_annotated_totals(self):
+        first = self.book()
+        Payment.objects.create(booking=first, user=self.guest, status="paid")
+        client = APIClient()
+        client.force_authenticate(self.guest)
+
+        response = client.get("/api/v1/bookings/")
+        item = response.json()[0]
+        assert (item["total_price"], item["paid_amount"]) == ("360.00", "360.00")
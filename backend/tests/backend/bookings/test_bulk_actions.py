@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.bookings.models import Booking
+from apps.listings.models import Property
+from apps.users.roles import bulk_change_role
+
+
+class BulkBookingActionsTest(TestCase):
+
+    def setUp(self):
+        self.host = User.objects.create_user(username="host", password="pass")
+        bulk_change_role([self.host.pk], "landlord")
+        self.guest = User.objects.create_user(username="guest", password="pass", email="guest@example.com")
+        self.flat = Property.objects.create(title="Flat", description="d", location="Berlin", price=100, rooms=2,
+                                            property_type="apartment", owner=self.host)
+        self.client = APIClient()
+        self.client.force_authenticate(self.host)
+
+    def book(self, count):
+        start = date.today() + timedelta(days=10)
+        return [
+            Booking.objects.create(user=self.guest, rental_property=self.flat,
+                                   start_date=start + timedelta(days=3 * i), end_date=start + timedelta(days=3 * i + 2)).pk
+            for i in range(count)
+        ]
+
+    def confirm(self, ids):
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/v1/bookings/bulk-confirm/", {"ids": ids}, format="json")
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_batch(self):
+        self.confirm(self.book(1))  # роли пользователя кэшируются при первом запросе
+        _, single = self.confirm(self.book(1))
+        mail.outbox.clear()
+        response, many = self.confirm(self.book(40))
+
+        assert response.status_code == 200, response.data
+        assert len(response.data["updated"]) == 40
+        assert many == single
+        assert Booking.objects.filter(status="confirmed").count() == 42
+        assert len(mail.outbox) == 40
+
+    def test_foreign_bookings_are_rejected_without_changes(self):
+        ids = self.book(2)
+        other = User.objects.create_user(username="other", password="pass")
+        bulk_change_role([other.pk], "landlord")
+        self.client.force_authenticate(other)
+
+        response = self.client.post("/api/v1/bookings/bulk-confirm/", {"ids": ids}, format="json")
+        assert response.status_code == 403
+        assert response.data["ids"] == ids
+        assert not Booking.objects.filter(status="confirmed").exists()
+
+    def test_cancel_skips_finished_and_releases_property(self):
+        pending, done = self.book(2)
+        Booking.objects.filter(pk=done).update(status="completed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/v1/bookings/bulk-cancel/", {"ids": [pending, done]}, format="json")
+
+        assert response.data == {"updated": [pending], "skipped": [done]}
+        self.flat.refresh_from_db()
+        assert self.flat.is_available
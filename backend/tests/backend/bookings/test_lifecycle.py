@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.bookings.lifecycle import advance_bookings
+from apps.bookings.models import Booking
+from apps.listings.models import Property
+
+
+@override_settings(BOOKING_PENDING_TTL_HOURS=48)
+class BookingLifecycleTest(TestCase):
+
+    def setUp(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        self.guest = User.objects.create_user(username="guest", password="pass", email="guest@example.com")
+        self.flats = [
+            Property.objects.create(title=f"Flat {i}", description="d", location="Berlin", price=100, rooms=2,
+                                    property_type="apartment", owner=owner)
+            for i in range(3)
+        ]
+
+    def book(self, flat, start, nights, status="pending"):
+        booking = Booking.objects.create(user=self.guest, rental_property=flat, start_date=start,
+                                         end_date=start + timedelta(days=nights))
+        Booking.objects.filter(pk=booking.pk).update(status=status)
+        return booking
+
+    def test_expires_completes_and_releases_in_bulk(self):
+        today = date.today()
+        stale = self.book(self.flats[0], today + timedelta(days=5), 2)
+        Booking.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(hours=49))
+        fresh = self.book(self.flats[1], today + timedelta(days=5), 2)
+        finished = self.book(self.flats[2], today - timedelta(days=4), 2, status="confirmed")
+        # Второй объект держит и свежая бронь — он остаётся занятым
+        self.book(self.flats[1], today - timedelta(days=4), 2, status="confirmed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report = advance_bookings()
+
+        assert report == {"expired": 1, "completed": 2, "released": 2}
+        statuses = dict(Booking.objects.values_list("pk", "status"))
+        assert statuses[stale.pk] == "cancelled"
+        assert statuses[fresh.pk] == "pending"
+        assert statuses[finished.pk] == "completed"
+        available = dict(Property.objects.values_list("pk", "is_available"))
+        assert available == {self.flats[0].pk: True, self.flats[1].pk: False, self.flats[2].pk: True}
+        assert sorted(message.subject.split(":")[0] for message in mail.outbox) == [
+            "Бронирование отменено", "Спасибо за поездку", "Спасибо за поездку",
+        ]
+
+        assert advance_bookings() == {"expired": 0, "completed": 0, "released": 0}
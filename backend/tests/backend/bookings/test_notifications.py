@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.bookings.models import Booking
+from apps.bookings.notifications import PENDING_KEY
+from apps.bookings.tasks import dispatch_booking_notification
+from apps.listings.models import Property
+
+
+class BookingNotificationDebounceTest(TestCase):
+
+    def setUp(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        self.guest = User.objects.create_user(username="guest", password="pass", email="guest@example.com")
+        self.flat = Property.objects.create(title="Flat", description="d", location="Berlin", price=100, rooms=2,
+                                            property_type="apartment", owner=owner)
+        self.emails = {status: mock.Mock() for status in ("pending", "confirmed", "cancelled")}
+        patcher = mock.patch.dict("apps.bookings.tasks.STATUS_EMAIL_TASKS", self.emails)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.enqueued = []
+        patcher = mock.patch.object(dispatch_booking_notification, "apply_async",
+                                    side_effect=lambda args, countdown: self.enqueued.append(args[0]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.delete_many([PENDING_KEY.format(pk) for pk in Booking.objects.values_list("pk", flat=True)])
+
+    def sent(self):
+        return {status: email.call_count for status, email in self.emails.items() if email.call_count}
+
+    def test_saves_within_window_collapse_into_one_email(self):
+        start = date.today() + timedelta(days=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.create(user=self.guest, rental_property=self.flat, start_date=start,
+                                             end_date=start + timedelta(days=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.confirm()
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.cancel()
+
+        assert self.enqueued == [booking.pk]
+        dispatch_booking_notification(booking.pk)
+        assert self.sent() == {"cancelled": 1}
+
+    def test_release_opens_new_window_and_noop_save_is_not_resent(self):
+        start = date.today() + timedelta(days=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.create(user=self.guest, rental_property=self.flat, start_date=start,
+                                             end_date=start + timedelta(days=2))
+        dispatch_booking_notification(booking.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.confirm()
+        assert self.enqueued == [booking.pk, booking.pk]
+        dispatch_booking_notification(booking.pk)
+        assert self.sent() == {"pending": 1, "confirmed": 1}
+
+        # Повторное сохранение подтверждённой брони после окна — письма нет
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.confirm()
+        dispatch_booking_notification(booking.pk)
+        assert self.sent() == {"pending": 1, "confirmed": 1}
@@ -0,0 +1,53 @@
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from apps.core.archive import archive_soft_deleted
+from apps.listings.models import Property, ViewLog
+from apps.reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestArchive:
+
+    def setup_method(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        self.property = Property.objects.create(
+            title="Flat", description="-", location="Berlin", price=100, rooms=2,
+            property_type="apartment", owner=owner,
+        )
+        guests = [User.objects.create_user(username=f"guest{i}", password="pass") for i in range(4)]
+        self.reviews = [Review.objects.create(user=guest, property=self.property, rating=4) for guest in guests]
+        old = timezone.now() - timedelta(days=200)
+        Review.objects.filter(pk__in=[r.pk for r in self.reviews[:3]]).update(is_deleted=True, deleted_at=old)
+        Review.objects.filter(pk=self.reviews[3].pk).update(is_deleted=True, deleted_at=timezone.now())
+
+    def test_archives_old_rows_to_table(self):
+        report = archive_soft_deleted(days=90, labels=["reviews.Review"], chunk_size=2)
+
+        assert report.counts == {"reviews.Review": 3}
+        assert list(Review.objects.with_deleted().values_list("pk", flat=True)) == [self.reviews[3].pk]
+        archived = sorted(Review.objects.archived().values_list("object_id", flat=True))
+        assert archived == sorted(r.pk for r in self.reviews[:3])
+
+        rows = Review.objects.with_deleted(include_archived=True)
+        assert len(rows) == 4
+        assert {row.rating for row in rows} == {4}
+
+    def test_jsonl_target_and_referenced_rows_are_kept(self, settings, tmp_path):
+        settings.ARCHIVE_DIR = str(tmp_path)
+        ViewLog.objects.create(property=self.property)
+        Property.objects.filter(pk=self.property.pk).update(
+            is_deleted=True, deleted_at=timezone.now() - timedelta(days=200)
+        )
+
+        report = archive_soft_deleted(days=90, target="jsonl", labels=["reviews.Review", "listings.Property"])
+
+        assert report.counts == {"reviews.Review": 3, "listings.Property": 0}
+        [path] = tmp_path.iterdir()
+        with gzip.open(path, "rt") as archive:
+            assert [json.loads(line)["id"] for line in archive] == [r.pk for r in self.reviews[:3]]
@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.core import metrics
+from apps.core.tasks import bench_ping
+
+METRICS_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "metrics-tests"}}
+
+
+@override_settings(CACHES=METRICS_CACHES, METRICS_TOKEN="secret")
+class MetricsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(metrics, "_known_series", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_render_counters_and_histograms(self):
+        metrics.inc_counter("jobs_total", labels={"queue": "email"})
+        metrics.inc_counter("jobs_total", labels={"queue": "email"}, value=2)
+        metrics.observe("job_seconds", 0.02, labels={"queue": "email"})
+        metrics.observe("job_seconds", 7, labels={"queue": "email"})
+
+        text = metrics.render()
+
+        self.assertIn("# TYPE jobs_total counter", text)
+        self.assertIn('jobs_total{queue="email"} 3', text)
+        self.assertIn("# TYPE job_seconds histogram", text)
+        self.assertIn('job_seconds_bucket{le="0.01",queue="email"} 0', text)
+        self.assertIn('job_seconds_bucket{le="0.025",queue="email"} 1', text)
+        self.assertIn('job_seconds_bucket{le="10",queue="email"} 2', text)
+        self.assertIn('job_seconds_bucket{le="+Inf",queue="email"} 2', text)
+        self.assertIn('job_seconds_count{queue="email"} 2', text)
+        self.assertIn('job_seconds_sum{queue="email"} 7.02', text)
+
+    def test_series_registered_by_other_processes_are_kept(self):
+        # Каждый процесс знает только свои серии; регистрации не затирают друг друга
+        metrics.inc_counter("jobs_total", labels={"queue": "email"})
+        metrics._known_series.clear()
+        metrics.inc_counter("jobs_total", labels={"queue": "bulk"})
+        metrics._known_series.clear()
+        metrics.inc_counter("jobs_total", labels={"queue": "email"})
+
+        text = metrics.render()
+
+        self.assertIn('jobs_total{queue="bulk"} 1', text)
+        self.assertIn('jobs_total{queue="email"} 2', text)
+        self.assertEqual(cache.get(metrics.SERIES_COUNT_KEY), 2)
+
+    def test_series_re_registered_after_cache_flush(self):
+        metrics.inc_counter("jobs_total")
+        cache.clear()
+        with mock.patch.object(metrics.time, "monotonic", return_value=10**9):
+            metrics.inc_counter("jobs_total")
+
+        self.assertIn("jobs_total 1", metrics.render())
+
+    def test_request_middleware_observes_views(self):
+        self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",status="200",view="metrics"} 1',
+            response.content.decode(),
+        )
+
+    def test_celery_signals_record_task_metrics(self):
+        bench_ping.apply(args=[0])
+
+        text = metrics.render()
+
+        self.assertIn('celery_tasks_total{state="SUCCESS",task="apps.core.tasks.bench_ping"} 1', text)
+        self.assertIn('celery_task_runtime_seconds_count{task="apps.core.tasks.bench_ping"} 1', text)
+        self.assertIn('celery_task_queries_count{task="apps.core.tasks.bench_ping"} 1', text)
+
+    def test_endpoint_requires_token(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
+        self.assertEqual(self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_endpoint_closed_without_token(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.listings.models import Property, ViewLog
+from apps.log.search_log import SearchLogBuffer
+from apps.reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestSoftDeleteCascade:
+
+    def setup_method(self):
+        self.owner = User.objects.create_user(username="host", password="pass")
+        self.property = Property.objects.create(
+            title="Flat", description="-", location="Berlin", price=100, rooms=2,
+            property_type="apartment", owner=self.owner,
+        )
+        guests = [User.objects.create_user(username=f"guest{i}", password="pass") for i in range(3)]
+        self.reviews = [Review.objects.create(user=guest, property=self.property, rating=5) for guest in guests]
+        ViewLog.objects.bulk_create([ViewLog(property=self.property) for _ in range(5)])
+
+    def test_soft_delete_cascades_and_restore_brings_back_only_cascaded_rows(self):
+        self.reviews[0].soft_delete()
+
+        counts = self.property.soft_delete()
+        assert counts["reviews.Review"] == 2
+        assert counts["listings.ViewLog"] == 5
+        assert not Review.objects.filter(property=self.property).exists()
+        assert Review.objects.deleted().count() == 3
+
+        self.property.restore()
+        assert Property.objects.filter(pk=self.property.pk).exists()
+        assert ViewLog.objects.filter(property=self.property).count() == 5
+        assert set(Review.objects.values_list("pk", flat=True)) == {r.pk for r in self.reviews[1:]}
+
+    def test_queryset_delete_and_restore(self):
+        total, counts = Property.objects.filter(owner=self.owner).delete()
+        assert (total, counts["listings.Property"], counts["reviews.Review"]) == (9, 1, 3)
+        assert Property.objects.with_deleted().get(pk=self.property.pk).is_deleted
+        assert ViewLog.objects.count() == 0
+
+        counts = Property.objects.deleted().restore()
+        assert counts == {"listings.Property": 1, "listings.ViewLog": 5, "bookings.Booking": 0,
+                          "payments.Payment": 0, "reviews.Review": 3}
+
+
+@pytest.mark.django_db
+class TestIncludeDeletedListings:
+
+    def setup_method(self):
+        self.owner = User.objects.create_user(username="host", password="pass")
+        self.other = User.objects.create_user(username="other", password="pass")
+        self.staff = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        fields = dict(description="-", location="Berlin", price=100, rooms=2, property_type="apartment")
+        self.live = Property.objects.create(title="Live", owner=self.other, **fields)
+        self.deleted = Property.objects.create(title="Deleted", owner=self.owner, **fields)
+        self.deleted.soft_delete()
+
+    def titles(self, user=None):
+        cache.delete("property_list_include_deleted=true")
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        with mock.patch("apps.log.search_log.search_log_buffer", SearchLogBuffer(batch_size=1000, flush_interval=3600)):
+            response = client.get("/api/v1/properties/", {"include_deleted": "true"})
+        return sorted(item["title"] for item in response.json()["results"])
+
+    def test_deleted_listings_hidden_from_anonymous_and_strangers(self):
+        assert self.titles() == ["Live"]
+        assert self.titles(self.other) == ["Live"]
+
+    def test_owner_and_staff_see_deleted_listings(self):
+        assert self.titles(self.staff) == ["Deleted", "Live"]
+        assert self.titles(self.owner) == ["Deleted", "Live"]
+        # Ответ владельца не попал в общий кэш списка
+        assert cache.get("property_list_include_deleted=true") is None
@@ -0,0 +1,97 @@
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.listings.catalog import catalog_service
+from apps.listings.models import Property
+from apps.log.search_log import SearchLogBuffer
+
+
+class CatalogSnapshotTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        catalog_service.snapshot = None
+        patcher = mock.patch("apps.log.search_log.search_log_buffer", SearchLogBuffer(batch_size=1000, flush_interval=3600))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.owner = User.objects.create_user(username="host", password="pass")
+        self.client = APIClient()
+        for i, (price, rooms, kind) in enumerate([(80, 1, "studio"), (120, 2, "apartment"), (300, 4, "house"),
+                                                  (150, 3, "house"), (120, 2, "apartment")]):
+            self.create(title=f"P{i}", price=price, rooms=rooms, property_type=kind)
+
+    def create(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Property.objects.create(description="-", location="Berlin", owner=self.owner, **fields)
+
+    def titles(self, query):
+        # Сбрасываем только кэш ответа списка: лента изменений живёт в том же кэше
+        cache.delete(f"property_list_{urlencode(query)}")
+        response = self.client.get("/api/v1/properties/", query)
+        return response.json()["count"], [item["title"] for item in response.json()["results"]]
+
+    def assert_same_as_orm(self, query):
+        fast = self.titles(query)
+        with self.settings(CATALOG_SNAPSHOT_ENABLED=False):
+            assert fast == self.titles(query)
+        return fast
+
+    def test_filters_and_ordering_match_orm(self):
+        assert self.assert_same_as_orm({"ordering": "price"})[1][0] == "P0"
+        self.assert_same_as_orm({"price__gte": "100", "price__lte": "200", "ordering": "-price"})
+        assert self.assert_same_as_orm({"property_type": "house", "rooms__gte": "3"})[0] == 2
+        self.assert_same_as_orm({"page_size": "2", "page": "2", "ordering": "-price"})
+
+    def test_changes_are_applied_from_feed(self):
+        self.titles({"ordering": "price"})
+        cheap = self.create(title="Cheap", price=10, rooms=1, property_type="studio")
+        assert self.titles({"ordering": "price"})[1][0] == "Cheap"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cheap.pause_availability()
+        assert self.titles({"ordering": "price"}) == (5, ["P0", "P1", "P4", "P3", "P2"])
+
+    def test_invalid_property_type_goes_to_orm_validation(self):
+        cache.delete("property_list_property_type=castle")
+        response = self.client.get("/api/v1/properties/", {"property_type": "castle"})
+        assert response.status_code == 400
+        assert "property_type" in response.json()
+
+    def test_stale_snapshot_served_while_rebuilding_in_background(self):
+        self.titles({"ordering": "price"})
+        old = catalog_service.snapshot
+        catalog_service.built_at -= 10 ** 6
+        with mock.patch.object(catalog_service, "warm_up") as warm_up:
+            assert self.titles({"ordering": "price"})[0] == 5
+        warm_up.assert_called_once_with()
+        assert catalog_service.snapshot is old
+
+    def test_orm_used_while_first_snapshot_is_built(self):
+        with catalog_service._rebuild_lock:
+            with mock.patch.object(catalog_service, "build") as build:
+                assert self.titles({"ordering": "price"})[1][0] == "P0"
+        build.assert_not_called()
+        assert catalog_service.snapshot is None
+
+    def test_changes_produce_new_snapshot(self):
+        self.titles({"ordering": "price"})
+        old = catalog_service.snapshot
+        self.create(title="Cheap", price=10, rooms=1, property_type="studio")
+        assert self.titles({"ordering": "price"})[1][0] == "Cheap"
+        assert catalog_service.snapshot is not old
+        assert old.size == 5
+
+    def test_queryset_soft_delete_and_restore_reach_snapshot(self):
+        self.titles({"ordering": "price"})
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.filter(price__gte=150).delete()
+        assert self.titles({"ordering": "price"}) == (3, ["P0", "P1", "P4"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.deleted().restore()
+        assert self.titles({"ordering": "price"})[0] == 5
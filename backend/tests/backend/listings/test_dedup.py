@@ -0,0 +1,49 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.listings.dedup import group_duplicates, signature_for, similarity
+from apps.listings.models import Property, PropertySignature
+
+FLAT = (
+    "Bright two-room flat in Mitte with balcony, fast wifi, fully equipped kitchen "
+    "and a quiet courtyard, five minutes from the U-Bahn station"
+)
+
+
+def test_signature_similarity_tracks_text_overlap():
+    original = signature_for("Sunny flat in Mitte", FLAT)
+    reposted = signature_for("Sunny flat in Mitte!!", FLAT + " Available now")
+    other = signature_for("Villa with pool", "Large family villa near the sea with a private pool and garden")
+    assert similarity(original, reposted) > 0.8
+    assert similarity(original, other) < 0.2
+
+
+def test_group_duplicates_clusters_reposts():
+    items = [
+        (1, signature_for("Sunny flat in Mitte", FLAT)),
+        (2, signature_for("Villa with pool", "Large family villa near the sea with a private pool")),
+        (3, signature_for("SUNNY flat in Mitte", FLAT + " Book now")),
+        (4, signature_for("", "")),
+        (5, signature_for("", "")),
+    ]
+    assert group_duplicates(items) == [[1, 3]]
+
+
+class DuplicateOnCreateTest(TestCase):
+
+    def test_new_listing_is_linked_to_earlier_duplicate(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Property.objects.create(title="Sunny flat in Mitte", description=FLAT, location="Berlin",
+                                            price=80, rooms=2, property_type="apartment", owner=owner)
+            Property.objects.create(title="Villa", description="Villa with a pool by the sea", location="Nice",
+                                    price=500, rooms=6, property_type="house", owner=owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            repost = Property.objects.create(title="Sunny flat in Mitte!", description=FLAT, location="Berlin",
+                                             price=85, rooms=2, property_type="apartment", owner=owner)
+
+        signature = PropertySignature.objects.get(property=repost)
+        assert signature.duplicate_of_id == first.pk
+        assert signature.similarity >= 0.8
+        assert PropertySignature.objects.get(property=first).duplicate_of_id is None
+        assert repost.lsh_bands.count() == 16
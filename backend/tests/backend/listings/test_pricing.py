@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.listings.models import PriceRule, Property
+from apps.listings.pricing import PriceCalendar, quote_stay
+
+SUMMER = (date(2030, 6, 1), date(2030, 9, 1), PriceRule.ALL_DAYS, Decimal("150.00"), 3)
+WEEKENDS = (None, None, PriceRule.WEEKEND_NIGHTS, Decimal("120.00"), 2)
+
+
+def test_quote_applies_weekend_and_season_rules():
+    calendar = PriceCalendar(1, Decimal("100.00"), [WEEKENDS, SUMMER])
+
+    # 2030-05-29 — среда: ночи ср, чт — базовые, пт — выходная, с 1 июня — сезон
+    quote = calendar.quote(date(2030, 5, 29), date(2030, 6, 3))
+    assert quote.nightly == [Decimal("100.00"), Decimal("100.00"), Decimal("120.00"), Decimal("150.00"),
+                             Decimal("150.00")]
+    assert quote.total == Decimal("620.00")
+    assert quote.min_nights == 1
+
+    # Сезон приоритетнее выходных (идёт позже в порядке priority, id)
+    summer = calendar.quote(date(2030, 7, 5), date(2030, 7, 7))
+    assert summer.total == Decimal("300.00")
+    assert summer.min_nights == 3 and not summer.meets_min_stay
+
+
+def test_quote_matches_per_night_loop():
+    rules = [WEEKENDS, SUMMER, (date(2030, 8, 10), date(2030, 8, 20), 0b0000001, Decimal("80.50"), 1)]
+    calendar = PriceCalendar(1, Decimal("99.99"), rules)
+    start, end = date(2030, 5, 1), date(2030, 10, 1)
+
+    expected = []
+    day = start
+    while day < end:
+        price = Decimal("99.99")
+        for rule_start, rule_end, weekdays, rule_price, _ in rules:
+            if (rule_start is None or day >= rule_start) and (rule_end is None or day < rule_end) \
+                    and weekdays >> day.weekday() & 1:
+                price = rule_price
+        expected.append(price)
+        day += timedelta(days=1)
+
+    assert calendar.quote(start, end).nightly == expected
+    assert calendar.quote(end, start).total == 0
+
+
+class PriceRulesTest(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="host", password="pass")
+        self.flat = Property.objects.create(title="Flat", description="d", location="Berlin", price=100, rooms=2,
+                                            property_type="apartment", owner=self.owner)
+
+    def test_owner_adds_rule_and_quote_uses_it(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.post(f"/api/v1/properties/{self.flat.pk}/price-rules/", {
+            "start_date": "2030-06-01", "end_date": "2030-09-01", "nightly_price": "150.00", "min_nights": 3,
+        }, format="json")
+        assert response.status_code == 201, response.data
+
+        quote = quote_stay(self.flat, date(2030, 5, 30), date(2030, 6, 2))
+        assert quote.nightly == [Decimal("100.00"), Decimal("100.00"), Decimal("150.00")]
+
+    def test_other_user_cannot_add_rules(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="guest", password="pass"))
+        response = client.post(f"/api/v1/properties/{self.flat.pk}/price-rules/",
+                               {"nightly_price": "1.00"}, format="json")
+        assert response.status_code == 403
+        assert not PriceRule.objects.exists()
+
+
+class BatchQuotesTest(TestCase):
+
+    def test_quotes_many_items_in_one_pass(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        flat = Property.objects.create(title="Flat", description="d", location="Berlin", price=100, rooms=2,
+                                       property_type="apartment", owner=owner)
+        house = Property.objects.create(title="House", description="d", location="Nice", price=300, rooms=5,
+                                        property_type="house", owner=owner)
+        start = date.today() + timedelta(days=30)
+        PriceRule.objects.create(property=flat, start_date=start + timedelta(days=1), end_date=start + timedelta(days=2),
+                                 nightly_price=Decimal("250.00"))
+        items = [
+            {"property_id": flat.pk, "start_date": start, "end_date": start + timedelta(days=3)},
+            {"property_id": house.pk, "start_date": start, "end_date": start + timedelta(days=2)},
+            {"property_id": flat.pk, "start_date": start + timedelta(days=2), "end_date": start + timedelta(days=4)},
+            {"property_id": 999999, "start_date": start, "end_date": start + timedelta(days=1)},
+        ]
+
+        with self.assertNumQueries(1):
+            response = APIClient().post("/api/v1/properties/quotes/", {"items": items}, format="json")
+
+        assert response.status_code == 200, response.data
+        results = response.json()["results"]
+        assert [r.get("total") for r in results] == ["450.00", "600.00", "200.00", None]
+        assert [n["price"] for n in results[0]["nightly"]] == ["100.00", "250.00", "100.00"]
+        assert results[3]["error"]
+
+    def test_rejects_reversed_dates(self):
+        start = date.today() + timedelta(days=5)
+        response = APIClient().post("/api/v1/properties/quotes/", {"items": [
+            {"property_id": 1, "start_date": start, "end_date": start},
+        ]}, format="json")
+        assert response.status_code == 400
@@ -0,0 +1,57 @@
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.listings.models import Property, PropertyNeighbor
+from apps.listings.similarity import build_features, nearest_neighbors, rebuild_neighbor_table
+
+
+def test_blocked_neighbors_match_full_matrix():
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(57, 8)).astype(np.float32)
+    features /= np.linalg.norm(features, axis=1, keepdims=True)
+
+    indices, scores = nearest_neighbors(features, top_n=5, block_size=10)
+
+    full = features @ features.T
+    np.fill_diagonal(full, -np.inf)
+    expected = np.argsort(-full, axis=1)[:, :5]
+    assert (indices == expected).all()
+    assert np.allclose(scores, np.take_along_axis(full, expected, axis=1))
+
+
+def test_features_prefer_same_type_location_and_price():
+    features = build_features([
+        ("apartment", 2, 100, "Berlin Mitte", 4.5, "bright flat near the park"),
+        ("apartment", 2, 110, "Berlin Mitte", 4.0, "bright flat close to the park"),
+        ("house", 6, 900, "Munich", 3.0, "large family house with garden"),
+    ])
+    indices, _ = nearest_neighbors(features, top_n=1)
+    assert indices[:, 0].tolist() == [1, 0, 1]
+
+
+class SimilarEndpointTest(TestCase):
+
+    def test_similar_reads_neighbor_table(self):
+        owner = User.objects.create_user(username="host", password="pass")
+        flats = [
+            Property.objects.create(title=title, description=text, location=location, price=price, rooms=rooms,
+                                    property_type=kind, owner=owner)
+            for title, text, location, price, rooms, kind in [
+                ("A", "cosy studio", "Berlin", 60, 1, "studio"),
+                ("B", "cosy studio", "Berlin", 65, 1, "studio"),
+                ("C", "villa with pool", "Nice", 900, 7, "house"),
+            ]
+        ]
+        rebuild_neighbor_table(top_n=2)
+        assert PropertyNeighbor.objects.count() == 6
+
+        response = APIClient().get(f"/api/v1/properties/{flats[0].pk}/similar/")
+        assert [item["title"] for item in response.json()] == ["B", "C"]
+
+        flats[2].soft_delete()
+        assert APIClient().get(f"/api/v1/properties/{flats[2].pk}/similar/").status_code == 404
+        assert APIClient().get("/api/v1/properties/999999/similar/").status_code == 404
+        rebuild_neighbor_table(top_n=2)
+        assert not PropertyNeighbor.objects.filter(neighbor=flats[2]).exists()
@@ -0,0 +1,89 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.listings.models import Property
+from apps.listings.suggest import KIND_LOCATION, KIND_QUERY, KIND_TITLE, SuggestIndex, suggest_service
+
+
+def test_index_ranks_by_weight_and_matches_word_starts():
+    index = SuggestIndex([
+        ("Berlin, Mitte", KIND_LOCATION, 5),
+        ("Berlin", KIND_LOCATION, 40),
+        ("Bergen", KIND_LOCATION, 3),
+        ("Loft in Berlin", KIND_TITLE, 12),
+        ("berlin loft", KIND_QUERY, 7),
+        ("Berlin", KIND_LOCATION, 2),
+    ])
+
+    assert [text for text, _, _ in index.search("ber", 3)] == ["Berlin", "Loft in Berlin", "berlin loft"]
+    assert index.search("BERLIN", 1) == [("Berlin", KIND_LOCATION, 42)]
+    assert [text for text, _, _ in index.search("mitte")] == ["Berlin, Mitte"]
+    assert index.search("x") == []
+
+
+class SuggestEndpointTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        suggest_service.snapshot = None
+        self.owner = User.objects.create_user(username="host", password="pass")
+
+    def create(self, title, location):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Property.objects.create(
+                title=title, description="-", location=location, price=100, rooms=2,
+                property_type="apartment", owner=self.owner,
+            )
+
+    def test_suggest_picks_up_new_properties_from_change_feed(self):
+        self.create("Sunny flat", "Hamburg")
+        client = APIClient()
+        response = client.get("/api/v1/properties/suggest/", {"q": "ham"})
+        assert response.json() == [{"text": "Hamburg", "kind": "location", "score": 1}]
+
+        self.create("Harbour view", "Hannover")
+        texts = [item["text"] for item in client.get("/api/v1/properties/suggest/", {"q": "ha"}).json()]
+        assert set(texts) == {"Hamburg", "Hannover", "Harbour view"}
+
+    def test_overlay_weights_come_from_rows(self):
+        flat = self.create("Sunny flat", "Hamburg")
+        client = APIClient()
+        client.get("/api/v1/properties/suggest/", {"q": "ham"})
+
+        self.create("Quiet flat", "Hamburg")
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                flat.save()
+        response = client.get("/api/v1/properties/suggest/", {"q": "ham"})
+        assert response.json() == [{"text": "Hamburg", "kind": "location", "score": 2}]
+
+    def test_deleted_and_inactive_properties_leave_suggestions(self):
+        flat = self.create("Sunny flat", "Hamburg")
+        loft = self.create("Sunny loft", "Hannover")
+        client = APIClient()
+        assert len(client.get("/api/v1/properties/suggest/", {"q": "sunny"}).json()) == 2
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flat.soft_delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            loft.is_active = False
+            loft.save()
+
+        assert client.get("/api/v1/properties/suggest/", {"q": "sunny"}).json() == []
+        assert client.get("/api/v1/properties/suggest/", {"q": "ha"}).json() == []
+
+    def test_zeroed_overlay_entries_are_refilled_from_index(self):
+        flats = [self.create(f"Loft {i}", f"Lisbon {i}") for i in range(4)]
+        for i, flat in enumerate(flats):
+            Property.objects.filter(pk=flat.pk).update(view_count=10 * (4 - i))
+        suggest_service.snapshot = None
+        client = APIClient()
+        texts = [item["text"] for item in client.get("/api/v1/properties/suggest/", {"q": "loft", "limit": 2}).json()]
+        assert texts == ["Loft 0", "Loft 1"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flats[0].soft_delete()
+        texts = [item["text"] for item in client.get("/api/v1/properties/suggest/", {"q": "loft", "limit": 2}).json()]
+        assert texts == ["Loft 1", "Loft 2"]
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+
+from apps.log.heavy_hitters import record_queries, space_saving_update, top_queries
+
+
+def test_space_saving_keeps_heavy_items_within_capacity():
+    summary = {}
+    stream = ["berlin"] * 50 + ["munich"] * 30 + [f"rare{i}" for i in range(40)] + ["berlin"] * 10
+    for query in stream:
+        space_saving_update(summary, {query: 1}, capacity=5)
+
+    assert len(summary) == 5
+    assert summary["berlin"][0] == 60
+    assert summary["munich"][0] >= 30
+
+
+def test_windows_slide_over_buckets():
+    cache.clear()
+    now = 1_700_000_000
+    record_queries(["Berlin", "berlin ", "Munich"], now=now - 2 * 3600)
+    record_queries(["munich", "munich", ""], now=now)
+
+    assert top_queries("hour", now=now) == [{"search_query": "munich", "count": 2}]
+    assert top_queries("day", now=now) == [
+        {"search_query": "munich", "count": 3},
+        {"search_query": "berlin", "count": 2},
+    ]
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.log.models import SearchHistory, SearchQueryRollup
+from apps.log.rollups import floor_hour, purge_raw_activity, run_rollups
+
+
+def log_search(query, at):
+    history = SearchHistory.objects.create(search_query=query)
+    SearchHistory.objects.filter(pk=history.pk).update(created_at=at)
+
+
+@pytest.mark.django_db
+class TestSearchRollups:
+
+    def setup_method(self):
+        self.now = floor_hour(timezone.now()) + timedelta(minutes=30)
+        for hours_ago, query in [(3, "berlin"), (3, "berlin"), (2, "berlin"), (2, "munich"), (0, "munich")]:
+            log_search(query, self.now - timedelta(hours=hours_ago))
+
+    def test_popular_queries_come_from_rollups(self):
+        run_rollups(now=self.now)
+
+        assert SearchQueryRollup.objects.filter(granularity="hour").count() == 4
+        popular = list(SearchHistory.get_popular_queries())
+        assert popular == [{"search_query": "berlin", "count": 3}, {"search_query": "munich", "count": 2}]
+
+    def test_rerun_is_idempotent_and_picks_up_late_rows(self):
+        run_rollups(now=self.now)
+        log_search("munich", self.now)
+        log_search("munich", self.now)
+        run_rollups(now=self.now)
+
+        popular = {row["search_query"]: row["count"] for row in SearchHistory.get_popular_queries()}
+        assert popular == {"berlin": 3, "munich": 4}
+
+    def test_purge_keeps_rows_that_are_not_rolled_up(self, settings):
+        settings.ACTIVITY_RAW_RETENTION_DAYS = 0
+        assert purge_raw_activity(now=self.now + timedelta(days=1))["search"]["raw"] == 0
+
+        run_rollups(now=self.now)
+        purge_raw_activity(now=self.now + timedelta(days=1))
+        assert SearchHistory.objects.count() == 1
@@ -0,0 +1,64 @@
+import pytest
+from django.contrib.auth.models import User
+
+from apps.log.models import SavedSearch
+from apps.log.percolator import SavedSearchIndex, build_saved_search_index
+
+
+def make_index(*searches):
+    rows = []
+    for i, search in enumerate(searches, start=1):
+        rows.append((
+            i,
+            100 + i,
+            search.get("query", ""),
+            search.get("location"),
+            search.get("min_price"),
+            search.get("max_price"),
+            search.get("rooms"),
+            search.get("property_type"),
+        ))
+    return SavedSearchIndex(rows)
+
+
+class TestSavedSearchIndex:
+
+    def test_matches_by_type_location_and_price(self):
+        index = make_index(
+            {"location": "Berlin", "min_price": 50, "max_price": 150, "property_type": "apartment"},
+            {"location": "Berlin", "min_price": 200},
+            {"location": "Munich"},
+            {"property_type": "house"},
+        )
+        matches = index.match("apartment", "Berlin, Mitte", 100, 2)
+        assert [search_id for search_id, _ in matches] == [1]
+
+    def test_open_intervals_and_rooms(self):
+        index = make_index(
+            {"max_price": 80},
+            {"rooms": 3},
+            {},
+        )
+        matches = {search_id for search_id, _ in index.match("studio", "Hamburg", 70, 2)}
+        assert matches == {1, 3}
+
+    def test_all_location_and_query_tokens_required(self):
+        index = make_index(
+            {"location": "New York", "query": "balcony"},
+            {"location": "New Delhi"},
+        )
+        matches = index.match("apartment", "New York", 100, 1, text="Flat with a balcony")
+        assert [search_id for search_id, _ in matches] == [1]
+        assert index.match("apartment", "New York", 100, 1, text="Flat") == []
+
+
+@pytest.mark.django_db
+def test_index_is_built_from_active_saved_searches():
+    user = User.objects.create_user(username="searcher", password="pass")
+    active = SavedSearch.objects.create(user=user, location="Berlin", max_price=500)
+    SavedSearch.objects.create(user=user, location="Berlin", is_active=False)
+
+    index = build_saved_search_index()
+
+    assert index.size == 1
+    assert index.match("house", "Berlin", 300, 3) == [(active.id, user.id)]
@@ -0,0 +1,52 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from apps.log.models import SearchHistory
+from apps.log.search_log import SearchLogBuffer, search_entry_from_params
+
+
+def test_entry_from_params():
+    entry = search_entry_from_params(
+        {"search": " loft ", "price__gte": "50", "price__lte": "abc", "rooms__gte": "2", "page": "3"}
+    )
+    assert entry == {"search_query": "loft", "min_price": "50", "rooms": 2, "user_id": None}
+    assert search_entry_from_params({"page": "2", "ordering": "price"}) is None
+
+
+@pytest.mark.django_db
+def test_property_list_logs_searches_in_batches(monkeypatch):
+    buffer = SearchLogBuffer(batch_size=3, flush_interval=60)
+    monkeypatch.setattr("apps.log.search_log.search_log_buffer", buffer)
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username="guest", password="pass"))
+
+    for location in ("Berlin", "Munich"):
+        client.get("/api/v1/properties/", {"location__icontains": location})
+    assert SearchHistory.objects.count() == 0
+
+    client.get("/api/v1/properties/", {"search": "loft", "property_type": "house"})
+    assert list(SearchHistory.objects.order_by("pk").values_list("location", "search_query")) == [
+        ("Berlin", ""), ("Munich", ""), (None, "loft"),
+    ]
+
+
+def test_buffer_flushes_on_timer_without_new_searches():
+    sent = threading.Event()
+    batches = []
+    buffer = SearchLogBuffer(batch_size=100, flush_interval=0.05)
+
+    def send(batch):
+        batches.append(batch)
+        sent.set()
+
+    with mock.patch.object(buffer, "_send", side_effect=send):
+        buffer.add({"search_query": "loft"})
+        buffer.add({"search_query": "flat"})
+        assert sent.wait(timeout=5)
+
+    assert batches == [[{"search_query": "loft"}, {"search_query": "flat"}]]
+    assert buffer._timer is None
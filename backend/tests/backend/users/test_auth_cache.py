@@ -0,0 +1,76 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.test import Client, RequestFactory
+
+from apps.users.auth_cache import SNAPSHOT_KEY, _get_version, build_user_snapshot
+from apps.users.middleware import get_session_user
+from apps.users.models import UserType
+
+
+@pytest.mark.django_db
+class TestCachedSessionUser:
+
+    def setup_method(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="guest", password="pass12345", email="old@example.com")
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def session_request(self, client=None):
+        request = RequestFactory().get("/")
+        request.session = (client or self.client).session
+        request.session.items()  # сессию грузим заранее — считаем только запросы пользователя
+        return request
+
+    def test_snapshot_has_no_password_hash(self):
+        snapshot = build_user_snapshot(self.user.pk)
+        assert "password" not in snapshot["user"]
+        assert self.user.password not in repr(snapshot)
+        assert snapshot["session_auth_hash"] == self.user.get_session_auth_hash()
+
+    def test_second_request_served_from_cache(self, django_assert_num_queries):
+        get_session_user(self.session_request())
+        request = self.session_request()
+        with django_assert_num_queries(0):
+            user = get_session_user(request)
+            assert user.pk == self.user.pk
+            assert user.username == "guest"
+            assert user.profile.user_type.name.lower() == "tenant"
+        cached = cache.get(SNAPSHOT_KEY.format(self.user.pk, _get_version(self.user.pk)))
+        assert cached is not None
+
+    def test_user_and_profile_saves_invalidate_snapshot(self):
+        get_session_user(self.session_request())
+
+        self.user.email = "new@example.com"
+        self.user.save()
+        assert get_session_user(self.session_request()).email == "new@example.com"
+
+        profile = self.user.profile
+        profile.user_type, _ = UserType.objects.get_or_create(name="landlord")
+        profile.save()
+        assert get_session_user(self.session_request()).profile.user_type.name == "landlord"
+
+    def test_password_change_logs_out_other_sessions(self):
+        other = Client()
+        other.force_login(self.user)
+        assert get_session_user(self.session_request(other)).pk == self.user.pk
+
+        self.user.set_password("changed12345")
+        self.user.save()
+
+        assert isinstance(get_session_user(self.session_request(other)), AnonymousUser)
+
+    def test_inactive_user_is_anonymous(self):
+        get_session_user(self.session_request())
+        self.user.is_active = False
+        self.user.save()
+
+        assert isinstance(get_session_user(self.session_request()), AnonymousUser)
+
+    def test_deleted_user_is_anonymous(self):
+        get_session_user(self.session_request())
+        self.user.delete()
+
+        assert isinstance(get_session_user(self.session_request()), AnonymousUser)
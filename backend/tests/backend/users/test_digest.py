@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.listings.models import Property
+from apps.payments.models import Payment
+from apps.reviews.models import Review
+from apps.bookings.tasks import direct_connection
+from apps.users.digest import collect_host_digests, render_host_digests, send_host_digests
+
+
+class HostDigestTest(TestCase):
+
+    def setUp(self):
+        self.host = User.objects.create_user(username="host", password="pass", email="host@example.com")
+        self.guest = User.objects.create_user(username="guest", password="pass")
+        self.flat = Property.objects.create(title="Flat", description="d", location="Berlin", price=100, rooms=2,
+                                            property_type="apartment", owner=self.host)
+        start = date.today() + timedelta(days=10)
+        self.kept, self.cancelled = [
+            Booking.objects.create(user=self.guest, rental_property=self.flat, start_date=start + timedelta(days=i * 5),
+                                   end_date=start + timedelta(days=i * 5 + 2))
+            for i in range(2)
+        ]
+        self.cancelled.cancel()
+        Payment.objects.create(booking=self.kept, user=self.guest, status="paid")
+        Review.objects.create(user=self.guest, property=self.flat, rating=4)
+        self.now = timezone.now()
+
+    def test_collects_all_hosts_with_fixed_query_count(self):
+        with self.assertNumQueries(4):
+            digests = collect_host_digests(self.now - timedelta(hours=1), self.now + timedelta(hours=1))
+
+        assert digests == {self.host.pk: {
+            "new_bookings": 2, "cancellations": 1, "reviews": 1, "average_rating": 4,
+            "payments": 1, "revenue": Decimal("200.00"),
+        }}
+
+    def test_later_save_of_cancelled_booking_is_not_counted_again(self):
+        tomorrow = self.now + timedelta(days=1)
+        Booking.objects.filter(pk=self.cancelled.pk).update(updated_at=tomorrow)
+
+        digests = collect_host_digests(tomorrow - timedelta(hours=1), tomorrow + timedelta(hours=1))
+        assert self.host.pk not in digests
+
+    def test_renders_and_sends_one_email_per_host(self):
+        since, until = self.now - timedelta(hours=1), self.now + timedelta(hours=1)
+        messages = render_host_digests(collect_host_digests(since, until), since, until)
+        assert [message.to for message in messages] == [["host@example.com"]]
+        assert "Отмены: 1" in messages[0].body
+        assert "Платежи: 1 на сумму 200 руб." in messages[0].body
+
+        report = send_host_digests(until=until, period=timedelta(hours=2))
+        assert report == {"hosts": 1, "messages": 1, "sent": 1}
+        assert len(mail.outbox) == 1
+
+    @override_settings(
+        EMAIL_BACKEND="djcelery_email.backends.CeleryEmailBackend",
+        CELERY_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    )
+    def test_sends_through_real_backend_not_celery(self):
+        connections = []
+
+        def open_connection():
+            connections.append(direct_connection())
+            return connections[-1]
+
+        with mock.patch("apps.users.digest.direct_connection", side_effect=open_connection):
+            report = send_host_digests(until=self.now + timedelta(hours=1), period=timedelta(hours=2))
+
+        assert report["sent"] == 1
+        assert [type(connection) for connection in connections] == [LocmemBackend]
+        assert len(mail.outbox) == 1
@@ -0,0 +1,49 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from apps.users.authentication import RoleClaimsJWTAuthentication
+from apps.users.models import UserType
+from apps.users.permissions import IsTenant
+
+
+@pytest.mark.django_db
+class TestRoleClaims:
+
+    def setup_method(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="claims", password="pass12345")
+        response = APIClient().post("/api/token/", {"username": "claims", "password": "pass12345"})
+        assert response.status_code == 200
+        self.access = response.data["access"]
+        self.refresh = response.data["refresh"]
+
+    def authenticate(self, token):
+        request = Request(APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}"))
+        user, _ = RoleClaimsJWTAuthentication().authenticate(request)
+        request.user = user
+        return request
+
+    def test_permission_check_without_queries(self, django_assert_num_queries):
+        self.authenticate(self.access)  # прогрев отпечатка роли в кэше
+        with django_assert_num_queries(0):
+            request = self.authenticate(self.access)
+            assert request.user.is_authenticated
+            assert request.user.pk == self.user.pk
+            assert IsTenant().has_permission(request, None)
+
+    def test_role_change_requires_new_token(self):
+        profile = self.user.profile
+        profile.user_type, _ = UserType.objects.get_or_create(name="landlord")
+        profile.save()
+
+        with pytest.raises(InvalidToken):
+            self.authenticate(self.access)
+
+        response = APIClient().post("/api/token/refresh/", {"refresh": self.refresh})
+        assert response.status_code == 200
+        request = self.authenticate(response.data["access"])
+        assert request.user._role_info.role == "landlord"
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+
+from apps.users.models import UserType
+from apps.users.provisioning import iter_rows, provision_users
+from apps.users.roles import load_user_roles
+
+CSV = """username,email,role,password
+alice,alice@example.com,tenant,secret123
+bob,bob@example.com,moderator,
+,nobody@example.com,tenant,
+carol,carol@example.com,wizard,
+alice,dup@example.com,tenant,
+"""
+
+
+@pytest.mark.django_db
+def test_provision_users_creates_profiles_and_groups():
+    report = provision_users(iter_rows(io.StringIO(CSV), "csv"), chunk_size=2)
+
+    assert (report.rows, report.created, report.skipped, len(report.errors)) == (5, 2, 1, 2)
+    alice = User.objects.get(username="alice")
+    assert alice.check_password("secret123")
+    assert alice.profile.user_type.name == "tenant"
+    assert load_user_roles(alice.pk).in_groups("Tenant")
+    assert load_user_roles(User.objects.get(username="bob").pk).in_groups("Moderator")
+
+    again = provision_users(iter_rows(io.StringIO(CSV), "csv"))
+    assert again.created == 0
+
+
+@pytest.mark.django_db
+def test_unknown_default_role_is_rejected():
+    with pytest.raises(ValueError):
+        provision_users(iter_rows(io.StringIO(CSV), "csv"), default_role="wizard")
+
+    assert not UserType.objects.filter(name="wizard").exists()
+    assert not User.objects.filter(username="alice").exists()
+
+
+@pytest.mark.django_db
+def test_malformed_and_duplicate_rows_are_rejected_without_aborting_chunk():
+    rows = [
+        {"username": "dave", "email": "dave@example.com"},
+        {"username": "erin"},
+        {"username": 42, "email": "num@example.com"},
+        {"username": "   ", "email": "blank@example.com"},
+        {"username": "Dave", "email": "dave2@example.com"},
+        {"username": "bad name!", "email": "bad@example.com"},
+        {"username": "frank", "email": "not-an-email"},
+        {"username": "gina", "email": "gina@example.com", "password": 123},
+        ["not", "an", "object"],
+        {"username": "hank", "email": "hank@example.com"},
+    ]
+    report = provision_users(rows, chunk_size=100)
+
+    assert (report.rows, report.created, report.skipped) == (10, 2, 0)
+    assert [error["row"] for error in report.errors] == [2, 3, 4, 5, 6, 7, 8, 9]
+    assert set(User.objects.values_list("username", flat=True)) == {"dave", "hank"}
@@ -0,0 +1,78 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.template import RequestContext, Template
+from django.test import RequestFactory
+
+from apps.users.models import UserType
+from apps.users.permissions import IsTenant, IsLandlord
+from apps.users.roles import bulk_change_role, get_request_roles, get_user_roles
+
+
+@pytest.mark.django_db
+class TestRoleResolver:
+
+    def setup_method(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tenant", password="pass")
+        self.user = User.objects.get(pk=self.user.pk)
+
+    def test_roles_loaded_once_per_request(self, django_assert_num_queries):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        with django_assert_num_queries(1):
+            assert IsTenant().has_permission(request, None)
+            assert not IsLandlord().has_permission(request, None)
+            assert get_request_roles(request).in_groups("Tenant")
+
+    def test_template_role_checks_share_one_query(self, django_assert_num_queries):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        template = Template(
+            "{% load user_roles %}{% user_role as role %}{{ role }}|{{ current_role }}"
+            '|{{ user|has_role:"tenant" }}|{{ user|has_role:"landlord" }}'
+            '|{{ user|has_any_role:"landlord,moderator" }}|{{ user|has_any_role:"tenant,landlord" }}'
+        )
+        with django_assert_num_queries(1):
+            rendered = template.render(RequestContext(request))
+        assert rendered == "tenant|tenant|True|False|False|True"
+
+    def test_role_change_invalidates_cache(self, django_assert_num_queries):
+        get_user_roles(self.user)
+        with django_assert_num_queries(0):
+            assert get_user_roles(User(pk=self.user.pk)).role == "tenant"
+
+        profile = self.user.profile
+        profile.user_type, _ = UserType.objects.get_or_create(name="moderator")
+        profile.save()
+
+        fresh = User.objects.get(pk=self.user.pk)
+        info = get_user_roles(fresh)
+        assert info.role == "moderator"
+        assert info.groups == {"Moderator"}
+
+
+@pytest.mark.django_db
+class TestRoleSync:
+
+    def setup_method(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f"user{i}", password="pass") for i in range(3)]
+
+    def test_profile_save_without_type_change_skips_group_sync(self, django_assert_num_queries):
+        profile = User.objects.get(pk=self.users[0].pk).profile
+        profile.bio = "hello"
+        with django_assert_num_queries(1):
+            profile.save(update_fields=["bio"])
+
+    def test_bulk_change_role_moves_groups(self):
+        for user in self.users:
+            get_user_roles(User.objects.get(pk=user.pk))
+
+        bulk_change_role([user.pk for user in self.users[:2]], "moderator")
+
+        for user in self.users[:2]:
+            info = get_user_roles(User.objects.get(pk=user.pk))
+            assert info.role == "moderator"
+            assert info.groups == {"Moderator"}
+        assert get_user_roles(User.objects.get(pk=self.users[2].pk)).groups == {"Tenant"}